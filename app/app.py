@@ -1,67 +1,311 @@
-import pandas as pd
+import atexit
 import pickle
-import re
 import os
-from flask import Flask, render_template, request
+import sys
+import threading
+import time
+from collections import namedtuple
+from flask import Flask, Response, g, render_template, request, jsonify
+
+# Permite importar los módulos de 'src' al ejecutar 'python app/app.py'
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from src.data_pipeline.text_cleaning import clean_batch
+from src.inference.predictor import MicroBatcher
+from src.inference.prediction_cache import PredictionCache, artifact_fingerprint
+from src.inference.model_registry import LoadedModel, ModelRouter, load_manifest
+from src.inference.search_index import InvertedIndex, paginate
+from src.inference.corpus_store import CorpusStore
+from src.inference.similarity_index import SimilarityIndex
+from src.inference.sentiment_rollup import GRANULARITIES, SentimentRollup
+from src.inference.metrics import MetricsRegistry, stage_timer
+from src.inference.profiler import SlowRequestProfiler
 
 # --- Configuración de Flask ---
 app = Flask(__name__, template_folder='templates')
 
 # --- Rutas de Archivos ---
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-# 1. Ruta de los Modelos (Subimos un nivel)
-MODELS_DIR = os.path.join(BASE_DIR, '..', 'models')
-MODEL_PATH = os.path.join(MODELS_DIR, 'model_clasificador_v1.pkl')
-VECTORIZER_PATH = os.path.join(MODELS_DIR, 'vectorizer_v1.pkl')
+# 1. Modelos: la versión activa (y la candidata) se leen de models/manifest.json
+#    (ver src/inference/model_registry.py) y se recargan en caliente.
+#    SENTIMENT_MODEL_PATH / SENTIMENT_VECTORIZER_PATH fijan otros artefactos
+#    (p. ej. los del entrenamiento incremental) y desactivan la recarga;
+#    SENTIMENT_INTENT_MODEL_PATH añade su cabezal de intención, si lo tiene.
+MODEL_PATH = os.environ.get('SENTIMENT_MODEL_PATH')
+VECTORIZER_PATH = os.environ.get('SENTIMENT_VECTORIZER_PATH')
+INTENT_MODEL_PATH = os.environ.get('SENTIMENT_INTENT_MODEL_PATH')
+# Formato compacto exportado por train_model.py (npz + vocabulario mmap)
+USE_COMPACT_MODEL = os.environ.get('USE_COMPACT_MODEL', '1') != '0'
 
 # 2. Ruta del Dataset (¡CORREGIDA a la ruta del corpus etiquetado!)
 DATA_PATH = os.path.join(BASE_DIR, '..', 'data', 'processed', 'corpus_etiquetado.csv')
 
+# Número de resultados por página en el buscador de tweets
+SEARCH_PAGE_SIZE = int(os.environ.get('SEARCH_PAGE_SIZE', '20'))
+# Máximo de resultados de /api/similar
+SIMILAR_MAX_K = 100
+
+# Agregados de tono/intención por hora y día (compartidos con predict_model.py)
+ROLLUP_PATH = os.environ.get('SENTIMENT_ROLLUP_PATH',
+                             os.path.join(BASE_DIR, '..', 'data', 'cache', 'sentimiento_rollup.db'))
+
 # --- Función de Preprocesamiento ---
-# Debe ser IDÉNTICA a la usada en entrenamiento y predicción
-def clean_text(text):
-    if not isinstance(text, str):
-        return ""
-    text = re.sub(r'^RT @\w+:\s?', 'RT : ', text)
-    text = re.sub(r'@\w+', '', text)
-    text = re.sub(r'https?://\S+|www\.\S+', '', text)
-    text = re.sub(r't\.co/\w+', '', text)
-    text = re.sub(r'\s+', ' ', text).strip()
-    return text
+# clean_batch viene de src/data_pipeline/text_cleaning.py,
+# el mismo módulo que usan el entrenamiento y la predicción por lotes.
+
+# --- Métricas (expuestas en /metrics en formato Prometheus) ---
+METRICS = MetricsRegistry('sentimiento')
+REQUESTS_TOTAL = METRICS.counter('http_requests_total', 'Peticiones HTTP atendidas.', ['endpoint', 'method', 'status'])
+REQUEST_SECONDS = METRICS.histogram('http_request_duration_seconds', 'Latencia de las peticiones HTTP.', ['endpoint'])
+# Etapas: clean, cache, vectorize, predict, predict_intent, search, similar, render
+STAGE_SECONDS = METRICS.histogram('stage_duration_seconds', 'Duración de cada etapa del camino caliente.', ['stage'])
+PREDICTIONS_TOTAL = METRICS.counter('predictions_total', 'Textos clasificados, por etiqueta de tono.', ['label'])
+INTENT_PREDICTIONS_TOTAL = METRICS.counter('intent_predictions_total', 'Textos clasificados, por intención.',
+                                           ['label'])
+MODEL_LOAD_SECONDS = METRICS.gauge('model_load_seconds', 'Duración de la última carga del modelo.')
+MODEL_RELOADS_TOTAL = METRICS.counter('model_reloads_total', 'Cambios de versión del modelo en caliente.')
+# Latencia de transform + predict_proba por versión y papel (servida / sombra)
+MODEL_SECONDS = METRICS.histogram('model_inference_seconds', 'Inferencia por lote, por versión del modelo.',
+                                  ['version', 'role'])
+SHADOW_COMPARISONS = METRICS.counter('shadow_comparisons_total', 'Textos puntuados en sombra, por concordancia.',
+                                     ['served', 'shadow', 'result'])
+CACHE_STATS = METRICS.gauge('prediction_cache', 'Contadores de la caché de predicciones.', ['stat'])
+
+# Perfilador de peticiones lentas: se activa con PROFILE_SLOW_REQUESTS=1 o en
+# caliente desde /debug/profiler. Los perfiles se guardan en data/profiles/.
+profiler = SlowRequestProfiler(
+    enabled=os.environ.get('PROFILE_SLOW_REQUESTS', '0') != '0',
+    output_dir=os.path.join(BASE_DIR, '..', 'data', 'profiles'),
+)
 
 # --- Carga Global del Modelo y Datos ---
 
+# Caché LRU de predicciones indexada por (texto limpio, versión del modelo)
+prediction_cache = PredictionCache()
+
+# Cada clasificación servida suma en los agregados de /api/tendencias (en
+# memoria; se vuelcan a SQLite como mucho una vez por segundo)
+ROLLUP = SentimentRollup(ROLLUP_PATH)
+atexit.register(ROLLUP.flush)
+
 # 1. Carga del Modelo
-try:
+def load_pinned_model():
+    """Artefactos fijados por variables de entorno (fuera del registro)."""
+    start = time.perf_counter()
     with open(MODEL_PATH, 'rb') as f:
-        model = pickle.load(f)
+        loaded_model = pickle.load(f)
     with open(VECTORIZER_PATH, 'rb') as f:
-        vectorizer = pickle.load(f)
-    print("✅ Modelo y vectorizador cargados con éxito para la aplicación web.")
+        loaded_vectorizer = pickle.load(f)
+    loaded_intent_model = None
+    if INTENT_MODEL_PATH:
+        with open(INTENT_MODEL_PATH, 'rb') as f:
+            loaded_intent_model = pickle.load(f)
+    paths = [p for p in (MODEL_PATH, VECTORIZER_PATH, INTENT_MODEL_PATH) if p]
+    return LoadedModel('personalizado', loaded_model, loaded_vectorizer,
+                       'personalizado:' + artifact_fingerprint(*paths), time.perf_counter() - start,
+                       loaded_intent_model)
+
+def on_model_swap(previous, current):
+    """La versión nueva ya está cargada y caliente: se vacía la caché de la anterior."""
+    MODEL_LOAD_SECONDS.set(current.load_seconds)
+    if previous is None:
+        print(f"✅ Modelo y vectorizador cargados con éxito para la aplicación web (versión {current.fingerprint}).")
+        return
+    prediction_cache.clear()
+    MODEL_RELOADS_TOTAL.inc()
+    print(f"🔄 Versión del modelo cambiada: {previous.fingerprint} -> {current.fingerprint}. Caché invalidada.")
+    # Las etiquetas precalculadas del buscador también son de la versión anterior
+    # (y el CSV puede haber cambiado: se recargan corpus e índices juntos)
+    refresh_corpus(current)
+
+router = ModelRouter(prefer_compact=USE_COMPACT_MODEL, clean_fn=clean_batch, on_swap=on_model_swap)
+try:
+    if MODEL_PATH and VECTORIZER_PATH:
+        pinned = load_pinned_model()
+        router = ModelRouter(clean_fn=clean_batch, pinned=pinned)
+        on_model_swap(None, pinned)
+    else:
+        router.refresh()
+    if router.current is None:
+        raise RuntimeError(router.last_error or "El registro no tiene ninguna versión activa.")
 except Exception as e:
     print(f"❌ ERROR al cargar modelos: {e}")
-    model = None
-    vectorizer = None
 
-# 2. Carga del Dataset de Tweets
+# 2. Carga del Dataset de Tweets en formato columnar (ver src/inference/corpus_store.py):
+#    texto, tono, intención, confianza y fecha como arrays, con las etiquetas
+#    calculadas en un solo lote y guardadas en data/cache/ entre reinicios.
+# Nota: Si la columna de texto tiene otro nombre en 'corpus_etiquetado.csv', cámbialo aquí.
+TEXT_COLUMN = 'texto_procesado' # <-- ¡Ajusta este nombre de columna si es necesario!
+
+# 3. Índice invertido de trigramas para el buscador e índice de tuits similares.
+#    Sus ids de fila son posiciones en el corpus con el que se construyeron, así
+#    que los tres se sustituyen juntos: cada petición lee CORPUS_STATE una vez.
+CorpusState = namedtuple('CorpusState', ['corpus', 'search_index', 'similarity'])
+
+def refresh_corpus(loaded):
+    """
+    (Re)carga el corpus con las etiquetas de `loaded` (el CSV puede haber
+    cambiado desde la carga anterior), rehace el índice del buscador y el de
+    tuits similares (en el espacio TF-IDF de `loaded`: las consultas se
+    vectorizan con el mismo modelo con el que se construyó) y sustituye los
+    tres de golpe, en una sola asignación.
+    """
+    global CORPUS_STATE
+    start = time.perf_counter()
+    store, from_cache = CorpusStore.load_or_build(DATA_PATH, loaded, clean_batch, text_column=TEXT_COLUMN)
+    similarity = (loaded, SimilarityIndex(store.tfidf_matrix())) if loaded is not None else None
+    CORPUS_STATE = CorpusState(store, InvertedIndex(store.cleaned_texts()), similarity)
+    origin = 'desde la caché' if from_cache else 'y clasificado'
+    print(f"✅ Dataset de tweets cargado {origin} en {time.perf_counter() - start:.2f} s. Total: {len(store)} tweets "
+          f"({store.nbytes() / max(len(store), 1):.0f} bytes/tuit).")
+    return store
+
 try:
-    # Cargar el CSV. Asume que la columna de texto se llama 'tweet_text'
-    # Nota: Si la columna de texto tiene otro nombre en 'corpus_etiquetado.csv', cámbialo aquí.
-    df_tweets = pd.read_csv(DATA_PATH) 
-    
-    # Asumimos que la columna se llama 'tweet_text' o 'text'. Usaremos 'text' para el ejemplo.
-    # Si la columna se llama diferente en tu CSV real, por favor ajústalo.
-    TEXT_COLUMN = 'texto_procesado' # <-- ¡Ajusta este nombre de columna si es necesario!
-    
-    # Aplicar la limpieza de texto a la columna de tweets para búsquedas
-    df_tweets['cleaned_text'] = df_tweets[TEXT_COLUMN].apply(clean_text)
-    
-    # Preparamos una lista simple de los tweets originales para facilitar el retorno
-    GLOBAL_TWEETS = df_tweets[[TEXT_COLUMN, 'cleaned_text']].rename(columns={TEXT_COLUMN: 'tweet_text'}).to_dict('records')
-    print(f"✅ Dataset de tweets cargado y limpio. Total: {len(GLOBAL_TWEETS)} tweets.")
+    refresh_corpus(router.current)
 except Exception as e:
     print(f"❌ ERROR al cargar el dataset de tweets: {e}")
-    GLOBAL_TWEETS = []
+    CORPUS_STATE = CorpusState(CorpusStore.empty(), InvertedIndex([]), None)
+
+
+# --- Predicción por lotes ---
+
+def predict_texts(texts):
+    """
+    Clasifica una lista de textos con UNA sola llamada a transform/predict.
+    Devuelve, para cada texto, la etiqueta de tono y sus probabilidades y, si
+    la versión tiene cabezal de intención, la intención (sobre la misma matriz).
+    Los textos cuyo texto limpio ya está en la caché no se vuelven a predecir.
+    """
+    # Versión que sirve este lote (y, si hay candidata, la que lo puntúa en sombra)
+    router.ensure_watcher()
+    served, shadow = router.choose()
+
+    with stage_timer(STAGE_SECONDS, stage='clean'):
+        cleaned = clean_batch(texts)
+    with stage_timer(STAGE_SECONDS, stage='cache'):
+        keys = [PredictionCache.make_key(t, served.fingerprint) for t in cleaned]
+        results = [prediction_cache.get(key) for key in keys]
+
+    # Textos limpios distintos que no estaban en caché
+    missing = {}
+    for key, text, result in zip(keys, cleaned, results):
+        if result is None:
+            missing.setdefault(key, text)
+
+    if missing:
+        start = time.perf_counter()
+        with stage_timer(STAGE_SECONDS, stage='vectorize'):
+            text_vectorized = served.vectorizer.transform(list(missing.values()))
+        with stage_timer(STAGE_SECONDS, stage='predict'):
+            probabilities = served.model.predict_proba(text_vectorized)
+        intent_probabilities = None
+        if served.intent_model is not None:
+            # Segundo cabezal sobre la MISMA matriz: sin limpiar ni vectorizar otra vez
+            with stage_timer(STAGE_SECONDS, stage='predict_intent'):
+                intent_probabilities = served.intent_model.predict_proba(text_vectorized)
+            intent_classes = [str(c) for c in served.intent_model.classes_]
+        elapsed = time.perf_counter() - start
+        MODEL_SECONDS.observe(elapsed, version=served.version, role='servida')
+        router.record_latency(served.version, 'servida', elapsed, len(missing))
+        classes = [str(c) for c in served.model.classes_]
+
+        computed = {}
+        for i, (key, row) in enumerate(zip(missing, probabilities)):
+            best = row.argmax()
+            computed[key] = {
+                'etiqueta_tono': classes[best],
+                'probabilidades': {c: round(float(p), 4) for c, p in zip(classes, row)},
+            }
+            if intent_probabilities is not None:
+                intent_row = intent_probabilities[i]
+                computed[key]['etiqueta_intencion'] = intent_classes[intent_row.argmax()]
+                computed[key]['probabilidades_intencion'] = {
+                    c: round(float(p), 4) for c, p in zip(intent_classes, intent_row)
+                }
+            prediction_cache.put(key, computed[key])
+        results = [r if r is not None else computed[key] for key, r in zip(keys, results)]
+
+    label_counts, intent_counts = {}, {}
+    for r in results:
+        label_counts[r['etiqueta_tono']] = label_counts.get(r['etiqueta_tono'], 0) + 1
+        if 'etiqueta_intencion' in r:
+            intent_counts[r['etiqueta_intencion']] = intent_counts.get(r['etiqueta_intencion'], 0) + 1
+    for label, count in label_counts.items():
+        PREDICTIONS_TOTAL.inc(count, label=label)
+    for label, count in intent_counts.items():
+        INTENT_PREDICTIONS_TOTAL.inc(count, label=label)
+    ROLLUP.add([r['etiqueta_tono'] for r in results],
+               [r['probabilidades'][r['etiqueta_tono']] for r in results],
+               [r.get('etiqueta_intencion', '') for r in results],
+               [r['probabilidades_intencion'][r['etiqueta_intencion']] if 'etiqueta_intencion' in r else 0.0
+                for r in results])
+
+    if shadow is not None:
+        router.score_shadow(served, shadow, cleaned, [r['etiqueta_tono'] for r in results],
+                            on_result=_record_shadow_metrics(served))
+    return results
+
+def _record_shadow_metrics(served):
+    def record(shadow, seconds, agree, total):
+        MODEL_SECONDS.observe(seconds, version=shadow.version, role='sombra')
+        SHADOW_COMPARISONS.inc(agree, served=served.version, shadow=shadow.version, result='coincide')
+        SHADOW_COMPARISONS.inc(total - agree, served=served.version, shadow=shadow.version, result='difiere')
+    return record
+
+# Las peticiones concurrentes a /api/predict se agrupan en un único lote
+# dentro de la ventana BATCH_MAX_LATENCY_MS (ver src/inference/predictor.py).
+batcher = MicroBatcher(predict_texts)
+
+
+# --- Estado del proceso (liveness / readiness) ---
+# READY se activa al terminar warm_up(); SHUTTING_DOWN cuando el servidor
+# empieza a cerrarse, para que el balanceador deje de enviarle tráfico
+# (ver app/serve.py).
+READY = threading.Event()
+SHUTTING_DOWN = threading.Event()
+
+def warm_up():
+    """
+    Ejercita una vez limpieza, modelo, buscador y plantilla para que la primera
+    petición real no pague la inicialización perezosa. En app/serve.py se
+    ejecuta en el proceso padre, antes del fork, y los workers la heredan.
+    """
+    start = time.perf_counter()
+    current = router.current
+    if current is not None:
+        # Directamente sobre el modelo: sin pasar por la caché ni las métricas
+        X = current.vectorizer.transform(clean_batch(['calentamiento del modelo']))
+        current.model.predict_proba(X)
+        if current.intent_model is not None:
+            current.intent_model.predict_proba(X)
+    state = CORPUS_STATE
+    state.search_index.search('calentamiento')
+    if state.similarity is not None:
+        similar_texts('calentamiento del modelo', state=state)
+    with app.test_request_context():
+        render_template('index.html', result=None, original_text="", search_results=None, search_query="")
+    READY.set()
+    print(f"✅ Calentamiento completado en {(time.perf_counter() - start) * 1000:.0f} ms.")
+
+
+# --- Instrumentación de las peticiones ---
+
+@app.before_request
+def start_request_timer():
+    g.request_start = time.perf_counter()
+    g.profile_token = profiler.start_request(request.endpoint or 'desconocido')
+
+@app.after_request
+def record_request_metrics(response):
+    endpoint = request.endpoint or 'desconocido'
+    REQUEST_SECONDS.observe(time.perf_counter() - g.request_start, endpoint=endpoint)
+    REQUESTS_TOTAL.inc(endpoint=endpoint, method=request.method, status=response.status_code)
+    return response
+
+@app.teardown_request
+def finish_request_profile(exc):
+    profile = profiler.finish_request(g.pop('profile_token', None))
+    if profile:
+        print(f"⚠️ Petición lenta ({profile['peticion']}, {profile['duracion_ms']} ms): perfil guardado.")
 
 
 # --- Rutas de la Aplicación Flask ---
@@ -70,20 +314,17 @@ except Exception as e:
 def index():
     """Ruta principal para la clasificación de sentimiento."""
     prediction_result = None
+    intent_label = None
     input_text = ""
     
     if request.method == 'POST' and 'tweet_text' in request.form:
         input_text = request.form.get('tweet_text')
         
-        if model and vectorizer and input_text:
-            # 1. Limpieza
-            cleaned_text = clean_text(input_text)
-            
-            # 2. Vectorización
-            text_vectorized = vectorizer.transform([cleaned_text])
-            
-            # 3. Predicción
-            prediction_label = model.predict(text_vectorized)[0]
+        if router.current is not None and input_text:
+            # 1-3. Limpieza, vectorización y predicción (con caché por texto limpio)
+            prediction = predict_texts([input_text])[0]
+            prediction_label = prediction['etiqueta_tono']
+            intent_label = prediction.get('etiqueta_intencion')
             
             # 4. Resultado a mostrar
             # Nota: Asegúrate de que tu modelo devuelva 1, 0, -1 o la etiqueta de texto directamente
@@ -92,33 +333,211 @@ def index():
             prediction_result = "Error: El modelo no está cargado o el texto está vacío."
     
     # Renderizamos la plantilla HTML, pasando los resultados de predicción
-    return render_template('index.html', result=prediction_result, original_text=input_text, search_results=None, search_query="")
+    with stage_timer(STAGE_SECONDS, stage='render'):
+        return render_template('index.html', result=prediction_result, intent=intent_label, original_text=input_text, search_results=None, search_query="")
+
+SEARCH_FILTERS = ('tono', 'intencion', 'desde', 'hasta')
+
+def run_search(search_query, filters, page):
+    """
+    Búsqueda + filtros + facetas sobre el corpus columnar. Devuelve
+    (filas de la página, total filtrado, página, total de páginas, facetas).
+    Las facetas se calculan sobre todos los resultados de la consulta (antes
+    de filtrar), para mostrar cuántos hay de cada tono/intención.
+    """
+    state = CORPUS_STATE
+    corpus = state.corpus
+    with stage_timer(STAGE_SECONDS, stage='search'):
+        # 1. El índice devuelve las filas cuyo texto LIMPIO contiene la consulta
+        #    (sin distinguir mayúsculas ni tildes); sin consulta, todo el corpus
+        row_ids = state.search_index.search(search_query) if search_query else None
+        facets = corpus.facets(row_ids)
 
-@app.route('/search_tweets', methods=['POST'])
+        # 2. Filtros por tono, intención y fecha: máscaras sobre los arrays
+        filtered = corpus.filter(row_ids, **filters)
+
+        # 3. Solo se materializa la página pedida
+        page_ids, page, total_pages = paginate(filtered, page, SEARCH_PAGE_SIZE)
+        return corpus.rows(page_ids), len(filtered), page, total_pages, facets
+
+def _search_filters():
+    filters = {name: request.values.get(name, '').strip() for name in SEARCH_FILTERS}
+    return {name: value for name, value in filters.items() if value}
+
+@app.route('/search_tweets', methods=['GET', 'POST'])
 def search_tweets():
-    """Nueva ruta para el buscador de tweets usando 're' sobre la base de datos."""
-    search_query = request.form.get('search_query', '')
+    """Buscador de tweets sobre el índice invertido, con filtros por tono/intención/fecha y resultados paginados."""
+    search_query = request.values.get('search_query', '')
+    page = request.values.get('page', 1, type=int)
+    filters = _search_filters()
     matching_tweets = []
-    
-    if search_query and GLOBAL_TWEETS:
-        # 1. Escapar la consulta para usarla de forma segura en una expresión regular (case-insensitive)
-        pattern = re.compile(re.escape(search_query), re.IGNORECASE)
-        
-        # 2. Iterar sobre la base de datos de tweets
-        for tweet_data in GLOBAL_TWEETS:
-            # Buscar en el texto LIMPIO del tweet para resultados más precisos
-            cleaned_text = tweet_data['cleaned_text']
-            
-            if pattern.search(cleaned_text):
-                # Si hay coincidencia, añadimos el texto ORIGINAL a los resultados
-                matching_tweets.append(tweet_data['tweet_text'])
-    
+    total_results = 0
+    total_pages = 1
+    facets = None
+
+    if (search_query or filters) and len(CORPUS_STATE.corpus):
+        try:
+            matching_tweets, total_results, page, total_pages, facets = run_search(search_query, filters, page)
+        except ValueError:
+            # Fecha mal escrita en 'desde'/'hasta': se ignoran los filtros de fecha
+            filters = {k: v for k, v in filters.items() if k not in ('desde', 'hasta')}
+            matching_tweets, total_results, page, total_pages, facets = run_search(search_query, filters, page)
+
     # Retornar a la plantilla principal, pasando los resultados de búsqueda
-    return render_template('index.html', 
-                           search_results=matching_tweets, 
-                           search_query=search_query, 
-                           result=None, 
-                           original_text="")
+    with stage_timer(STAGE_SECONDS, stage='render'):
+        return render_template('index.html', 
+                               search_results=matching_tweets,
+                               search_query=search_query, 
+                               total_results=total_results,
+                               page=page,
+                               total_pages=total_pages,
+                               filters=filters,
+                               facets=facets,
+                               result=None, 
+                               original_text="")
+
+@app.route('/api/search', methods=['GET'])
+def api_search():
+    """
+    Búsqueda en JSON: ?q=...&tono=Negativo&intencion=Elogio&desde=2025-11-01&hasta=2025-11-30&page=1.
+    Devuelve la página de resultados (con tono, confianza, intención y fecha) y las facetas.
+    """
+    search_query = request.args.get('q', '')
+    filters = _search_filters()
+    try:
+        rows, total, page, total_pages, facets = run_search(search_query, filters, request.args.get('page', 1, type=int))
+    except ValueError:
+        return jsonify({'error': "Fecha no válida en 'desde'/'hasta' (formato AAAA-MM-DD)."}), 400
+    return jsonify({'consulta': search_query, 'filtros': filters, 'total': total, 'page': page,
+                    'total_pages': total_pages, 'facetas': facets, 'resultados': rows})
+
+def similar_texts(text, k=10, exact=False, state=None):
+    """Filas del corpus más parecidas a `text` (coseno TF-IDF), con su similitud."""
+    state = state or CORPUS_STATE
+    loaded, index = state.similarity
+    corpus = state.corpus
+    with stage_timer(STAGE_SECONDS, stage='similar'):
+        query = loaded.vectorizer.transform(clean_batch([text]))
+        row_ids, scores = index.search(query, k=k, prune=not exact)
+        rows = corpus.rows(row_ids)
+    for row, score in zip(rows, scores):
+        row['similitud'] = round(float(score), 4)
+    return rows
+
+@app.route('/api/similar', methods=['GET', 'POST'])
+def api_similar():
+    """
+    Tuits del corpus más parecidos a un texto: GET ?q=...&k=10 o POST
+    {"text": "...", "k": 10}. Con exacto=1 recorre toda la matriz (sin poda).
+    """
+    state = CORPUS_STATE
+    if state.similarity is None:
+        return jsonify({'error': 'El índice de similitud no está cargado.'}), 503
+    payload = request.get_json(silent=True) or {}
+    text = payload.get('text', request.values.get('q', ''))
+    try:
+        k = int(payload.get('k', request.values.get('k', 10)))
+    except (TypeError, ValueError):
+        k = 0
+    if not isinstance(text, str) or not text.strip() or not 1 <= k <= SIMILAR_MAX_K:
+        return jsonify({'error': f"Se esperaba un texto ('q' o 'text') y 1 <= k <= {SIMILAR_MAX_K}."}), 400
+    exact = str(payload.get('exacto', request.values.get('exacto', ''))).lower() in ('1', 'true')
+    return jsonify({'texto': text, 'k': k, 'version': state.similarity[0].fingerprint,
+                    'resultados': similar_texts(text, k, exact, state)})
+
+@app.route('/api/tendencias', methods=['GET'])
+def api_tendencias():
+    """
+    Evolución del tono y la intención: ?granularidad=hora|dia&desde=2025-12-01&hasta=2025-12-02&consulta=*.
+    Un punto por intervalo con el total y, por etiqueta, el número de tuits y la confianza media.
+    """
+    granularity = request.args.get('granularidad', 'hora')
+    consulta = request.args.get('consulta', '*')
+    if granularity not in GRANULARITIES:
+        return jsonify({'error': f"Granularidad no válida (usa {', '.join(GRANULARITIES)})."}), 400
+    try:
+        series = ROLLUP.series(granularity, request.args.get('desde'), request.args.get('hasta'), consulta)
+    except ValueError as e:
+        return jsonify({'error': f"Rango no válido: {e}"}), 400
+    return jsonify({'consulta': consulta, 'granularidad': granularity, 'serie': series})
+
+@app.route('/api/predict', methods=['POST'])
+def api_predict():
+    """
+    API JSON de clasificación por lotes.
+    Acepta {"texts": ["...", "..."]} o {"text": "..."} y devuelve etiquetas y
+    probabilidades de tono (y de intención, si el modelo tiene ese cabezal).
+    """
+    if router.current is None:
+        return jsonify({'error': 'El modelo no está cargado.'}), 503
+
+    payload = request.get_json(silent=True) or {}
+    texts = payload.get('texts')
+    if texts is None and 'text' in payload:
+        texts = [payload['text']]
+    if not isinstance(texts, list) or not all(isinstance(t, str) for t in texts):
+        return jsonify({'error': "Se esperaba un JSON con 'texts' (lista de cadenas) o 'text'."}), 400
+
+    predictions = batcher.predict(texts)
+    return jsonify({
+        'predictions': [dict(texto=t, **p) for t, p in zip(texts, predictions)]
+    })
+
+@app.route('/api/cache_stats', methods=['GET'])
+def api_cache_stats():
+    """Contadores de la caché de predicciones (aciertos, fallos, desalojos...)."""
+    current = router.current
+    return jsonify(dict(prediction_cache.stats(), model_version=current.fingerprint if current else None))
+
+@app.route('/api/registry', methods=['GET'])
+def api_registry():
+    """Versión activa y candidata, concordancia en sombra y latencia por versión."""
+    manifest = {} if router.pinned else load_manifest(router.manifest_path)
+    return jsonify(dict(router.stats(), versiones=sorted(manifest.get('versiones', {}))))
+
+@app.route('/healthz', methods=['GET'])
+def healthz():
+    """Liveness: el proceso responde."""
+    return jsonify({'status': 'ok', 'pid': os.getpid()})
+
+@app.route('/readyz', methods=['GET'])
+def readyz():
+    """Readiness: modelo y corpus cargados, calentamiento hecho y sin apagado en curso."""
+    checks = {
+        'modelo': router.current is not None,
+        'corpus': len(CORPUS_STATE.corpus) > 0,
+        'calentado': READY.is_set(),
+        'apagando': SHUTTING_DOWN.is_set(),
+    }
+    ready = checks['modelo'] and checks['calentado'] and not checks['apagando']
+    return jsonify(dict(checks, status='ready' if ready else 'not ready', pid=os.getpid())), 200 if ready else 503
+
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    """Métricas en formato de texto de Prometheus."""
+    for stat, value in prediction_cache.stats().items():
+        if isinstance(value, (int, float)):
+            CACHE_STATS.set(value, stat=stat)
+    return Response(METRICS.render(), mimetype='text/plain; version=0.0.4')
+
+@app.route('/debug/profiler', methods=['GET', 'POST'])
+def debug_profiler():
+    """
+    Activa/desactiva el perfilador de peticiones lentas en caliente (solo desde localhost).
+    POST {"enabled": true, "slow_ms": 200, "sample_rate": 0.1}; GET devuelve la
+    configuración y los últimos perfiles (formato collapsed).
+    """
+    if request.remote_addr not in ('127.0.0.1', '::1'):
+        return jsonify({'error': 'Solo disponible desde localhost.'}), 403
+    if request.method == 'POST':
+        payload = request.get_json(silent=True) or {}
+        if payload.get('enabled', True):
+            profiler.enable(payload.get('slow_ms'), payload.get('interval_ms'), payload.get('sample_rate'))
+        else:
+            profiler.disable()
+    return jsonify(dict(profiler.config(), perfiles=list(profiler.profiles)))
 
 if __name__ == '__main__':
+    # Servidor de desarrollo. En producción: python app/serve.py --workers N
+    warm_up()
     app.run(debug=True)
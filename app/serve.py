@@ -0,0 +1,195 @@
+# app/serve.py
+"""
+Servidor de producción con varios procesos (prefork).
+
+El proceso padre importa la app UNA vez: modelo, vectorizador, corpus e
+índice de búsqueda quedan en memoria, se calientan con `warm_up()` y se
+congelan con `gc.freeze()`. Después abre el socket y hace fork de N
+workers, que comparten esas estructuras de solo lectura copy-on-write (el
+GC no vuelve a recorrer los objetos congelados, así que no se copian
+páginas por tocar sus cabeceras). Cada worker atiende el socket compartido
+con un pool acotado de hilos.
+
+Señales:
+    SIGTERM / SIGINT al padre -> se reenvía SIGTERM a los workers, que dejan
+    de aceptar conexiones, marcan /readyz como 503, terminan las peticiones
+    en curso y salen. Pasado --graceful-timeout se fuerzan con SIGKILL.
+    Si un worker muere, el padre lo vuelve a lanzar.
+
+Uso:
+    python app/serve.py --workers 4 --threads 8 --port 8000
+"""
+
+import argparse
+import gc
+import os
+import signal
+import socket
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from werkzeug.serving import BaseWSGIServer, WSGIRequestHandler
+
+# app.py está junto a este script (se ejecuta como 'python app/serve.py')
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_WORKERS = int(os.environ.get('WEB_WORKERS', str(os.cpu_count() or 1)))
+DEFAULT_THREADS = int(os.environ.get('WEB_THREADS', '8'))
+DEFAULT_GRACEFUL_TIMEOUT = 30.0
+
+
+class _RequestHandler(WSGIRequestHandler):
+    # Una conexión por petición: con un pool acotado de hilos, las conexiones
+    # keep-alive inactivas ocuparían hilos indefinidamente.
+    protocol_version = 'HTTP/1.0'
+
+
+class PooledWSGIServer(BaseWSGIServer):
+    """Servidor WSGI de werkzeug que atiende cada conexión en un pool de `threads` hilos."""
+
+    multithread = True
+
+    def __init__(self, host, port, app, threads=DEFAULT_THREADS, fd=None):
+        super().__init__(host, port, app, handler=_RequestHandler, fd=fd)
+        self.pool = ThreadPoolExecutor(max_workers=threads, thread_name_prefix='http')
+
+    def process_request(self, request, client_address):
+        self.pool.submit(self._process_request_thread, request, client_address)
+
+    def _process_request_thread(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def drain(self):
+        """Espera a que terminen las peticiones en curso."""
+        self.pool.shutdown(wait=True)
+
+
+def run_worker(web_app, listen_socket, host, port, threads):
+    """Bucle de un worker (proceso hijo). No vuelve: sale con os._exit."""
+    # Ctrl+C llega a todo el grupo de procesos: el padre coordina el apagado
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    server = PooledWSGIServer(host, port, web_app.app, threads=threads, fd=listen_socket.fileno())
+    # No bloqueante: si otro worker se adelanta en accept(), este vuelve al
+    # bucle en lugar de quedarse bloqueado (y puede atender el SIGTERM)
+    server.socket.setblocking(False)
+
+    def on_sigterm(signum, frame):
+        web_app.SHUTTING_DOWN.set()
+        # shutdown() espera a serve_forever: se llama desde otro hilo
+        threading.Thread(target=server.shutdown, daemon=True).start()
+
+    signal.signal(signal.SIGTERM, on_sigterm)
+    exit_code = 0
+    try:
+        server.serve_forever(poll_interval=0.5)
+        server.drain()
+        # os._exit no ejecuta atexit: se vuelcan aquí los agregados pendientes
+        web_app.ROLLUP.flush()
+    except Exception as e:
+        print(f"❌ Worker {os.getpid()}: {e}", file=sys.stderr)
+        exit_code = 1
+    finally:
+        sys.stdout.flush()
+        os._exit(exit_code)
+
+
+def spawn_worker(web_app, listen_socket, host, port, threads):
+    pid = os.fork()
+    if pid == 0:
+        run_worker(web_app, listen_socket, host, port, threads)
+    return pid
+
+
+def serve(host='127.0.0.1', port=8000, workers=DEFAULT_WORKERS, threads=DEFAULT_THREADS,
+          graceful_timeout=DEFAULT_GRACEFUL_TIMEOUT):
+    if not hasattr(os, 'fork'):
+        print("⚠️ Este sistema no admite fork: se usa un único proceso con hilos.")
+        workers = 0
+
+    # 1. Carga y calentamiento en el padre (una sola vez para todos los workers)
+    start = time.perf_counter()
+    import app as web_app
+    web_app.warm_up()
+    print(f"✅ App cargada y calentada en {time.perf_counter() - start:.1f} s.")
+
+    listen_socket = socket.create_server((host, port), backlog=2048)
+    port = listen_socket.getsockname()[1]
+
+    if workers == 0:
+        server = PooledWSGIServer(host, port, web_app.app, threads=threads, fd=listen_socket.fileno())
+        print(f"Escuchando en http://{host}:{port} (1 proceso, {threads} hilos)")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            web_app.SHUTTING_DOWN.set()
+            server.drain()
+            web_app.ROLLUP.flush()
+        return
+
+    # 2. Congelar el heap: los objetos actuales pasan a la generación permanente
+    gc.collect()
+    gc.freeze()
+
+    stopping = threading.Event()
+
+    def on_stop(signum, frame):
+        stopping.set()
+
+    signal.signal(signal.SIGTERM, on_stop)
+    signal.signal(signal.SIGINT, on_stop)
+
+    children = {spawn_worker(web_app, listen_socket, host, port, threads) for _ in range(workers)}
+    print(f"Escuchando en http://{host}:{port} ({workers} workers x {threads} hilos, padre {os.getpid()})")
+
+    # 3. Supervisión: se relanzan los workers que mueran inesperadamente
+    while not stopping.is_set():
+        time.sleep(0.2)
+        for pid in list(children):
+            done, status = os.waitpid(pid, os.WNOHANG)
+            if done and not stopping.is_set():
+                children.discard(pid)
+                print(f"⚠️ El worker {pid} terminó (estado {status}); se lanza otro.")
+                children.add(spawn_worker(web_app, listen_socket, host, port, threads))
+
+    # 4. Apagado ordenado
+    print(f"Apagando {len(children)} workers (espera máxima {graceful_timeout:.0f} s)...")
+    for pid in children:
+        try:
+            os.kill(pid, signal.SIGTERM)
+        except ProcessLookupError:
+            pass
+    deadline = time.monotonic() + graceful_timeout
+    while children and time.monotonic() < deadline:
+        for pid in list(children):
+            try:
+                done, _ = os.waitpid(pid, os.WNOHANG)
+            except ChildProcessError:
+                done = pid
+            if done:
+                children.discard(pid)
+        time.sleep(0.05)
+    for pid in children:
+        print(f"⚠️ El worker {pid} no terminó a tiempo: SIGKILL.")
+        os.kill(pid, signal.SIGKILL)
+        os.waitpid(pid, 0)
+    listen_socket.close()
+    print("✅ Servidor detenido.")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Servidor de producción (prefork) de la app de sentimiento.")
+    parser.add_argument('--host', default=os.environ.get('WEB_HOST', '127.0.0.1'))
+    parser.add_argument('--port', type=int, default=int(os.environ.get('WEB_PORT', '8000')))
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS,
+                        help="Procesos worker (0 = un solo proceso con hilos).")
+    parser.add_argument('--threads', type=int, default=DEFAULT_THREADS, help="Hilos por worker.")
+    parser.add_argument('--graceful-timeout', type=float, default=DEFAULT_GRACEFUL_TIMEOUT)
+    args = parser.parse_args()
+    serve(args.host, args.port, args.workers, args.threads, args.graceful_timeout)
@@ -0,0 +1,79 @@
+# benchmarks/bench_collector.py
+"""
+Compara el recolector serie antiguo (una consulta tras otra, pausa fija entre
+páginas y espera fija tras un 429) con el recolector concurrente, ambos contra
+la API falsa de benchmarks/fake_search_api.py.
+
+Los tiempos de la API están escalados (ventana de 3 s en lugar de 15 min).
+Uso: python benchmarks/bench_collector.py [--queries 4] [--tweets 1000]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from src.data_pipeline.concurrent_collector import RateLimitError, TokenBucket, collect_queries
+from src.data_pipeline.tweet_store import TweetStore, Checkpoint
+from benchmarks.fake_search_api import FakeSearchClient
+
+# Mismas proporciones que el recolector antiguo (5 s entre páginas y 900 s
+# tras un 429 sobre una ventana de 900 s), escaladas a la ventana falsa.
+WINDOW = 3.0
+PAGE_PAUSE = WINDOW * 5 / 900
+RETRY_TIME = WINDOW
+
+
+def serial_fixed_sleep(client, queries, store, limit):
+    for query in queries:
+        next_token, collected = None, 0
+        while collected < limit:
+            try:
+                page = client.search(query, 100, next_token)
+            except RateLimitError:
+                time.sleep(RETRY_TIME)
+                continue
+            collected += len(store.append(page.tweets))
+            next_token = page.next_token
+            if not next_token:
+                break
+            time.sleep(PAGE_PAUSE)
+
+
+def run(label, fn, client, n_tweets):
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<28} {elapsed:>7.2f} s  {n_tweets / elapsed:>8.0f} tuits/s  "
+          f"llamadas={client.calls}  429={client.rejected}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--queries', type=int, default=4)
+    parser.add_argument('--tweets', type=int, default=1000, help="Tuits por consulta.")
+    parser.add_argument('--rate-limit', type=int, default=30, help="Peticiones por ventana.")
+    args = parser.parse_args()
+
+    queries = [f"consulta {i}" for i in range(args.queries)]
+    n_tweets = args.queries * args.tweets
+
+    with tempfile.TemporaryDirectory() as tmp:
+        client = FakeSearchClient(args.tweets, args.rate_limit, WINDOW)
+        store = TweetStore(os.path.join(tmp, 'serie.jsonl'))
+        run("serie + pausas fijas", lambda: serial_fixed_sleep(client, queries, store, args.tweets), client, n_tweets)
+
+        client = FakeSearchClient(args.tweets, args.rate_limit, WINDOW)
+        store = TweetStore(os.path.join(tmp, 'concurrente.jsonl'))
+        checkpoint = Checkpoint(os.path.join(tmp, 'checkpoint.json'))
+        limiter = TokenBucket(args.rate_limit, WINDOW)
+        run("concurrente + token bucket",
+            lambda: collect_queries(queries, client, store, checkpoint, args.tweets, limiter=limiter),
+            client, n_tweets)
+        assert len(store) == n_tweets, f"Se esperaban {n_tweets} tuits y hay {len(store)}"
+
+
+if __name__ == '__main__':
+    main()
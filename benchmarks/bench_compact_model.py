@@ -0,0 +1,86 @@
+# benchmarks/bench_compact_model.py
+"""
+Compara el arranque en frío y la latencia por petición del modelo pickle de
+sklearn frente al formato compacto (npz + vocabulario mmap).
+
+Cada arranque en frío se mide en un proceso nuevo, incluyendo los imports.
+Uso: python benchmarks/bench_compact_model.py [--requests 2000]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT)
+from benchmarks.synthetic_corpus import synthetic_corpus
+
+COLD_START_PICKLE = """
+import pickle, time
+start = time.perf_counter()
+with open({model!r}, 'rb') as f: model = pickle.load(f)
+with open({vectorizer!r}, 'rb') as f: vectorizer = pickle.load(f)
+model.predict(vectorizer.transform(['hola']))
+print(time.perf_counter() - start)
+"""
+
+COLD_START_COMPACT = """
+import sys, time
+start = time.perf_counter()
+sys.path.insert(0, {root!r})
+from src.inference.compact_model import CompactScorer
+scorer = CompactScorer.load({models_dir!r})
+scorer.predict(scorer.transform(['hola']))
+print(time.perf_counter() - start)
+"""
+
+
+def cold_start(code, repeat=5):
+    times = [float(subprocess.check_output([sys.executable, '-c', code]).decode()) for _ in range(repeat)]
+    return min(times) * 1000
+
+
+def per_request_ms(vectorizer, model, texts):
+    start = time.perf_counter()
+    for text in texts:
+        model.predict_proba(vectorizer.transform([text]))
+    return (time.perf_counter() - start) / len(texts) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--requests', type=int, default=2000)
+    args = parser.parse_args()
+
+    import pickle
+    from src.inference.compact_model import CompactScorer, export_compact_model
+
+    models_dir = os.path.join(ROOT, 'models')
+    model_path = os.path.join(models_dir, 'model_clasificador_v1.pkl')
+    vectorizer_path = os.path.join(models_dir, 'vectorizer_v1.pkl')
+    with open(model_path, 'rb') as f:
+        model = pickle.load(f)
+    with open(vectorizer_path, 'rb') as f:
+        vectorizer = pickle.load(f)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        export_compact_model(model, vectorizer, tmp)
+        scorer = CompactScorer.load(tmp)
+
+        pickle_cold = cold_start(COLD_START_PICKLE.format(model=model_path, vectorizer=vectorizer_path))
+        compact_cold = cold_start(COLD_START_COMPACT.format(root=ROOT, models_dir=tmp))
+
+        texts = [row['texto_original'] for row in synthetic_corpus(args.requests)]
+        pickle_req = per_request_ms(vectorizer, model, texts)
+        compact_req = per_request_ms(scorer, scorer, texts)
+
+    print(f"{'':<22} {'sklearn (pickle)':>18} {'compacto':>12}")
+    print(f"{'arranque en frío (ms)':<22} {pickle_cold:>18.1f} {compact_cold:>12.1f}")
+    print(f"{'ms por petición':<22} {pickle_req:>18.3f} {compact_req:>12.3f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+# benchmarks/bench_corpus_store.py
+"""
+Compara el corpus del buscador como lista de dicts (disposición anterior de
+app.py) con el CorpusStore columnar: memoria por tuit, tiempo de
+construcción, carga desde la caché y filtrado por tono de los resultados de
+una búsqueda (máscara sobre arrays frente a una predicción por resultado).
+
+Uso: python benchmarks/bench_corpus_store.py [--sizes 10000 100000]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from benchmarks.synthetic_corpus import synthetic_corpus
+from src.data_pipeline.text_cleaning import clean_batch
+from src.inference.corpus_store import CorpusStore
+from src.inference.model_registry import load_version
+from src.inference.search_index import InvertedIndex
+
+QUERIES = ['vergüenza', 'de locos', 'Madrid', 'brutal']
+
+
+def deep_size(rows):
+    """Bytes de la lista, de cada dict y de cada valor (las cadenas incluidas)."""
+    return sys.getsizeof(rows) + sum(sys.getsizeof(row) + sum(sys.getsizeof(v) for v in row.values())
+                                     for row in rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000])
+    args = parser.parse_args()
+    loaded = load_version()
+
+    print(f"{'filas':>8} | {'dicts (B/tuit)':>14} | {'columnar (B/tuit)':>17} | {'construir (s)':>13} | "
+          f"{'caché (s)':>9} | {'filtro/predict (ms)':>19} | {'filtro/arrays (ms)':>18}")
+    for size in args.sizes:
+        df = pd.DataFrame(synthetic_corpus(size))
+        df['texto_procesado'] = clean_batch(df['texto_original'])
+
+        # Disposición anterior: un dict por tuit con el texto y el texto limpio
+        rows = df[['texto_procesado']].rename(columns={'texto_procesado': 'tweet_text'})
+        rows['cleaned_text'] = clean_batch(rows['tweet_text'])
+        tweets = rows.to_dict('records')
+
+        start = time.perf_counter()
+        store = CorpusStore.build(df, loaded, clean_batch)
+        build_s = time.perf_counter() - start
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'corpus.npz')
+            store.save(path)
+            start = time.perf_counter()
+            store = CorpusStore.load(path)
+            load_s = time.perf_counter() - start
+
+        index = InvertedIndex(store.cleaned_texts())
+        hits = [index.search(q) for q in QUERIES]
+
+        # Antes: para filtrar por tono había que clasificar cada resultado
+        start = time.perf_counter()
+        for row_ids in hits:
+            texts = [tweets[i]['cleaned_text'] for i in row_ids]
+            if texts:
+                labels = loaded.model.predict(loaded.vectorizer.transform(texts))
+                [i for i, label in zip(row_ids, labels) if label == 'Negativo']
+        predict_ms = (time.perf_counter() - start) / len(QUERIES) * 1000
+
+        start = time.perf_counter()
+        for row_ids in hits:
+            store.filter(row_ids, tono='Negativo')
+            store.facets(row_ids)
+        arrays_ms = (time.perf_counter() - start) / len(QUERIES) * 1000
+
+        print(f"{size:>8} | {deep_size(tweets) / size:>14.0f} | {store.nbytes() / size:>17.0f} | {build_s:>13.2f} | "
+              f"{load_s:>9.3f} | {predict_ms:>19.2f} | {arrays_ms:>18.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+# benchmarks/bench_dedup.py
+"""
+Ratio de deduplicación (retuits, copias truncadas y casi duplicados) y tiempo
+ahorrado al clasificar solo los representantes.
+
+Para cada corpus (los reales de data/ y el sintético a varios tamaños) y cada
+modo de `deduplicate` (casi duplicados con MinHash/LSH, o solo idénticos tras
+normalizar) mide:
+  - filas, representantes y ratio (fracción de filas que no se procesan),
+  - tiempo de la deduplicación,
+  - entrenar (TF-IDF + LogisticRegression) y predecir con el modelo activo
+    todas las filas frente a solo los representantes, sumando a estos el
+    tiempo de la deduplicación.
+
+Uso: python benchmarks/bench_dedup.py [--sizes 10000 100000]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import pandas as pd
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import LogisticRegression
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from benchmarks.synthetic_corpus import synthetic_corpus
+from src.data_pipeline.deduplicator import deduplicate
+from src.data_pipeline.text_cleaning import clean_batch
+from src.inference.model_registry import load_version
+
+BASE_DIR = os.path.join(os.path.dirname(__file__), '..')
+REAL_CORPORA = [
+    os.path.join(BASE_DIR, 'data', 'processed', 'corpus_etiquetado.csv'),
+    os.path.join(BASE_DIR, 'data', 'raw', 'tweets_raw_ES.json'),
+    os.path.join(BASE_DIR, 'data', 'raw', 'nuevos_tweets.csv'),
+]
+
+
+def load_texts(path):
+    df = pd.read_csv(path) if path.endswith('.csv') else pd.read_json(path, dtype={'id_tuit': str})
+    return df['texto_original'].fillna('').astype(str).tolist()
+
+
+def train(texts, labels):
+    X = TfidfVectorizer(max_features=500, ngram_range=(1, 2)).fit_transform(texts)
+    LogisticRegression(class_weight='balanced', max_iter=1000, random_state=42).fit(X, labels)
+
+
+def predict(loaded, texts):
+    X = loaded.vectorizer.transform(texts)
+    loaded.model.predict_proba(X)
+    if loaded.intent_model is not None:
+        loaded.intent_model.predict(X)
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - start
+
+
+def measure(name, texts, loaded):
+    cleaned = clean_batch(texts)
+    # Etiquetas del modelo activo como objetivo de entrenamiento
+    labels = loaded.model.predict(loaded.vectorizer.transform(cleaned))
+    train_all = timed(train, cleaned, labels)
+    predict_all = timed(predict, loaded, cleaned)
+
+    for mode, near in (('casi', True), ('exacto', False)):
+        start = time.perf_counter()
+        dedup = deduplicate(cleaned, already_clean=True, near=near)
+        dedup_s = time.perf_counter() - start
+        reps = dedup.representatives
+        train_reps = timed(train, [cleaned[i] for i in reps], labels[reps]) + dedup_s
+        predict_reps = timed(predict, loaded, [cleaned[i] for i in reps]) + dedup_s
+        print(f"{name:<24} | {mode:<6} | {dedup.n_rows:>7} | {dedup.n_clusters:>7} | {dedup.ratio:>6.1%} | "
+              f"{dedup_s:>9.3f} | {train_all:>7.3f} -> {train_reps:>7.3f} | {predict_all:>7.3f} -> {predict_reps:>7.3f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000])
+    args = parser.parse_args()
+    loaded = load_version()
+
+    print("Tiempos en segundos: todas las filas -> representantes + deduplicación")
+    print(f"{'corpus':<24} | {'modo':<6} | {'filas':>7} | {'repr.':>7} | {'ratio':>6} | {'dedup':>9} | "
+          f"{'entrenar':>18} | {'predecir':>18}")
+    for path in REAL_CORPORA:
+        if os.path.exists(path):
+            measure(os.path.basename(path), load_texts(path), loaded)
+    for size in args.sizes:
+        measure(f"sintético {size}", [row['texto_original'] for row in synthetic_corpus(size)], loaded)
+
+
+if __name__ == '__main__':
+    main()
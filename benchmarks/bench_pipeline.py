@@ -0,0 +1,133 @@
+# benchmarks/bench_pipeline.py
+"""
+Coste de re-entrenar y evaluar tras etiquetar 100 tuits más: scripts sueltos
+frente a las etapas del pipeline (src/pipeline.py) con sus cachés.
+
+Sobre un corpus sintético con parte de las filas sin etiquetar mide:
+  - scripts: lo que hacen train_model.py y evaluate_model.py (cada uno lee el
+    CSV, limpia, deduplica y divide; luego entrenar y evaluar),
+  - pipeline en frío: dataset + features + train + evaluate sin cachés,
+  - pipeline tras etiquetar 100 filas: las mismas etapas reutilizando la
+    limpieza y las firmas MinHash de la ejecución anterior; evaluate usa la
+    matriz de prueba en caché.
+No se guardan modelos (solo se mide el cómputo de los datos y el ajuste).
+
+Uso: python benchmarks/bench_pipeline.py [--sizes 20000 100000] [--unlabeled 0.2]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import pandas as pd
+import scipy.sparse as sp
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from benchmarks.synthetic_corpus import synthetic_corpus
+from src import pipeline
+from src.model_testing.evaluate_model import report_metrics
+from src.model_training.train_model import DEFAULT_VECTORIZER_PARAMS, fit_classifiers, select_labeled, split_data
+
+NEW_LABELS = 100
+
+
+def quiet(fn, *args, **kwargs):
+    """Ejecuta `fn` sin imprimir sus informes."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return fn(*args, **kwargs)
+
+
+def run_scripts(corpus_path):
+    """train_model.py + evaluate_model.py, sin guardar: dos lecturas, limpiezas, deduplicaciones y divisiones."""
+    df = select_labeled(pd.read_csv(corpus_path))
+    intent = df['etiqueta_intencion'].fillna('').astype(str)
+    X_train, X_test, y_train, y_test, i_train, i_test = split_data(df['texto_procesado'], df['etiqueta_tono'], intent)
+    vectorizer = TfidfVectorizer(**DEFAULT_VECTORIZER_PARAMS)
+    model, intent_model = fit_classifiers(vectorizer.fit_transform(X_train), vectorizer.transform(X_test),
+                                          y_train, y_test, i_train, i_test)
+
+    df = select_labeled(pd.read_csv(corpus_path))
+    intent = df['etiqueta_intencion'].fillna('').astype(str)
+    X_train, X_test, y_train, y_test, i_train, i_test = split_data(df['texto_procesado'], df['etiqueta_tono'], intent)
+    report_metrics(model, intent_model, vectorizer.transform(X_test), y_test, i_test)
+
+
+def run_stages(corpus_path, cache_dir):
+    """Etapas dataset -> features -> train (sin guardar) -> evaluate del pipeline, con sus cachés en `cache_dir`."""
+    paths = {name: os.path.join(cache_dir, name) for name in
+             ('dataset.npz', 'firmas.npz', 'train.npz', 'test.npz', 'vectorizador.pkl')}
+    timings = {}
+    start = time.perf_counter()
+    pipeline.build_dataset(corpus_path, paths['dataset.npz'], paths['firmas.npz'])
+    timings['dataset'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    pipeline.build_features(paths['dataset.npz'], paths['train.npz'], paths['test.npz'], paths['vectorizador.pkl'])
+    timings['features'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    data = pipeline.load_dataset(paths['dataset.npz'])
+    y_train, i_train = pipeline._labels(data, data.train_idx)
+    y_test, i_test = pipeline._labels(data, data.test_idx)
+    X_test = sp.load_npz(paths['test.npz'])
+    model, intent_model = fit_classifiers(sp.load_npz(paths['train.npz']), X_test, y_train, y_test, i_train, i_test)
+    timings['train'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    data = pipeline.load_dataset(paths['dataset.npz'])
+    y_test, i_test = pipeline._labels(data, data.test_idx)
+    report_metrics(model, intent_model, sp.load_npz(paths['test.npz']), y_test, i_test)
+    timings['evaluate'] = time.perf_counter() - start
+    return timings
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = quiet(fn, *args)
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[20_000, 100_000])
+    parser.add_argument('--unlabeled', type=float, default=0.2, help="Fracción de filas sin etiquetar.")
+    args = parser.parse_args()
+
+    print(f"{'tuits':>7} | {'escenario':<30} | {'total (s)':>9} | detalle por etapa (s)")
+    for size in args.sizes:
+        workdir = tempfile.mkdtemp(prefix='bench_pipeline_')
+        try:
+            corpus_path = os.path.join(workdir, 'corpus_etiquetado.csv')
+            df = pd.DataFrame(synthetic_corpus(size))
+            labels = df[['etiqueta_tono', 'etiqueta_intencion']].copy()
+            unlabeled = df.index[-int(size * args.unlabeled):]
+            df.loc[unlabeled, ['etiqueta_tono', 'etiqueta_intencion']] = None
+            df.to_csv(corpus_path, index=False)
+
+            scripts_s, _ = timed(run_scripts, corpus_path)
+            print(f"{size:>7} | {'scripts (train + evaluate)':<30} | {scripts_s:>9.2f} |")
+            cold_s, cold = timed(run_stages, corpus_path, workdir)
+            print(f"{size:>7} | {'pipeline en frío':<30} | {cold_s:>9.2f} | "
+                  + ', '.join(f"{k} {v:.2f}" for k, v in cold.items()))
+
+            # Se etiquetan 100 filas más
+            newly = unlabeled[:NEW_LABELS]
+            df.loc[newly, ['etiqueta_tono', 'etiqueta_intencion']] = labels.loc[newly].to_numpy()
+            df.to_csv(corpus_path, index=False)
+            scripts_s, _ = timed(run_scripts, corpus_path)
+            print(f"{size:>7} | {f'scripts tras +{NEW_LABELS} etiquetas':<30} | {scripts_s:>9.2f} |")
+            warm_s, warm = timed(run_stages, corpus_path, workdir)
+            print(f"{size:>7} | {f'pipeline tras +{NEW_LABELS} etiquetas':<30} | {warm_s:>9.2f} | "
+                  + ', '.join(f"{k} {v:.2f}" for k, v in warm.items()) + f"  ({warm_s / scripts_s:.0%} de los scripts)")
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+# benchmarks/bench_search.py
+"""
+Compara el buscador antiguo (regex lineal sobre todo el corpus) con el índice
+invertido de trigramas en corpus sintéticos de 10k, 100k y 1M filas.
+
+Uso: python benchmarks/bench_search.py [--sizes 10000 100000 1000000]
+"""
+
+import argparse
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from src.inference.search_index import InvertedIndex
+from benchmarks.synthetic_corpus import synthetic_corpus
+
+QUERIES = ['vergüenza', 'chapuza', 'de locos', 'Madrid', 'brutal el', 'xyzzy']
+
+
+def linear_scan(texts, query):
+    """Implementación original de /search_tweets."""
+    pattern = re.compile(re.escape(query), re.IGNORECASE)
+    return [i for i, text in enumerate(texts) if pattern.search(text)]
+
+
+def time_queries(fn, repeat=3):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for query in QUERIES:
+            fn(query)
+        best = min(best, time.perf_counter() - start)
+    return best / len(QUERIES) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000, 1_000_000])
+    args = parser.parse_args()
+
+    print(f"{'filas':>10} | {'scan (ms/q)':>12} | {'índice (ms/q)':>13} | {'construcción (s)':>16} | {'speedup':>8}")
+    for size in args.sizes:
+        texts = [row['texto_original'] for row in synthetic_corpus(size)]
+
+        start = time.perf_counter()
+        index = InvertedIndex(texts)
+        build_time = time.perf_counter() - start
+
+        scan_ms = time_queries(lambda q: linear_scan(texts, q))
+        index_ms = time_queries(index.search)
+        print(f"{size:>10} | {scan_ms:>12.2f} | {index_ms:>13.2f} | {build_time:>16.2f} | {scan_ms / index_ms:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+# benchmarks/bench_similarity.py
+"""
+Latencia de /api/similar (SimilarityIndex) según el tamaño del corpus.
+
+Para cada tamaño construye el índice con el vectorizador de la versión activa
+sobre el corpus sintético y mide, para consultas que NO están en el corpus:
+  - búsqueda exacta (producto matriz-vector por bloques + top-k),
+  - búsqueda con poda de términos (índice invertido + puntuación de candidatos),
+  - recall@k de la poda frente a la exacta (fracción de resultados con puntuación
+    de top-k exacto; los empates cuentan como aciertos).
+La vectorización de la consulta se mide aparte (es igual en ambos casos).
+
+Uso: python benchmarks/bench_similarity.py [--sizes 10000 100000 1000000] [--queries 200]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from benchmarks.synthetic_corpus import synthetic_corpus
+from src.data_pipeline.text_cleaning import clean_batch
+from src.inference.model_registry import load_version
+from src.inference.similarity_index import SimilarityIndex
+
+K = 10
+
+
+def percentiles(times):
+    times = np.asarray(times) * 1000
+    return np.percentile(times, 50), np.percentile(times, 99)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000, 1_000_000])
+    parser.add_argument('--queries', type=int, default=200)
+    args = parser.parse_args()
+    vectorizer = load_version().vectorizer
+
+    # Consultas: tuits sintéticos con otra semilla que el corpus
+    queries = clean_batch([row['texto_original'] for row in synthetic_corpus(args.queries, seed=7)])
+    start = time.perf_counter()
+    query_vectors = [vectorizer.transform([q]) for q in queries]
+    vectorize_ms = (time.perf_counter() - start) / len(queries) * 1000
+    print(f"Vectorizar una consulta: {vectorize_ms:.2f} ms")
+
+    print(f"\n{'tuits':>9} | {'construir (s)':>13} | {'MB':>7} | {'exacta p50/p99 (ms)':>20} | "
+          f"{'poda p50/p99 (ms)':>18} | {'recall@10':>9}")
+    for size in args.sizes:
+        cleaned = clean_batch([row['texto_original'] for row in synthetic_corpus(size)])
+        start = time.perf_counter()
+        index = SimilarityIndex(vectorizer.transform(cleaned))
+        build_s = time.perf_counter() - start
+        del cleaned
+
+        exact_times, pruned_times, recalls = [], [], []
+        for q in query_vectors:
+            start = time.perf_counter()
+            exact_ids, exact_scores = index.search(q, K, prune=False)
+            exact_times.append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            pruned_ids, pruned_scores = index.search(q, K)
+            pruned_times.append(time.perf_counter() - start)
+            if len(exact_ids):
+                # Con empates (tuits repetidos) cualquier fila con la misma puntuación vale
+                recalls.append(np.sum(pruned_scores >= exact_scores[-1] - 1e-6) / len(exact_ids))
+
+        exact_p50, exact_p99 = percentiles(exact_times)
+        pruned_p50, pruned_p99 = percentiles(pruned_times)
+        print(f"{size:>9} | {build_s:>13.2f} | {index.nbytes() / 2 ** 20:>7.1f} | "
+              f"{exact_p50:>9.2f} / {exact_p99:>8.2f} | {pruned_p50:>7.2f} / {pruned_p99:>8.2f} | "
+              f"{np.mean(recalls):>9.3f}")
+
+
+if __name__ == '__main__':
+    main()
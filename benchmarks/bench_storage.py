@@ -0,0 +1,75 @@
+# benchmarks/bench_storage.py
+"""
+Rendimiento de la carga masiva de clasificaciones en SQLite: inserta N filas
+en resultados_ia (con su fila padre en expresiones_raw) mediante
+`Database.upsert_predictions`, y compara con el insert fila a fila con commit
+individual sobre una muestra pequeña.
+
+Uso: python benchmarks/bench_storage.py [--rows 1000000] [--batch-size 10000]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from src.data_pipeline.storage import Database
+
+LABELS = ['Negativo', 'Neutral', 'Positivo']
+INTENTS = ['Crítica_Destructiva', 'Elogio', 'Reporte']
+
+
+def synthetic_predictions(n_rows, offset=0, seed=42):
+    rng = random.Random(seed)
+    for i in range(offset, offset + n_rows):
+        yield {
+            'id_tuit': str(4000000000000000000 + i),
+            'texto_original': f"RT @usuario: tuit sintético número {i} https://t.co/x",
+            'texto_procesado': f"RT : tuit sintético número {i}",
+            'etiqueta_tono': rng.choice(LABELS),
+            'confianza_tono': rng.random(),
+            'etiqueta_intencion': rng.choice(INTENTS),
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--batch-size', type=int, default=10_000)
+    parser.add_argument('--naive-rows', type=int, default=2_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        with Database(os.path.join(tmp, 'bench.db')) as db:
+            db.create_schema()
+            start = time.perf_counter()
+            n = db.upsert_predictions(synthetic_predictions(args.rows), batch_size=args.batch_size)
+            elapsed = time.perf_counter() - start
+            print(f"executemany por lotes de {args.batch_size}: {n:,} filas en {elapsed:.1f} s "
+                  f"({n / elapsed:,.0f} filas/s)")
+
+            # Segunda pasada: todas son actualizaciones (upsert sobre id_tuit existente)
+            start = time.perf_counter()
+            n = db.upsert_predictions(synthetic_predictions(args.rows, seed=7), batch_size=args.batch_size)
+            elapsed = time.perf_counter() - start
+            print(f"upsert de filas existentes:        {n:,} filas en {elapsed:.1f} s ({n / elapsed:,.0f} filas/s)")
+
+            start = time.perf_counter()
+            db.conn.execute("SELECT prediccion_tono, COUNT(*) FROM resultados_ia GROUP BY prediccion_tono").fetchall()
+            print(f"recuento por etiqueta (índice):    {(time.perf_counter() - start) * 1000:.1f} ms")
+
+        with Database(os.path.join(tmp, 'naive.db')) as db:
+            db.create_schema()
+            start = time.perf_counter()
+            for row in synthetic_predictions(args.naive_rows):
+                db.upsert_predictions([row], batch_size=1)
+            elapsed = time.perf_counter() - start
+            print(f"fila a fila con commit:            {args.naive_rows:,} filas en {elapsed:.1f} s "
+                  f"({args.naive_rows / elapsed:,.0f} filas/s)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+# benchmarks/bench_text_cleaning.py
+"""
+Micro-benchmark de la limpieza de texto: la versión antigua (5 re.sub sin
+compilar aplicados fila a fila) frente a `clean_text` y `clean_batch`.
+
+Uso: python benchmarks/bench_text_cleaning.py [--rows 1000000] [--jobs 4]
+"""
+
+import argparse
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from src.data_pipeline.text_cleaning import clean_text, clean_batch
+from benchmarks.synthetic_corpus import synthetic_corpus
+
+
+def legacy_clean_text(text):
+    """Copia de la función que estaba duplicada en app.py, train_model.py y predict_model.py."""
+    if not isinstance(text, str):
+        return ""
+    text = re.sub(r'^RT @\w+:\s?', 'RT : ', text)
+    text = re.sub(r'@\w+', '', text)
+    text = re.sub(r'https?://\S+|www\.\S+', '', text)
+    text = re.sub(r't\.co/\w+', '', text)
+    text = re.sub(r'\s+', ' ', text).strip()
+    return text
+
+
+def timed(label, fn, n_rows):
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<34} {elapsed:>8.2f} s   {n_rows / elapsed:>12,.0f} tuits/s")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--jobs', type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    texts = [row['texto_original'] for row in synthetic_corpus(args.rows)]
+    # El corpus real tiene muchos retuits repetidos: duplicamos un 30% de las filas
+    texts = texts + texts[: int(len(texts) * 0.3)]
+    n_rows = len(texts)
+    print(f"Limpiando {n_rows:,} tuits sintéticos...\n")
+
+    expected = timed("legacy (5 x re.sub por fila)", lambda: [legacy_clean_text(t) for t in texts], n_rows)
+    single = timed("clean_text (patrón fusionado)", lambda: [clean_text(t) for t in texts], n_rows)
+    batch = timed("clean_batch (dedup, 1 proceso)", lambda: clean_batch(texts, n_jobs=1), n_rows)
+    parallel = timed(f"clean_batch (dedup, {args.jobs} procesos)", lambda: clean_batch(texts, n_jobs=args.jobs), n_rows)
+
+    assert expected == single == batch == parallel, "Las salidas no coinciden con la limpieza original"
+    print("\n✅ Todas las variantes producen exactamente el mismo texto limpio.")
+
+
+if __name__ == '__main__':
+    main()
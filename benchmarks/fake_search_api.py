@@ -0,0 +1,61 @@
+# benchmarks/fake_search_api.py
+"""
+API de búsqueda falsa y local para probar y medir el recolector sin red.
+
+Simula la paginación por `next_token`, la latencia de cada llamada y una
+ventana de límite de tasa que responde 429 (con `x-rate-limit-reset`) cuando
+se supera. Los tiempos se pueden escalar para que un benchmark dure segundos.
+"""
+
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from src.data_pipeline.concurrent_collector import SearchClient, SearchPage, RateLimitError
+
+
+class FakeSearchClient(SearchClient):
+
+    def __init__(self, tweets_per_query=1000, rate_limit=30, window=3.0, latency=0.05):
+        self.tweets_per_query = tweets_per_query
+        self.rate_limit = rate_limit
+        self.window = window
+        self.latency = latency
+        self._lock = threading.Lock()
+        self._window_start = time.time()
+        self._used = 0
+        self.calls = 0
+        self.rejected = 0
+
+    def _check_rate(self):
+        with self._lock:
+            now = time.time()
+            if now - self._window_start >= self.window:
+                self._window_start = now
+                self._used = 0
+            reset_at = self._window_start + self.window
+            if self._used >= self.rate_limit:
+                self.rejected += 1
+                raise RateLimitError(reset_at)
+            self._used += 1
+            self.calls += 1
+            return self.rate_limit - self._used, reset_at
+
+    def search(self, query, max_results, next_token=None):
+        remaining, reset_at = self._check_rate()
+        time.sleep(self.latency)
+
+        offset = int(next_token or 0)
+        end = min(self.tweets_per_query, offset + max_results)
+        tweets = [
+            {
+                'id_tuit': f"{abs(hash(query)) % 10**6:06d}{i:08d}",
+                'texto_original': f"Tuit {i} de la consulta {query}",
+                'fecha': '2025-12-01 11:14:10+00:00',
+            }
+            for i in range(offset, end)
+        ]
+        next_token = str(end) if end < self.tweets_per_query else None
+        return SearchPage(tweets, next_token, remaining, reset_at)
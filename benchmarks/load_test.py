@@ -0,0 +1,166 @@
+# benchmarks/load_test.py
+"""
+Prueba de carga de app/serve.py: peticiones por segundo según el número de workers.
+
+Para cada valor de --workers arranca el servidor en un puerto libre, espera
+a /readyz y lanza durante --duration segundos peticiones desde varios
+procesos cliente (cada uno con varios hilos, para que el cliente no sea el
+cuello de botella). Después apaga el servidor con SIGTERM.
+
+Uso: python benchmarks/load_test.py --workers 1 2 4 --endpoint predict --duration 10
+"""
+
+import argparse
+import http.client
+import json
+import multiprocessing
+import os
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.parse
+
+import numpy as np
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT)
+from benchmarks.synthetic_corpus import synthetic_corpus
+
+SERVE_SCRIPT = os.path.join(ROOT, 'app', 'serve.py')
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def wait_ready(port, timeout=120):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            conn = http.client.HTTPConnection('127.0.0.1', port, timeout=2)
+            conn.request('GET', '/readyz')
+            if conn.getresponse().status == 200:
+                return True
+        except OSError:
+            pass
+        time.sleep(0.2)
+    return False
+
+
+def make_request(endpoint, text):
+    """(método, ruta, cuerpo, cabeceras) de una petición al endpoint elegido."""
+    if endpoint == 'predict':
+        return 'POST', '/api/predict', json.dumps({'text': text}), {'Content-Type': 'application/json'}
+    if endpoint == 'search':
+        query = urllib.parse.urlencode({'search_query': text.split()[0] if text.split() else 'a'})
+        return 'GET', f'/search_tweets?{query}', None, {}
+    return 'POST', '/', urllib.parse.urlencode({'tweet_text': text}), {'Content-Type': 'application/x-www-form-urlencoded'}
+
+
+def client_process(port, endpoint, texts, threads, duration, queue):
+    """Un proceso cliente: `threads` hilos lanzando peticiones hasta agotar el tiempo."""
+    latencies, errors = [], [0]
+    lock = threading.Lock()
+    deadline = time.monotonic() + duration
+
+    def worker(offset):
+        local, i = [], offset
+        while time.monotonic() < deadline:
+            method, path, body, headers = make_request(endpoint, texts[i % len(texts)])
+            i += threads
+            start = time.perf_counter()
+            try:
+                conn = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+                conn.request(method, path, body=body, headers=headers)
+                response = conn.getresponse()
+                response.read()
+                conn.close()
+                ok = response.status == 200
+            except OSError:
+                ok = False
+            if ok:
+                local.append(time.perf_counter() - start)
+            else:
+                with lock:
+                    errors[0] += 1
+        with lock:
+            latencies.extend(local)
+
+    pool = [threading.Thread(target=worker, args=(k,)) for k in range(threads)]
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+    queue.put((latencies, errors[0]))
+
+
+def run_load(port, endpoint, texts, clients, threads, duration):
+    queue = multiprocessing.Queue()
+    shards = [texts[k::clients] for k in range(clients)]
+    procs = [multiprocessing.Process(target=client_process, args=(port, endpoint, shard, threads, duration, queue))
+             for shard in shards]
+    for p in procs:
+        p.start()
+    results = [queue.get() for _ in procs]
+    for p in procs:
+        p.join()
+    latencies = np.array([lat for lats, _ in results for lat in lats]) * 1000
+    errors = sum(err for _, err in results)
+    return {
+        'rps': len(latencies) / duration,
+        'p50_ms': float(np.percentile(latencies, 50)) if len(latencies) else float('nan'),
+        'p99_ms': float(np.percentile(latencies, 99)) if len(latencies) else float('nan'),
+        'errores': errors,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Prueba de carga de app/serve.py con distinto número de workers.")
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4])
+    parser.add_argument('--threads', type=int, default=8, help="Hilos por worker del servidor.")
+    parser.add_argument('--endpoint', choices=['predict', 'search', 'index'], default='predict')
+    parser.add_argument('--duration', type=float, default=10.0)
+    parser.add_argument('--clients', type=int, default=4, help="Procesos cliente.")
+    parser.add_argument('--client-threads', type=int, default=16, help="Hilos por proceso cliente.")
+    parser.add_argument('--rows', type=int, default=20_000, help="Textos sintéticos distintos (evita la caché).")
+    args = parser.parse_args()
+
+    texts = [row['texto_original'] for row in synthetic_corpus(args.rows)]
+    print(f"Endpoint: {args.endpoint} | {args.clients}x{args.client_threads} conexiones concurrentes | {args.duration:.0f} s")
+    print(f"\n{'workers':>7} {'req/s':>10} {'p50 (ms)':>10} {'p99 (ms)':>10} {'errores':>8}")
+
+    # Las predicciones sintéticas van a unos agregados temporales, no a los de data/cache/
+    rollup_dir = tempfile.TemporaryDirectory(prefix='load_test_rollup_')
+    env = dict(os.environ, SENTIMENT_ROLLUP_PATH=os.path.join(rollup_dir.name, 'sentimiento_rollup.db'))
+
+    baseline_rps = None
+    for n_workers in args.workers:
+        port = free_port()
+        server = subprocess.Popen(
+            [sys.executable, SERVE_SCRIPT, '--port', str(port), '--workers', str(n_workers),
+             '--threads', str(args.threads)],
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, env=env,
+        )
+        try:
+            if not wait_ready(port):
+                print(f"❌ El servidor con {n_workers} workers no llegó a estar listo.")
+                continue
+            result = run_load(port, args.endpoint, texts, args.clients, args.client_threads, args.duration)
+        finally:
+            server.send_signal(signal.SIGTERM)
+            server.wait(timeout=60)
+
+        baseline_rps = baseline_rps or result['rps']
+        print(f"{n_workers:>7} {result['rps']:>10.1f} {result['p50_ms']:>10.1f} {result['p99_ms']:>10.1f} "
+              f"{result['errores']:>8}   (x{result['rps'] / baseline_rps:.2f})")
+    rollup_dir.cleanup()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,296 @@
+# benchmarks/run_benchmarks.py
+"""
+Suite de rendimiento del camino limpiar -> vectorizar -> predecir.
+
+Genera un corpus sintético del tamaño pedido a partir de corpus_etiquetado.csv
+y mide, para cada etapa, el throughput y los percentiles de latencia
+(p50/p95/p99): clean_text, vectorizer.transform, model.predict, la
+predicción por lotes de predict_model.py y los endpoints de Flask. Además
+mide la memoria pico (tracemalloc) y el tiempo de carga del modelo en un
+proceso nuevo.
+
+Los resultados se escriben en JSON. Con --compare se comparan con una línea
+base guardada y se marcan las métricas que empeoran más que --threshold
+(el proceso sale con código 1 si hay regresiones, útil en CI).
+
+Uso:
+    python benchmarks/run_benchmarks.py --rows 20000 --save-baseline
+    python benchmarks/run_benchmarks.py --rows 20000 --compare benchmarks/baseline.json
+"""
+
+import argparse
+import atexit
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT)
+from benchmarks.synthetic_corpus import synthetic_corpus
+from src.data_pipeline.text_cleaning import clean_text, clean_batch
+from src.model_prediction.predict_model import load_artifacts, classify_chunk
+
+RESULTS_DIR = os.path.join(ROOT, 'benchmarks', 'results')
+BASELINE_PATH = os.path.join(ROOT, 'benchmarks', 'baseline.json')
+DEFAULT_THRESHOLD = 0.15
+
+# Carga tal y como la hace la app: los .pkl de sklearn o el formato compacto
+COLD_START = {
+    'pickle': """
+import pickle, time
+start = time.perf_counter()
+with open({model!r}, 'rb') as f: model = pickle.load(f)
+with open({vectorizer!r}, 'rb') as f: vectorizer = pickle.load(f)
+model.predict(vectorizer.transform(['hola']))
+print(time.perf_counter() - start)
+""",
+    'compact': """
+import sys, time
+start = time.perf_counter()
+sys.path.insert(0, {root!r})
+from src.inference.compact_model import CompactScorer
+scorer = CompactScorer.load({models_dir!r}, {name!r})
+scorer.predict(scorer.transform(['hola']))
+print(time.perf_counter() - start)
+""",
+}
+
+
+class Results:
+    """Métricas planas {nombre: {'value', 'unit', 'better'}} listas para comparar."""
+
+    def __init__(self):
+        self.metrics = {}
+
+    def add(self, name, value, unit, better='lower'):
+        self.metrics[name] = {'value': round(float(value), 6), 'unit': unit, 'better': better}
+
+    def add_latencies(self, name, seconds):
+        ms = np.asarray(seconds) * 1000
+        for p in (50, 95, 99):
+            self.add(f'{name}.p{p}_ms', np.percentile(ms, p), 'ms')
+
+    def add_throughput(self, name, n_items, seconds):
+        self.add(f'{name}.throughput', n_items / seconds, 'items/s', better='higher')
+
+
+def time_each(fn, items):
+    """Latencia de cada llamada individual fn(item), en segundos."""
+    times = []
+    for item in items:
+        start = time.perf_counter()
+        fn(item)
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def time_once(fn):
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def peak_memory_mb(fn):
+    """Memoria pico asignada por Python durante fn() (tracemalloc)."""
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1] / 2 ** 20
+    finally:
+        tracemalloc.stop()
+
+
+def bench_pipeline(results, texts, model, vectorizer, n_latency, intent_model=None):
+    """Etapas por separado: cada una por petición (latencia) y por lote (throughput)."""
+    sample = texts[:n_latency]
+
+    results.add_latencies('clean_text', time_each(clean_text, sample))
+    results.add_throughput('clean_text', len(texts), time_once(lambda: [clean_text(t) for t in texts]))
+    results.add_throughput('clean_batch', len(texts), time_once(lambda: clean_batch(texts)))
+
+    cleaned = clean_batch(texts)
+    results.add_latencies('transform', time_each(lambda t: vectorizer.transform([t]), cleaned[:n_latency]))
+    results.add_throughput('transform', len(cleaned), time_once(lambda: vectorizer.transform(cleaned)))
+
+    X = vectorizer.transform(cleaned)
+    rows = [X[i] for i in range(min(n_latency, X.shape[0]))]
+    results.add_latencies('predict', time_each(model.predict, rows))
+    results.add_throughput('predict', X.shape[0], time_once(lambda: model.predict(X)))
+    if intent_model is not None:
+        # Coste marginal del cabezal de intención: reutiliza la misma matriz X
+        results.add_latencies('predict_intent', time_each(intent_model.predict, rows))
+        results.add_throughput('predict_intent', X.shape[0], time_once(lambda: intent_model.predict(X)))
+
+
+def bench_batch_prediction(results, rows, model, vectorizer, intent_model=None):
+    """classify_chunk de predict_model.py sobre todo el corpus (tiempo y memoria pico)."""
+    df = pd.DataFrame(rows, columns=['id_tuit', 'texto_original'])
+    results.add_throughput('batch_prediction', len(df),
+                           time_once(lambda: classify_chunk(df, model, vectorizer, intent_model)))
+    results.add('batch_prediction.peak_memory_mb',
+                peak_memory_mb(lambda: classify_chunk(df, model, vectorizer, intent_model)), 'MB')
+
+
+def bench_flask(results, texts, n_latency, concurrency):
+    """Endpoints de la app con el cliente de pruebas de Flask (sin red)."""
+    # Las predicciones sintéticas van a unos agregados temporales, no a los de
+    # data/cache/ (se borran al salir, después del último volcado de la app)
+    rollup_dir = tempfile.mkdtemp(prefix='bench_rollup_')
+    atexit.register(shutil.rmtree, rollup_dir, ignore_errors=True)
+    os.environ['SENTIMENT_ROLLUP_PATH'] = os.path.join(rollup_dir, 'sentimiento_rollup.db')
+    from app.app import app
+
+    client = app.test_client()
+    sample = texts[:n_latency]
+
+    results.add_latencies('flask.index', time_each(
+        lambda t: client.post('/', data={'tweet_text': t}), sample))
+    results.add_latencies('flask.api_predict', time_each(
+        lambda t: client.post('/api/predict', json={'text': t}), texts[n_latency:2 * n_latency]))
+    batches = [texts[i:i + 100] for i in range(0, min(len(texts), 100 * 50), 100)]
+    results.add_latencies('flask.api_predict_batch100', time_each(
+        lambda b: client.post('/api/predict', json={'texts': b}), batches))
+    queries = [t.split()[0] for t in sample if t.split()]
+    results.add_latencies('flask.search_tweets', time_each(
+        lambda q: client.get('/search_tweets', query_string={'search_query': q}), queries))
+
+    # Peticiones concurrentes a /api/predict (aquí actúa el micro-batching)
+    chunks = [texts[i::concurrency][:n_latency // concurrency + 1] for i in range(concurrency)]
+
+    def worker(chunk):
+        thread_client = app.test_client()
+        for t in chunk:
+            thread_client.post('/api/predict', json={'text': t})
+
+    threads = [threading.Thread(target=worker, args=(chunk,)) for chunk in chunks]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    results.add_throughput(f'flask.api_predict_concurrent{concurrency}',
+                           sum(len(c) for c in chunks), time.perf_counter() - start)
+
+
+def bench_model_load(results, repeat=3):
+    """Tiempo de carga del modelo en un proceso nuevo (imports incluidos); mejor de `repeat`."""
+    from src.inference.model_registry import MANIFEST_PATH, load_manifest, resolve_paths
+
+    manifest = load_manifest()
+    compact_name = manifest['versiones'][manifest['activa']].get('compacto')
+    model_path, vectorizer_path = resolve_paths()
+    models_dir = os.path.dirname(os.path.abspath(MANIFEST_PATH))
+    for name, template in COLD_START.items():
+        if name == 'compact' and not compact_name:
+            continue
+        code = template.format(root=ROOT, models_dir=models_dir, name=compact_name,
+                               model=model_path, vectorizer=vectorizer_path)
+        times = [float(subprocess.check_output([sys.executable, '-c', code]).decode().strip().splitlines()[-1])
+                 for _ in range(repeat)]
+        results.add(f'model_load.{name}_ms', min(times) * 1000, 'ms')
+
+
+def compare(current, baseline, threshold):
+    """Devuelve [(métrica, base, actual, cambio relativo)] de las que empeoran más que `threshold`."""
+    regressions = []
+    for name, metric in current.items():
+        base = baseline.get(name)
+        if not base or not base['value']:
+            continue
+        change = (metric['value'] - base['value']) / base['value']
+        worse = change > threshold if metric['better'] == 'lower' else change < -threshold
+        if worse:
+            regressions.append((name, base['value'], metric['value'], change))
+    return regressions
+
+
+def print_table(metrics, baseline=None):
+    print(f"\n{'métrica':<42} {'valor':>14} {'unidad':<8} {'vs. base':>9}")
+    for name, metric in metrics.items():
+        delta = ''
+        base = (baseline or {}).get(name)
+        if base and base['value']:
+            delta = f"{(metric['value'] - base['value']) / base['value']:+.1%}"
+        print(f"{name:<42} {metric['value']:>14.3f} {metric['unit']:<8} {delta:>9}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks del camino limpiar -> vectorizar -> predecir.")
+    parser.add_argument('--rows', type=int, default=20_000, help="Tamaño del corpus sintético.")
+    parser.add_argument('--latency-samples', type=int, default=1_000,
+                        help="Llamadas individuales para los percentiles de latencia.")
+    parser.add_argument('--concurrency', type=int, default=16, help="Hilos para /api/predict concurrente.")
+    parser.add_argument('--pickle', action='store_true', help="Mide los .pkl de sklearn en lugar del modelo compacto.")
+    parser.add_argument('--skip-flask', action='store_true')
+    parser.add_argument('--skip-load', action='store_true')
+    parser.add_argument('--output', default=None, help="Ruta del JSON de resultados (por defecto, benchmarks/results/).")
+    parser.add_argument('--compare', default=None, help="JSON de línea base contra el que comparar.")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="Empeoramiento relativo que cuenta como regresión (0.15 = 15%%).")
+    parser.add_argument('--save-baseline', action='store_true', help=f"Guarda también el resultado en {BASELINE_PATH}.")
+    args = parser.parse_args()
+
+    rows = synthetic_corpus(args.rows)
+    texts = [row['texto_original'] for row in rows]
+    model, vectorizer, intent_model = load_artifacts(prefer_compact=not args.pickle)
+    results = Results()
+
+    print(f"Corpus sintético: {len(texts)} tuits. Modelo: {type(model).__name__}"
+          f"{' + cabezal de intención' if intent_model is not None else ''}")
+    bench_pipeline(results, texts, model, vectorizer, args.latency_samples, intent_model)
+    bench_batch_prediction(results, rows, model, vectorizer, intent_model)
+    if not args.skip_flask:
+        bench_flask(results, texts, min(args.latency_samples, len(texts) // 2), args.concurrency)
+    if not args.skip_load:
+        bench_model_load(results)
+
+    report = {
+        'metadata': {
+            'fecha': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'rows': args.rows,
+            'latency_samples': args.latency_samples,
+            'modelo': type(model).__name__,
+            'python': platform.python_version(),
+            'plataforma': platform.platform(),
+            'cpus': os.cpu_count(),
+        },
+        'metrics': results.metrics,
+    }
+
+    output = args.output or os.path.join(RESULTS_DIR, f"bench-{time.strftime('%Y%m%d-%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    if args.save_baseline:
+        with open(BASELINE_PATH, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)['metrics']
+    print_table(results.metrics, baseline)
+    print(f"\nResultados guardados en: {output}")
+
+    if baseline is not None:
+        regressions = compare(results.metrics, baseline, args.threshold)
+        if regressions:
+            print(f"\n❌ {len(regressions)} regresiones (umbral {args.threshold:.0%}):")
+            for name, base, current, change in regressions:
+                print(f"   {name}: {base:.3f} -> {current:.3f} ({change:+.1%})")
+            sys.exit(1)
+        print(f"\n✅ Sin regresiones respecto a {args.compare} (umbral {args.threshold:.0%}).")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,44 @@
+# benchmarks/synthetic_corpus.py
+
+import csv
+import os
+import random
+
+BASE_DIR = os.path.join(os.path.dirname(__file__), '..')
+CORPUS_PATH = os.path.join(BASE_DIR, 'data', 'processed', 'corpus_etiquetado.csv')
+
+
+def load_seed_rows(path=CORPUS_PATH):
+    """Filas reales del corpus etiquetado que sirven de semilla."""
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        return [row for row in csv.DictReader(f) if row.get('texto_original')]
+
+
+def synthetic_corpus(n_rows, seed=42, path=CORPUS_PATH):
+    """
+    Genera `n_rows` tuits sintéticos en español a partir del corpus real.
+
+    Cada fila toma un tuit semilla y mezcla parte de sus palabras con las de
+    otro tuit, de modo que el vocabulario y la longitud se parecen a los datos
+    reales pero los textos no son copias exactas. Devuelve una lista de dicts
+    con las mismas columnas que 'corpus_etiquetado.csv'.
+    """
+    rng = random.Random(seed)
+    seeds = load_seed_rows(path)
+    words = [row['texto_original'].split() for row in seeds]
+
+    rows = []
+    for i in range(n_rows):
+        base = rng.randrange(len(seeds))
+        other = words[rng.randrange(len(seeds))]
+        text = list(words[base])
+        if other and text:
+            cut = rng.randrange(len(text))
+            text = text[:cut] + other[rng.randrange(len(other)):][:rng.randint(1, 6)] + text[cut:]
+        rows.append({
+            'id_tuit': str(3000000000000000000 + i),
+            'texto_original': ' '.join(text),
+            'etiqueta_tono': seeds[base].get('etiqueta_tono', ''),
+            'etiqueta_intencion': seeds[base].get('etiqueta_intencion', ''),
+        })
+    return rows
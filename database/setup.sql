@@ -1,4 +1,4 @@
-CREATE TABLE expresiones_raw (
+CREATE TABLE IF NOT EXISTS expresiones_raw (
     id_expresion SERIAL PRIMARY KEY,
     id_tuit VARCHAR(255) UNIQUE NOT NULL,
     texto_original TEXT NOT NULL,
@@ -9,7 +9,7 @@ CREATE TABLE expresiones_raw (
 
 ---
 
-CREATE TABLE resultados_ia (
+CREATE TABLE IF NOT EXISTS resultados_ia (
     id_clasificacion SERIAL PRIMARY KEY,
     id_tuit VARCHAR(255) UNIQUE NOT NULL,
     texto_procesado TEXT NOT NULL,
@@ -18,4 +18,13 @@ CREATE TABLE resultados_ia (
     prediccion_intencion VARCHAR(50) NOT NULL,
     fecha_clasificacion TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
     FOREIGN KEY (id_tuit) REFERENCES expresiones_raw (id_tuit)
-);
\ No newline at end of file
+);
+
+---
+
+-- Índices para las consultas habituales. La búsqueda por id_tuit ya está
+-- cubierta por las restricciones UNIQUE de ambas tablas.
+CREATE INDEX IF NOT EXISTS idx_expresiones_raw_etiqueta_tono ON expresiones_raw (etiqueta_tono);
+CREATE INDEX IF NOT EXISTS idx_expresiones_raw_fecha ON expresiones_raw (fecha_recoleccion);
+CREATE INDEX IF NOT EXISTS idx_resultados_ia_prediccion_tono ON resultados_ia (prediccion_tono);
+CREATE INDEX IF NOT EXISTS idx_resultados_ia_fecha ON resultados_ia (fecha_clasificacion);
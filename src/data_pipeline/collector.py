@@ -1,127 +1,100 @@
-import tweepy
-import json
 import os
-import time
-from datetime import datetime, timedelta
+import sys
+import argparse
+
+# Raíz del proyecto en sys.path para importar los módulos compartidos de 'src'
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from src.data_pipeline.tweet_store import TweetStore, Checkpoint
+from src.data_pipeline.concurrent_collector import TweepySearchClient, TokenBucket, collect_queries
 
 # --- ⚠️ CONFIGURACIÓN (Asegúrate de que el BEARER_TOKEN es correcto) ⚠️ ---
 BEARER_TOKEN = "TU BEARER_TOKEN"
 # ---------------------------------------------------------------------
 
-INPUT_FILENAME = 'tweets_raw_ES.json'
+INPUT_FILENAME = 'tweets_raw_ES.jsonl'
 OUTPUT_PATH = os.path.join('data', 'raw', INPUT_FILENAME)
-RETRY_TIME = 900 # 15 minutos de espera forzada (en segundos)
+# Formato antiguo (lista JSON reescrita entera en cada página): se migra al abrir el almacén
+LEGACY_OUTPUT_PATH = os.path.join('data', 'raw', 'tweets_raw_ES.json')
+CHECKPOINT_PATH = os.path.join('data', 'raw', 'collector_checkpoint.json')
+# Límite de la búsqueda reciente v2 (autenticación de aplicación): 450 peticiones / 15 min.
+# El limitador se ajusta además con las cabeceras x-rate-limit-* de cada respuesta.
+RATE_LIMIT_REQUESTS = 450
+RATE_LIMIT_WINDOW = 900
 
-def load_existing_tweets():
-    """Carga los tuits ya guardados para continuar la recolección."""
-    if os.path.exists(OUTPUT_PATH):
-        with open(OUTPUT_PATH, 'r', encoding='utf-8') as f:
-            try:
-                data = json.load(f)
-                print(f"✅ Se han cargado {len(data)} tuits preexistentes para continuar.")
-                return data
-            except json.JSONDecodeError:
-                print("Advertencia: El archivo JSON está corrupto o vacío. Empezando de nuevo.")
-                return []
-    return []
+# Consulta de búsqueda para España, mezclando crítica y elogio
+QUERY_ES = "(vaya tela OR chapuza OR timo OR cutre OR vergüenza OR flipa OR brutal OR máquina OR de locos) lang:es"
+# La misma búsqueda partida en consultas de crítica y de elogio, que se recolectan a la vez
+QUERIES_ES = [
+    "(vaya tela OR chapuza OR timo OR cutre OR vergüenza) lang:es",
+    "(flipa OR brutal OR máquina OR de locos) lang:es",
+]
 
-def save_tweets(tweets_list):
-    """Guarda la lista de tuits en el archivo JSON."""
-    os.makedirs(os.path.join('data', 'raw'), exist_ok=True)
-    with open(OUTPUT_PATH, 'w', encoding='utf-8') as f:
-        json.dump(tweets_list, f, ensure_ascii=False, indent=4)
-    print(f"-> Datos guardados en {OUTPUT_PATH}. Total: {len(tweets_list)}")
+def open_tweet_store():
+    """Abre el corpus de solo-añadir (migrando el JSON antiguo si hace falta)."""
+    store = TweetStore(OUTPUT_PATH, legacy_path=LEGACY_OUTPUT_PATH)
+    if len(store):
+        print(f"✅ Se han cargado {len(store)} tuits preexistentes para continuar.")
+    return store
 
-def collect_tweets_v2(query, max_results_per_call=100, total_limit=1000):
-    
+def collect_queries_v2(queries, max_results_per_call=100, limit_per_query=1000, max_workers=None, store=None):
+    """
+    Recolecta varias consultas a la vez bajo un limitador de tasa compartido.
+    Cada consulta reanuda su paginación desde el checkpoint. `store` es un
+    almacén ya abierto con open_tweet_store(); si no se pasa, se abre aquí.
+    """
     if not BEARER_TOKEN or BEARER_TOKEN == "PEGA_AQUI_TU_BEARER_TOKEN_COMPLETO":
         print("ERROR: El BEARER_TOKEN no está configurado.")
         return
 
-    client = tweepy.Client(BEARER_TOKEN)
-    all_tweets = load_existing_tweets()
-    tweets_collected = len(all_tweets)
-    next_token = None # Usarás esto si tienes un mecanismo para guardar/cargar el token, pero por ahora se omite.
-    
-    print(f"Buscando tuits V2 con la consulta: '{query}'...")
-    print(f"Límite total: {total_limit}. Empezando desde {tweets_collected}.")
+    client = TweepySearchClient(BEARER_TOKEN)
+    if store is None:
+        store = open_tweet_store()
+    checkpoint = Checkpoint(CHECKPOINT_PATH)
+    limiter = TokenBucket(RATE_LIMIT_REQUESTS, RATE_LIMIT_WINDOW)
 
-    while tweets_collected < total_limit:
-        
-        current_max_results = min(max_results_per_call, total_limit - tweets_collected)
-        if current_max_results <= 0:
-            break
-        
-        try:
-            print(f"\nIntentando recolectar {current_max_results} tuits (Total actual: {tweets_collected})...")
-            
-            response = client.search_recent_tweets(
-                query=query,
-                max_results=current_max_results,
-                tweet_fields=['created_at', 'lang'],
-                next_token=next_token 
-            )
-            
-            if response.data:
-                # Filtrar y acumular tuits
-                new_tweets = []
-                for tweet in response.data:
-                    if tweet.lang == 'es':
-                        tweet_data = {
-                            'id_tuit': str(tweet.id),
-                            'texto_original': tweet.text, 
-                            'fecha': str(tweet.created_at)
-                        }
-                        new_tweets.append(tweet_data)
-                        
-                all_tweets.extend(new_tweets)
-                tweets_collected = len(all_tweets)
-                
-                # Guardar los datos recolectados hasta ahora (Guardado Progresivo)
-                save_tweets(all_tweets)
-                
-                # Actualizar el token para la próxima llamada
-                next_token = response.meta.get('next_token')
-                
-                if next_token:
-                    print(f"Pausa de 5 segundos antes de la siguiente llamada...")
-                    time.sleep(5) 
-                else:
-                    print("Fin de los resultados disponibles para esta consulta.")
-                    break
-            else:
-                print("No se encontraron tuits nuevos o no hay más resultados.")
-                break
+    print(f"Buscando tuits V2 con {len(queries)} consultas en paralelo...")
+    for query in queries:
+        next_token = checkpoint.get(query).get('next_token')
+        status = f"reanudando desde next_token={next_token}" if next_token else "desde el principio"
+        print(f"  - '{query}' ({status})")
 
-        except tweepy.TweepyException as e:
-            if e.response and e.response.status_code == 429:
-                # 429: Rate Limit excedido
-                retry_until = datetime.now() + timedelta(seconds=RETRY_TIME)
-                print(f"\n🛑 ERROR 429 (Too Many Requests). Límite de la API excedido.")
-                print(f"Se reanudará automáticamente la recolección aproximadamente a las: {retry_until.strftime('%H:%M:%S')}")
-                
-                # Pausa larga
-                time.sleep(RETRY_TIME)
-                
-            else:
-                # Otros errores (ej: 503 Service Unavailable)
-                print(f"Error inesperado de la API de X (V2): {e}. Intentando de nuevo en 30 segundos.")
-                time.sleep(30)
-                
-        except Exception as e:
-            print(f"Ocurrió un error general: {e}")
-            break
+    added = collect_queries(
+        queries, client, store, checkpoint,
+        limit_per_query=limit_per_query,
+        max_workers=max_workers,
+        limiter=limiter,
+        max_results_per_call=max_results_per_call,
+    )
 
     print(f"\n--- RECOLECCIÓN FINALIZADA ---")
-    print(f"Total de tuits en el corpus: {len(all_tweets)}")
+    for query, count in added.items():
+        print(f"'{query}': {count} tuits nuevos")
+    print(f"Total de tuits en el corpus: {len(store)}")
+
+
+def collect_tweets_v2(query, max_results_per_call=100, total_limit=1000):
+    """Recolecta una sola consulta hasta que el corpus alcance `total_limit` tuits."""
+    # El mismo almacén sirve para contar y para recolectar: el JSONL se lee una sola vez
+    store = open_tweet_store()
+    pending = total_limit - len(store)
+    if pending <= 0:
+        print(f"El corpus ya tiene {total_limit} tuits o más. Nada que recolectar.")
+        return
+    collect_queries_v2([query], max_results_per_call=max_results_per_call, limit_per_query=pending, store=store)
 
 
 if __name__ == '__main__':
-    
-    # Consulta de búsqueda para España, mezclando crítica y elogio
-    QUERY_ES = "(vaya tela OR chapuza OR timo OR cutre OR vergüenza OR flipa OR brutal OR máquina OR de locos) lang:es"
-    
-    collect_tweets_v2(
-        query=QUERY_ES,
-        total_limit=1000 
+    parser = argparse.ArgumentParser(description="Recolecta tuits de la API v2 de X.")
+    parser.add_argument('--query', action='append',
+                        help="Consulta a recolectar (se puede repetir). Por defecto, QUERIES_ES.")
+    parser.add_argument('--limit-per-query', type=int, default=1000,
+                        help="Máximo de tuits nuevos por consulta en esta ejecución.")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="Consultas recolectadas en paralelo (por defecto, todas).")
+    args = parser.parse_args()
+
+    collect_queries_v2(
+        queries=args.query or QUERIES_ES,
+        limit_per_query=args.limit_per_query,
+        max_workers=args.workers,
     )
@@ -0,0 +1,256 @@
+# src/data_pipeline/concurrent_collector.py
+"""
+Recolector concurrente de varias consultas con un limitador compartido.
+
+Varias consultas se paginan a la vez en un pool de hilos. Todas piden permiso
+a un único `TokenBucket` antes de cada llamada, y el bucket se ajusta con las
+cabeceras de límite de la API (`x-rate-limit-remaining` / `x-rate-limit-reset`),
+de modo que se aprovecha toda la ventana sin pasarse. Ante un 429 se espera
+hasta el `reset` que indica la API (o con backoff exponencial si no lo indica),
+en lugar de pausas fijas.
+
+El acceso a la API va detrás de `SearchClient`, así que se puede sustituir por
+un cliente falso para pruebas y benchmarks (ver benchmarks/fake_search_api.py).
+"""
+
+import random
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+# Búsqueda reciente v2 con autenticación de aplicación: 450 peticiones / 15 min
+DEFAULT_RATE_CAPACITY = 450
+DEFAULT_RATE_WINDOW = 900
+
+SearchPage = namedtuple('SearchPage', ['tweets', 'next_token', 'rate_remaining', 'rate_reset'])
+SearchPage.__doc__ = """Una página de resultados. `rate_reset` es un timestamp UNIX (o None)."""
+
+
+class RateLimitError(Exception):
+    """La API respondió 429. `reset_at` es el timestamp UNIX en que se libera la ventana."""
+
+    def __init__(self, reset_at=None):
+        super().__init__(f"Límite de la API excedido (reset: {reset_at})")
+        self.reset_at = reset_at
+
+
+class TransientAPIError(Exception):
+    """
+    Error temporal de la API (5xx, red...): se reintenta con backoff. Los
+    demás errores (4xx: token incorrecto, consulta inválida...) no se
+    envuelven: el cliente los deja pasar y la recolección falla en el acto.
+    """
+
+
+class SearchClient:
+    """Interfaz del cliente de búsqueda que usa el recolector."""
+
+    def search(self, query, max_results, next_token=None):
+        """
+        Devuelve un `SearchPage`; lanza `RateLimitError`, `TransientAPIError`
+        o, si no tiene sentido reintentar, el error original.
+        """
+        raise NotImplementedError
+
+
+def _header_int(headers, name):
+    value = headers.get(name) if headers is not None else None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class TweepySearchClient(SearchClient):
+    """Cliente real de la API v2 de X sobre tweepy, leyendo las cabeceras de límite."""
+
+    def __init__(self, bearer_token, lang='es'):
+        import requests
+        import tweepy
+
+        self._tweepy = tweepy
+        self._requests = requests
+        # return_type=requests.Response nos da acceso a las cabeceras x-rate-limit-*
+        self._client = tweepy.Client(bearer_token, return_type=requests.Response)
+        self.lang = lang
+
+    def search(self, query, max_results, next_token=None):
+        # La API v2 exige max_results entre 10 y 100
+        max_results = min(100, max(10, max_results))
+        try:
+            response = self._client.search_recent_tweets(
+                query=query,
+                max_results=max_results,
+                tweet_fields=['created_at', 'lang'],
+                next_token=next_token,
+            )
+        except self._tweepy.TooManyRequests as e:
+            raise RateLimitError(_header_int(e.response.headers, 'x-rate-limit-reset')) from e
+        except (self._tweepy.TwitterServerError, self._requests.ConnectionError, self._requests.Timeout) as e:
+            raise TransientAPIError(str(e)) from e
+        # BadRequest, Unauthorized, Forbidden, NotFound...: reintentar no arregla
+        # un token o una consulta incorrectos, así que se propagan tal cual
+
+        payload = response.json()
+        tweets = [
+            {
+                'id_tuit': str(tweet['id']),
+                'texto_original': tweet['text'],
+                'fecha': tweet.get('created_at', ''),
+            }
+            for tweet in payload.get('data', [])
+            if tweet.get('lang') == self.lang
+        ]
+        return SearchPage(
+            tweets=tweets,
+            next_token=payload.get('meta', {}).get('next_token'),
+            rate_remaining=_header_int(response.headers, 'x-rate-limit-remaining'),
+            rate_reset=_header_int(response.headers, 'x-rate-limit-reset'),
+        )
+
+
+class TokenBucket:
+    """
+    Limitador de tasa compartido entre hilos.
+
+    Se rellena a `capacity / window` fichas por segundo. Las cabeceras de la
+    API mandan sobre la estimación local: si la API dice que quedan N
+    peticiones, el bucket nunca tiene más de N fichas, y si quedan 0 se
+    bloquea hasta el `reset` indicado.
+    """
+
+    def __init__(self, capacity=DEFAULT_RATE_CAPACITY, window=DEFAULT_RATE_WINDOW,
+                 clock=time.time, sleep=time.sleep):
+        self.capacity = float(capacity)
+        self.rate = self.capacity / float(window)
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self):
+        """Bloquea hasta disponer de una ficha y la consume."""
+        while True:
+            with self._lock:
+                now = self._clock()
+                if now < self._blocked_until:
+                    wait = self._blocked_until - now
+                else:
+                    self._refill(now)
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        return
+                    wait = (1 - self._tokens) / self.rate
+            self._sleep(wait)
+
+    def update_from_headers(self, remaining, reset_at):
+        """Ajusta el bucket con `x-rate-limit-remaining` y `x-rate-limit-reset`."""
+        with self._lock:
+            now = self._clock()
+            self._refill(now)
+            if remaining is not None:
+                self._tokens = min(self._tokens, float(remaining))
+                if remaining <= 0 and reset_at:
+                    self.block_until(reset_at, _locked=True)
+
+    def block_until(self, timestamp, _locked=False):
+        """Nadie hace peticiones hasta `timestamp` (p. ej. tras un 429)."""
+        if _locked:
+            self._blocked_until = max(self._blocked_until, float(timestamp))
+            self._tokens = 0.0
+            return
+        with self._lock:
+            self.block_until(timestamp, _locked=True)
+
+
+class AdaptiveBackoff:
+    """Backoff exponencial con jitter; se reinicia tras cada llamada correcta."""
+
+    def __init__(self, base=1.0, maximum=900.0):
+        self.base = base
+        self.maximum = maximum
+        self.attempts = 0
+
+    def next_delay(self):
+        delay = min(self.maximum, self.base * (2 ** self.attempts))
+        self.attempts += 1
+        return delay * random.uniform(0.5, 1.0)
+
+    def reset(self):
+        self.attempts = 0
+
+
+def collect_query(query, client, store, checkpoint, limiter, limit, max_results_per_call=100,
+                  store_lock=None, clock=time.time, sleep=time.sleep, max_retries=8):
+    """
+    Pagina una consulta hasta reunir `limit` tuits nuevos o agotar resultados.
+    Cada página se guarda y su `next_token` se apunta en el checkpoint antes de
+    pedir la siguiente. Devuelve el número de tuits nuevos añadidos.
+    """
+    store_lock = store_lock or threading.Lock()
+    next_token = checkpoint.get(query).get('next_token')
+    collected = 0
+    backoff = AdaptiveBackoff()
+
+    while collected < limit:
+        limiter.acquire()
+        try:
+            page = client.search(query, min(max_results_per_call, limit - collected), next_token)
+        except RateLimitError as e:
+            # Se respeta el reset de la API; sin él, backoff exponencial
+            delay = backoff.next_delay()
+            reset_at = e.reset_at or clock() + delay
+            limiter.block_until(reset_at)
+            print(f"🛑 [{query}] 429: se pausan las peticiones hasta {time.strftime('%H:%M:%S', time.localtime(reset_at))}")
+            continue
+        except TransientAPIError as e:
+            if backoff.attempts >= max_retries:
+                print(f"❌ [{query}] Demasiados errores seguidos: {e}")
+                break
+            delay = backoff.next_delay()
+            print(f"[{query}] Error temporal de la API: {e}. Reintento en {delay:.1f} s.")
+            sleep(delay)
+            continue
+
+        backoff.reset()
+        limiter.update_from_headers(page.rate_remaining, page.rate_reset)
+
+        records = [dict(tweet, consulta=query) for tweet in page.tweets]
+        with store_lock:
+            added = store.append(records)
+            collected += len(added)
+            next_token = page.next_token
+            checkpoint.update(query, next_token=next_token)
+
+        print(f"-> [{query}] +{len(added)} tuits nuevos (consulta: {collected}, corpus: {len(store)})")
+        if not next_token:
+            print(f"[{query}] Fin de los resultados disponibles para esta consulta.")
+            break
+
+    return collected
+
+
+def collect_queries(queries, client, store, checkpoint, limit_per_query=1000, max_workers=None,
+                    limiter=None, max_results_per_call=100):
+    """
+    Recolecta varias consultas a la vez, compartiendo un único limitador.
+    Devuelve {consulta: tuits nuevos añadidos}.
+    """
+    limiter = limiter or TokenBucket()
+    store_lock = threading.Lock()
+    max_workers = max_workers or len(queries)
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='collector') as executor:
+        futures = {
+            query: executor.submit(collect_query, query, client, store, checkpoint, limiter,
+                                   limit_per_query, max_results_per_call, store_lock)
+            for query in queries
+        }
+        return {query: future.result() for query, future in futures.items()}
@@ -0,0 +1,524 @@
+# src/data_pipeline/deduplicator.py
+"""
+Agrupación de tuits duplicados y casi duplicados (retuits y copias truncadas).
+
+Buena parte del corpus son retuits ('RT @usuario: ...') del mismo texto y
+copias cortadas con '…'. Este módulo asigna a cada tuit un clúster y elige un
+representante canónico por clúster, para que el preprocesado, el
+entrenamiento y la predicción trabajen solo con los representantes y
+repartan el resultado a los demás miembros.
+
+Tiempo casi lineal:
+  1. Normalización: limpieza compartida, sin prefijo 'RT :', sin la marca de
+     truncado final, minúsculas y sin tildes. Los textos normalizados
+     idénticos forman ya un grupo (hash exacto).
+  2. Shingles de caracteres de cada texto distinto (hash polinómico sobre
+     ventanas de los códigos Unicode) y firma MinHash (`num_perm`
+     permutaciones), todo con operaciones de NumPy por bloques de textos.
+  3. LSH: la firma se parte en `bands` bandas; los textos que coinciden en
+     alguna banda son candidatos. Cada candidato se compara solo con el
+     primero de su cubeta (no todos contra todos).
+  4. Verificación con la similitud de Jaccard estimada por las firmas (o la
+     contención, si uno de los dos es una copia truncada) y union-find.
+
+Uso:
+    dedup = deduplicate(df['texto_original'])
+    reps = df.iloc[dedup.representatives]           # una fila por clúster
+    df['etiqueta_tono'] = labels_of_reps[dedup.cluster_ids]
+"""
+
+import hashlib
+import os
+import sys
+import unicodedata
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from src.data_pipeline.text_cleaning import clean_batch
+
+DEFAULT_THRESHOLD = 0.8
+DEFAULT_NUM_PERM = 96
+DEFAULT_BANDS = 32
+DEFAULT_SHINGLE_SIZE = 5
+# Por debajo de estos shingles solo se agrupan los textos idénticos
+MIN_SHINGLES = 8
+TRUNCATION_MARKS = ('…', '...')
+_SHINGLE_BASE = np.uint64(1_000_003)
+_MIX = np.uint64(0x9E3779B97F4A7C15)
+# Caracteres por bloque al calcular las firmas (acota la memoria: num_perm x bloque)
+_SIGNATURE_BLOCK = 100_000
+
+
+def normalize_for_dedup(cleaned_text):
+    """Texto limpio -> forma canónica para comparar (sin 'RT :', sin '…' final, minúsculas, sin tildes)."""
+    text = cleaned_text
+    if text.startswith('RT : '):
+        text = text[5:]
+    text = text.rstrip(' "')
+    for mark in TRUNCATION_MARKS:
+        if text.endswith(mark):
+            text = text[:-len(mark)]
+            break
+    # Sin tildes ni símbolos no ASCII (emojis): NFKD + encode en C, sin bucles en Python
+    text = unicodedata.normalize('NFKD', text.casefold()).encode('ascii', 'ignore').decode('ascii')
+    return ' '.join(text.split())
+
+
+def is_truncated(cleaned_text):
+    return cleaned_text.rstrip(' "').endswith(TRUNCATION_MARKS)
+
+
+def shingle_hashes(texts, size=DEFAULT_SHINGLE_SIZE):
+    """
+    Hashes (< 2^32) de todos los n-gramas de `size` caracteres de `texts`
+    (cada texto debe tener al menos `size` caracteres), concatenados, y el
+    offset donde empiezan los de cada texto.
+    """
+    lengths = np.array([len(t) for t in texts], dtype=np.int64)
+    codes = np.frombuffer(''.join(texts).encode('utf-32-le'), dtype=np.uint32).astype(np.uint64)
+    # Hash polinómico de cada ventana de `size` códigos (aritmética uint64 modular)
+    n_windows = len(codes) - size + 1
+    h = np.zeros(n_windows, dtype=np.uint64)
+    for k in range(size):
+        h = h * _SHINGLE_BASE + codes[k:k + n_windows]
+    h = (h * _MIX) >> np.uint64(32)
+
+    # Solo las ventanas que no cruzan de un texto al siguiente
+    counts = lengths - size + 1
+    offsets = np.zeros(len(texts), dtype=np.int64)
+    np.cumsum(counts[:-1], out=offsets[1:])
+    starts = np.zeros(len(texts), dtype=np.int64)
+    np.cumsum(lengths[:-1], out=starts[1:])
+    windows = np.repeat(starts - offsets, counts) + np.arange(counts.sum())
+    return h[windows], offsets
+
+
+def minhash_signatures(texts, num_perm=DEFAULT_NUM_PERM, shingle_size=DEFAULT_SHINGLE_SIZE, seed=1):
+    """
+    Firma MinHash (num_perm valores) de los shingles de cada texto. Las
+    permutaciones (hash multiplicativo: 32 bits altos de a*x + b, módulo 2^64)
+    se aplican a todos los shingles de un bloque de textos a la vez y el
+    mínimo por texto sale de `np.minimum.reduceat`.
+    """
+    rng = np.random.RandomState(seed)
+    a = (rng.randint(0, 2 ** 62, size=(num_perm, 1), dtype=np.int64).astype(np.uint64) << np.uint64(1)) | np.uint64(1)
+    b = rng.randint(0, 2 ** 62, size=(num_perm, 1), dtype=np.int64).astype(np.uint64)
+
+    signatures = np.empty((len(texts), num_perm), dtype=np.uint64)
+    start = 0
+    while start < len(texts):
+        # Bloque de textos con ~_SIGNATURE_BLOCK caracteres en total
+        end, total = start, 0
+        while end < len(texts) and (total == 0 or total + len(texts[end]) <= _SIGNATURE_BLOCK):
+            total += len(texts[end])
+            end += 1
+        hashes, offsets = shingle_hashes(texts[start:end], shingle_size)
+        hashed = (a * hashes[None, :] + b) >> np.uint64(32)
+        signatures[start:end] = np.minimum.reduceat(hashed, offsets, axis=1).T
+        start = end
+    return signatures
+
+
+class SignatureCache:
+    """
+    Firmas MinHash ya calculadas, por texto normalizado (hash blake2b de 8
+    bytes). Con `deduplicate(..., signature_cache=cache)` solo se calculan las
+    firmas de los textos que no estaban, así que volver a deduplicar un corpus
+    que apenas ha cambiado (p. ej. tras etiquetar unas filas más) cuesta lo
+    que sus textos nuevos. `save` guarda solo las firmas usadas desde que se
+    cargó: las de textos que ya no están en el corpus se descartan.
+
+        cache = SignatureCache.load(ruta)
+        dedup = deduplicate(textos, already_clean=True, signature_cache=cache)
+        cache.save(ruta)
+    """
+
+    def __init__(self, num_perm=DEFAULT_NUM_PERM, shingle_size=DEFAULT_SHINGLE_SIZE, seed=1, keys=None,
+                 signatures=None):
+        self.params = (num_perm, shingle_size, seed)
+        self.keys = np.zeros(0, dtype=np.uint64) if keys is None else keys
+        # Los valores de las firmas caben en 32 bits (32 bits altos del hash)
+        self.signatures = np.zeros((0, num_perm), dtype=np.uint32) if signatures is None else signatures
+        self._rows = {key: row for row, key in enumerate(self.keys.tolist())}
+        self._used = np.zeros(len(self.keys), dtype=bool)
+        self.hits = self.misses = 0
+
+    def __len__(self):
+        return len(self.keys)
+
+    @staticmethod
+    def _key(text):
+        return int.from_bytes(hashlib.blake2b(text.encode('utf-8'), digest_size=8).digest(), 'little')
+
+    def get(self, texts, num_perm=DEFAULT_NUM_PERM, shingle_size=DEFAULT_SHINGLE_SIZE, seed=1):
+        """Firmas (uint64, como `minhash_signatures`) de `texts`, calculando solo las que faltan."""
+        if (num_perm, shingle_size, seed) != self.params:
+            raise ValueError(f"La caché es de firmas {self.params} y se piden {(num_perm, shingle_size, seed)}")
+        keys = [self._key(t) for t in texts]
+        rows = np.array([self._rows.get(k, -1) for k in keys], dtype=np.int64)
+        missing = np.flatnonzero(rows < 0)
+        if len(missing):
+            new_rows, first = {}, []
+            for i in missing:
+                row = new_rows.setdefault(keys[i], len(self.keys) + len(new_rows))
+                if row == len(self.keys) + len(first):
+                    first.append(i)
+                rows[i] = row
+            computed = minhash_signatures([texts[i] for i in first], num_perm, shingle_size, seed)
+            self.keys = np.concatenate([self.keys, np.fromiter(new_rows, dtype=np.uint64, count=len(new_rows))])
+            self.signatures = np.concatenate([self.signatures, computed.astype(np.uint32)])
+            self._used = np.concatenate([self._used, np.zeros(len(new_rows), dtype=bool)])
+            self._rows.update(new_rows)
+        self._used[rows] = True
+        self.hits += len(texts) - len(missing)
+        self.misses += len(missing)
+        return self.signatures[rows].astype(np.uint64)
+
+    def save(self, path):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            np.savez(f, params=np.array(self.params, dtype=np.int64), keys=self.keys[self._used],
+                     signatures=self.signatures[self._used])
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path, num_perm=DEFAULT_NUM_PERM, shingle_size=DEFAULT_SHINGLE_SIZE, seed=1):
+        """Caché guardada en `path`; vacía si no existe, es ilegible o se calculó con otros parámetros."""
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                if tuple(data['params'].tolist()) == (num_perm, shingle_size, seed):
+                    return cls(num_perm, shingle_size, seed, data['keys'], data['signatures'])
+        except (OSError, ValueError, KeyError):
+            pass
+        return cls(num_perm, shingle_size, seed)
+
+
+def band_keys(signatures, bands):
+    """Clave uint64 de cada banda de cada firma (combinación lineal módulo 2^64): (n, bands)."""
+    n, num_perm = signatures.shape
+    weights = np.random.RandomState(0).randint(0, 2 ** 62, size=num_perm // bands, dtype=np.int64)
+    weights = (weights.astype(np.uint64) << np.uint64(1)) | np.uint64(1)
+    return (signatures.reshape(n, bands, -1) * weights).sum(axis=2, dtype=np.uint64)
+
+
+def _is_similar(jaccard, size_a, size_b, truncated_a, truncated_b, threshold):
+    """
+    Verificación de candidatos: Jaccard estimado por las firmas o, si alguno
+    es una copia truncada, la contención del texto corto en el largo.
+    """
+    intersection = jaccard / (1 + jaccard) * (size_a + size_b)
+    containment = intersection / np.minimum(size_a, size_b)
+    return (jaccard >= threshold) | ((truncated_a | truncated_b) & (containment >= threshold))
+
+
+def _candidate_pairs(signatures, bands):
+    """Pares (cabeza de cubeta, miembro) que coinciden en alguna banda, sin repetir."""
+    n = len(signatures)
+    keys = band_keys(signatures, bands)
+    pairs = []
+    for band in range(bands):
+        bucket = keys[:, band]
+        order = np.argsort(bucket, kind='stable')
+        sorted_buckets = bucket[order]
+        is_head = np.ones(len(order), dtype=bool)
+        is_head[1:] = sorted_buckets[1:] != sorted_buckets[:-1]
+        # Cabeza de la cubeta de cada elemento (el primero en orden de aparición)
+        heads = order[np.flatnonzero(is_head)[np.cumsum(is_head) - 1]]
+        members = ~is_head
+        if members.any():
+            # Par codificado como un único int64 para deduplicar con un sort 1D
+            pairs.append(heads[members] * n + order[members])
+    if not pairs:
+        return np.zeros((0, 2), dtype=np.int64)
+    pairs = np.unique(np.concatenate(pairs))
+    return np.column_stack([pairs // n, pairs % n])
+
+
+class _UnionFind:
+    def __init__(self, n):
+        self.parent = np.arange(n)
+
+    def find(self, i):
+        parent = self.parent
+        root = i
+        while parent[root] != root:
+            root = parent[root]
+        while parent[i] != root:
+            parent[i], i = root, parent[i]
+        return root
+
+    def union(self, i, j):
+        ri, rj = self.find(i), self.find(j)
+        if ri != rj:
+            self.parent[max(ri, rj)] = min(ri, rj)
+
+    def roots(self):
+        return np.array([self.find(i) for i in range(len(self.parent))], dtype=np.int64)
+
+
+class Deduplication:
+    """
+    Resultado de `deduplicate`:
+      - cluster_ids[i]: clúster (0..n_clusters-1, en orden de aparición) de la fila i.
+      - representatives[c]: fila representante del clúster c (la versión más
+        completa; con `prefer`, una de las filas preferidas si las hay).
+    """
+
+    def __init__(self, cluster_ids, representatives):
+        self.cluster_ids = cluster_ids
+        self.representatives = representatives
+
+    @property
+    def n_rows(self):
+        return len(self.cluster_ids)
+
+    @property
+    def n_clusters(self):
+        return len(self.representatives)
+
+    @property
+    def ratio(self):
+        """Fracción de filas que NO hay que procesar (0 = sin duplicados)."""
+        return 1 - self.n_clusters / self.n_rows if self.n_rows else 0.0
+
+    def is_representative(self):
+        mask = np.zeros(self.n_rows, dtype=bool)
+        mask[self.representatives] = True
+        return mask
+
+    def expand(self, values):
+        """Reparte un valor por clúster (en el orden de `representatives`) a todas las filas."""
+        return np.asarray(values)[self.cluster_ids]
+
+    def summary(self):
+        return (f"{self.n_rows} tuits -> {self.n_clusters} representantes "
+                f"({self.ratio:.1%} duplicados o casi duplicados)")
+
+
+def deduplicate(texts, threshold=DEFAULT_THRESHOLD, num_perm=DEFAULT_NUM_PERM, bands=DEFAULT_BANDS,
+                shingle_size=DEFAULT_SHINGLE_SIZE, prefer=None, already_clean=False, seed=1, near=True,
+                signature_cache=None):
+    """
+    Agrupa `texts` (lista o Series; texto original o ya limpio con
+    `already_clean=True`) en clústeres de duplicados y casi duplicados.
+    `prefer` (máscara booleana) marca las filas que deben ser representantes
+    cuando su clúster tenga alguna (p. ej. las que ya están etiquetadas).
+    Con `near=False` solo se agrupan los textos idénticos tras normalizar
+    (paso 1, sin MinHash): mucho más barato, para cuando procesar un
+    representante cuesta menos que buscar sus casi duplicados.
+    Con `signature_cache` (un SignatureCache) las firmas ya calculadas se
+    reutilizan en lugar de recalcularse.
+    """
+    if num_perm % bands:
+        raise ValueError(f"num_perm ({num_perm}) debe ser múltiplo de bands ({bands})")
+    values = texts.tolist() if hasattr(texts, 'tolist') else list(texts)
+    cleaned = values if already_clean else clean_batch(values)
+    n = len(cleaned)
+    if n == 0:
+        return Deduplication(np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64))
+
+    # 1. Duplicados exactos tras normalizar: un "texto distinto" por grupo
+    normalized = [normalize_for_dedup(t if isinstance(t, str) else '') for t in cleaned]
+    distinct_index = {}
+    row_to_distinct = np.empty(n, dtype=np.int64)
+    truncated = []
+    for row, text in enumerate(normalized):
+        d = distinct_index.setdefault(text, len(distinct_index))
+        row_to_distinct[row] = d
+        if d == len(truncated):
+            truncated.append(False)
+        truncated[d] = truncated[d] or is_truncated(cleaned[row] or '')
+    distinct = list(distinct_index)
+    uf = _UnionFind(len(distinct))
+
+    # 2-3. MinHash + LSH sobre los textos distintos con suficientes shingles
+    sizes = np.maximum(np.array([len(t) for t in distinct], dtype=np.int64) - shingle_size + 1, 0)
+    eligible = np.flatnonzero(sizes >= MIN_SHINGLES) if near else np.zeros(0, dtype=np.int64)
+    if len(eligible) > 1:
+        eligible_texts = [distinct[i] for i in eligible]
+        if signature_cache is not None:
+            signatures = signature_cache.get(eligible_texts, num_perm, shingle_size, seed)
+        else:
+            signatures = minhash_signatures(eligible_texts, num_perm, shingle_size, seed)
+        pairs = _candidate_pairs(signatures, bands)
+
+        # 4. Verificación de todos los candidatos a la vez con las firmas completas
+        jaccard = (signatures[pairs[:, 0]] == signatures[pairs[:, 1]]).mean(axis=1)
+        left, right = eligible[pairs[:, 0]], eligible[pairs[:, 1]]
+        truncated = np.array(truncated)
+        similar = _is_similar(jaccard, sizes[left], sizes[right], truncated[left], truncated[right], threshold)
+        for i, j in zip(left[similar], right[similar]):
+            uf.union(i, j)
+
+    # Clúster por fila y representante por clúster
+    roots = uf.roots()[row_to_distinct]
+    _, first_rows, cluster_ids = np.unique(roots, return_index=True, return_inverse=True)
+    # Numeración en orden de aparición
+    order = np.argsort(first_rows, kind='stable')
+    rank = np.empty_like(order)
+    rank[order] = np.arange(len(order))
+    cluster_ids = rank[cluster_ids.ravel()]
+
+    # Representante: la fila preferida (si hay) con el texto más completo
+    length = sizes[row_to_distinct]
+    preferred = np.zeros(n, dtype=bool) if prefer is None else np.asarray(prefer, dtype=bool)
+    priority = np.lexsort((np.arange(n), -length, ~preferred, cluster_ids))
+    is_first = np.ones(n, dtype=bool)
+    is_first[1:] = cluster_ids[priority][1:] != cluster_ids[priority][:-1]
+    representatives = priority[is_first]
+    return Deduplication(cluster_ids.astype(np.int64), representatives.astype(np.int64))
+
+
+class DedupIndex:
+    """
+    Índice incremental de representantes para procesar un flujo por bloques
+    (el preprocesador): cada bloque se deduplica internamente con
+    `deduplicate` y sus representantes se buscan entre los de bloques
+    anteriores (texto normalizado idéntico o LSH + verificación).
+
+    `save` lo guarda en un npz (hash del texto normalizado, firma, tamaño e
+    id de cada representante; las cubetas LSH se rehacen al cargar), así que
+    la ejecución siguiente no relee los textos ni recalcula sus firmas.
+    `metadata` guarda datos del llamador (p. ej. qué filas del corpus cubre).
+
+        index = DedupIndex.load(ruta) or DedupIndex()
+        cluster_of, is_new = index.add(ids_nuevos, textos_nuevos)
+        index.save(ruta, filas_corpus=...)
+    """
+
+    def __init__(self, threshold=DEFAULT_THRESHOLD, num_perm=DEFAULT_NUM_PERM, bands=DEFAULT_BANDS,
+                 shingle_size=DEFAULT_SHINGLE_SIZE, seed=1):
+        self.params = dict(threshold=threshold, num_perm=num_perm, bands=bands, shingle_size=shingle_size, seed=seed)
+        self.exact = {}                              # hash del texto normalizado -> id del representante
+        self.buckets = [{} for _ in range(bands)]    # clave de banda -> posición del representante
+        self.rep_ids, self.signatures, self.sizes, self.truncated = [], [], [], []
+        self.metadata = {}
+
+    def __len__(self):
+        return len(self.rep_ids)
+
+    def _match(self, signature, size, truncated, keys):
+        candidates = {slot for band, key in enumerate(keys) for slot in [self.buckets[band].get(key)]
+                      if slot is not None}
+        for slot in sorted(candidates):
+            jaccard = np.count_nonzero(self.signatures[slot] == signature) / len(signature)
+            if _is_similar(jaccard, self.sizes[slot], size, self.truncated[slot], truncated, self.params['threshold']):
+                return slot
+        return None
+
+    def add(self, ids, texts, already_clean=True):
+        """
+        Añade un bloque. Devuelve (id del representante de cada fila, máscara
+        de las filas que son representantes NUEVOS: las únicas que hay que guardar).
+        """
+        p = self.params
+        ids = list(ids)
+        values = texts.tolist() if hasattr(texts, 'tolist') else list(texts)
+        cleaned = values if already_clean else clean_batch(values)
+        cleaned = [t if isinstance(t, str) else '' for t in cleaned]
+        dedup = deduplicate(cleaned, p['threshold'], p['num_perm'], p['bands'], p['shingle_size'],
+                            already_clean=True, seed=p['seed'])
+
+        reps = dedup.representatives
+        normalized = [normalize_for_dedup(cleaned[r]) for r in reps]
+        sizes = np.maximum(np.array([len(t) for t in normalized], dtype=np.int64) - p['shingle_size'] + 1, 0)
+        eligible = np.flatnonzero(sizes >= MIN_SHINGLES)
+        signatures = np.zeros((len(reps), p['num_perm']), dtype=np.uint64)
+        keys = np.zeros((len(reps), p['bands']), dtype=np.uint64)
+        if len(eligible):
+            signatures[eligible] = minhash_signatures([normalized[k] for k in eligible], p['num_perm'],
+                                                      p['shingle_size'], p['seed'])
+            keys[eligible] = band_keys(signatures[eligible], p['bands'])
+
+        cluster_rep = []
+        is_new = np.zeros(len(ids), dtype=bool)
+        exact_keys = [SignatureCache._key(t) for t in normalized]
+        for k, row in enumerate(reps):
+            rep_id = self.exact.get(exact_keys[k])
+            if rep_id is None and sizes[k] >= MIN_SHINGLES:
+                slot = self._match(signatures[k], sizes[k], is_truncated(cleaned[row]), keys[k])
+                rep_id = self.rep_ids[slot] if slot is not None else None
+            if rep_id is None:
+                # Representante nuevo: se registra para los bloques siguientes
+                rep_id = ids[row]
+                is_new[row] = True
+                slot = len(self.rep_ids)
+                self.rep_ids.append(rep_id)
+                self.signatures.append(signatures[k])
+                self.sizes.append(sizes[k])
+                self.truncated.append(is_truncated(cleaned[row]))
+                if sizes[k] >= MIN_SHINGLES:
+                    for band, key in enumerate(keys[k]):
+                        self.buckets[band].setdefault(key, slot)
+            self.exact.setdefault(exact_keys[k], rep_id)
+            cluster_rep.append(rep_id)
+        return [cluster_rep[c] for c in dedup.cluster_ids], is_new
+
+    def save(self, path, **metadata):
+        p = self.params
+        slot_of = {rep_id: slot for slot, rep_id in enumerate(self.rep_ids)}
+        signatures = np.array(self.signatures, dtype=np.uint64).reshape(-1, p['num_perm'])
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            np.savez(f, params=np.array([p['num_perm'], p['bands'], p['shingle_size'], p['seed']], dtype=np.int64),
+                     threshold=np.array(p['threshold']),
+                     rep_ids=np.array(self.rep_ids, dtype=str),
+                     signatures=signatures.astype(np.uint32),
+                     sizes=np.array(self.sizes, dtype=np.int64),
+                     truncated=np.array(self.truncated, dtype=bool),
+                     exact_keys=np.fromiter(self.exact, dtype=np.uint64, count=len(self.exact)),
+                     exact_slots=np.fromiter((slot_of[r] for r in self.exact.values()), dtype=np.int64,
+                                             count=len(self.exact)),
+                     **{f'meta_{name}': np.array(value) for name, value in metadata.items()})
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path, threshold=DEFAULT_THRESHOLD, num_perm=DEFAULT_NUM_PERM, bands=DEFAULT_BANDS,
+             shingle_size=DEFAULT_SHINGLE_SIZE, seed=1):
+        """Índice guardado en `path`; None si no existe, es ilegible o se creó con otros parámetros."""
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                if (data['params'].tolist() != [num_perm, bands, shingle_size, seed]
+                        or float(data['threshold']) != threshold):
+                    return None
+                index = cls(threshold, num_perm, bands, shingle_size, seed)
+                index.rep_ids = data['rep_ids'].tolist()
+                signatures = data['signatures'].astype(np.uint64)
+                index.signatures = list(signatures)
+                index.sizes = data['sizes'].tolist()
+                index.truncated = data['truncated'].tolist()
+                index.exact = dict(zip(data['exact_keys'].tolist(),
+                                       (index.rep_ids[slot] for slot in data['exact_slots'].tolist())))
+                index.metadata = {name[len('meta_'):]: data[name].item() for name in data.files
+                                  if name.startswith('meta_')}
+        except (OSError, ValueError, KeyError):
+            return None
+
+        # Cubetas LSH: para cada clave, el primer representante (como en `add`)
+        eligible = np.flatnonzero(np.asarray(index.sizes, dtype=np.int64) >= MIN_SHINGLES)
+        if len(eligible):
+            keys = band_keys(signatures[eligible], bands)
+            for band in range(bands):
+                unique, first = np.unique(keys[:, band], return_index=True)
+                index.buckets[band] = dict(zip(unique.tolist(), eligible[first].tolist()))
+        return index
+
+
+if __name__ == '__main__':
+    # Informe rápido sobre un CSV con 'texto_original' (por defecto, el corpus etiquetado)
+    import time
+    import pandas as pd
+
+    path = sys.argv[1] if len(sys.argv) > 1 else os.path.join(os.path.dirname(__file__), '..', '..', 'data',
+                                                               'processed', 'corpus_etiquetado.csv')
+    df = pd.read_csv(path) if path.endswith('.csv') else pd.read_json(path, dtype={'id_tuit': str})
+    start = time.perf_counter()
+    dedup = deduplicate(df['texto_original'])
+    print(f"✅ {dedup.summary()} en {time.perf_counter() - start:.2f} s")
+    sizes = np.bincount(dedup.cluster_ids)
+    for cluster in np.argsort(-sizes)[:5]:
+        if sizes[cluster] > 1:
+            print(f"  {sizes[cluster]:>4} x {df['texto_original'].iloc[dedup.representatives[cluster]][:90]!r}")
@@ -1,62 +1,237 @@
 import pandas as pd
-import json
-import re
 import os
+import sys
+import time
+import argparse
+from collections import deque
+from itertools import islice
+from concurrent.futures import ProcessPoolExecutor
 
-def clean_text(text):
-    """
-    Función de limpieza: elimina elementos ruidosos de Twitter.
-    """
-    # 1. Eliminar URLs
-    text = re.sub(r'http\S+|www\S+|https\S+', '', text, flags=re.MULTILINE)
-    # 2. Eliminar menciones de usuarios (@usuario)
-    text = re.sub(r'@\w+', '', text)
-    # 3. Eliminar Hashtags (#hashtag), pero manteniendo el texto si es deseable
-    # Aquí elegimos eliminar la marca #, manteniendo el texto del hashtag
-    text = re.sub(r'#', '', text)
-    # 4. Eliminar saltos de línea y espacios extra
-    text = re.sub(r'\n', ' ', text)
-    text = re.sub(r'\s+', ' ', text).strip()
-    # 5. Eliminar emojis (método básico, puede ser más complejo)
-    # Este regex elimina la mayoría de los caracteres que no son letras, números o puntuación común
-    # Opcional: Podrías querer conservar la puntuación.
-    
-    return text
-
-def preprocess_data(input_filename='tweets_raw_ES.json', output_filename='corpus_etiquetado.csv'):
-    
-    input_path = os.path.join('data', 'raw', input_filename)
-    output_path = os.path.join('data', 'processed', output_filename)
-    
-    if not os.path.exists(input_path):
-        print(f"ERROR: Archivo de entrada no encontrado en {input_path}. Ejecuta collector.py primero.")
+# Raíz del proyecto en sys.path para importar los módulos compartidos de 'src'
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from src.data_pipeline.deduplicator import DedupIndex
+from src.data_pipeline.text_cleaning import clean_batch
+from src.data_pipeline.tweet_store import TweetStore
+
+OUTPUT_COLUMNS = ['id_tuit', 'texto_original', 'texto_procesado', 'etiqueta_tono', 'etiqueta_intencion']
+CLUSTER_COLUMNS = ['id_tuit', 'id_cluster']
+DEFAULT_CHUNK_SIZE = 20_000
+
+
+def load_processed_ids(output_path, clusters_path=None):
+    """
+    Ids que ya están en el corpus procesado o que se descartaron como
+    duplicados de uno de sus tuits (solo se lee la columna id_tuit, por bloques).
+    """
+    ids = set()
+    for path in (output_path, clusters_path):
+        if not path or not os.path.exists(path) or os.path.getsize(path) == 0:
+            continue
+        for chunk in pd.read_csv(path, usecols=['id_tuit'], dtype={'id_tuit': str},
+                                 chunksize=DEFAULT_CHUNK_SIZE, encoding='utf-8'):
+            ids.update(chunk['id_tuit'])
+    return ids
+
+
+def _corpus_rows(output_path, row=None):
+    """Filas del corpus procesado y el id_tuit de la fila `row` (None si no la hay); solo lee id_tuit."""
+    n_rows, row_id = 0, None
+    if os.path.exists(output_path) and os.path.getsize(output_path) > 0:
+        for chunk in pd.read_csv(output_path, usecols=['id_tuit'], dtype={'id_tuit': str},
+                                 chunksize=DEFAULT_CHUNK_SIZE, encoding='utf-8'):
+            if row is not None and n_rows <= row < n_rows + len(chunk):
+                row_id = chunk['id_tuit'].iloc[row - n_rows]
+            n_rows += len(chunk)
+    return n_rows, row_id
+
+
+def load_dedup_index(output_path, index_path=None):
+    """
+    Índice de duplicados con los tuits que ya están en el corpus procesado.
+
+    El índice se guarda en `index_path` al final de cada ejecución junto con
+    las filas del corpus que cubre. Si sigue valiendo (el corpus empieza por
+    esas filas; etiquetar no las cambia) solo se añaden las filas posteriores,
+    sin releer los textos ni recalcular las firmas MinHash de las demás. Si no
+    (filas borradas o el CSV es otro), se reconstruye leyendo todo el corpus.
+    """
+    index = DedupIndex.load(index_path) if index_path else None
+    covered = int(index.metadata.get('filas_corpus', -1)) if index is not None else 0
+    n_rows, covered_id = _corpus_rows(output_path, covered - 1 if covered > 0 else None)
+    if index is not None and (covered < 0 or covered > n_rows
+                              or (covered and covered_id != index.metadata.get('ultimo_id'))):
+        print("⚠️ El índice de duplicados guardado no corresponde al corpus; se reconstruye.")
+        index = None
+    if index is None:
+        index, covered = DedupIndex(), 0
+        index.metadata.update(filas_corpus=0, ultimo_id='')
+
+    if n_rows > covered:
+        last_id = ''
+        for chunk in pd.read_csv(output_path, usecols=['id_tuit', 'texto_original', 'texto_procesado'],
+                                 dtype={'id_tuit': str, 'texto_procesado': str}, chunksize=DEFAULT_CHUNK_SIZE,
+                                 encoding='utf-8', skiprows=range(1, covered + 1)):
+            # Filas añadidas a mano sin texto_procesado: se limpian aquí
+            missing = chunk['texto_procesado'].isna()
+            if missing.any():
+                chunk.loc[missing, 'texto_procesado'] = clean_batch(chunk.loc[missing, 'texto_original'].fillna(''))
+            index.add(chunk['id_tuit'], chunk['texto_procesado'])
+            last_id = chunk['id_tuit'].iloc[-1]
+        index.metadata.update(filas_corpus=n_rows, ultimo_id=last_id)
+        print(f"Índice de duplicados: {n_rows - covered} filas del corpus añadidas ({covered} ya indexadas).")
+    return index
+
+
+def _ensure_trailing_newline(path):
+    """Si el CSV (editado a mano, p. ej. en Excel) no acaba en salto de línea, se añade."""
+    if not os.path.exists(path) or os.path.getsize(path) == 0:
         return
+    with open(path, 'rb+') as f:
+        f.seek(-1, os.SEEK_END)
+        if f.read(1) != b'\n':
+            f.write(b'\n')
 
-    # 1. Cargar datos brutos
-    with open(input_path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-    
-    df = pd.DataFrame(data)
-    print(f"Cargados {len(df)} tuits para pre-procesamiento.")
+
+def _batches(records, size):
+    iterator = iter(records)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def prepare_chunk(records):
+    """Limpia un bloque de tuits brutos y añade las columnas vacías para etiquetar."""
+    df = pd.DataFrame(records, columns=['id_tuit', 'texto_original'])
 
     # 2. Aplicar limpieza
-    df['texto_procesado'] = df['texto_original'].apply(clean_text)
+    # (misma limpieza que el entrenamiento, la predicción y la app)
+    df['texto_procesado'] = clean_batch(df['texto_original'], n_jobs=1)
 
     # 3. Preparar columnas para etiquetado (HUMANO)
     # Estas son las columnas que tú o un equipo deberán llenar manualmente.
     df['etiqueta_tono'] = ''         # Positivo / Negativo
     df['etiqueta_intencion'] = ''    # Crítica_Destructiva / Elogio / Neutral
-    
-    # Seleccionar solo las columnas necesarias para el etiquetado manual
-    df_export = df[['id_tuit', 'texto_original', 'texto_procesado', 'etiqueta_tono', 'etiqueta_intencion']]
-
-    # 4. Guardar el archivo para etiquetado manual (en formato CSV, ideal para Excel/Hojas de cálculo)
-    os.makedirs(os.path.join('data', 'processed'), exist_ok=True)
-    df_export.to_csv(output_path, index=False, encoding='utf-8')
-    
-    print(f"\n✅ Pre-procesamiento completado. Archivo para etiquetado guardado en: {output_path}")
+    return df[OUTPUT_COLUMNS]
+
+
+def preprocess_data(input_filename='tweets_raw_ES.jsonl', output_filename='corpus_etiquetado.csv',
+                    legacy_filename='tweets_raw_ES.json', chunk_size=DEFAULT_CHUNK_SIZE, n_jobs=None,
+                    clusters_filename='clusters_dedup.csv', dedup=True, index_filename='indice_dedup.npz'):
+    """
+    Añade al corpus para etiquetado los tuits brutos que aún no están en él.
+
+    Los tuits se leen del JSON Lines en streaming, se limpian por bloques en
+    varios procesos y se AÑADEN al CSV en orden. Las filas existentes (y sus
+    etiquetas manuales) no se tocan, así que volver a ejecutarlo tras una
+    recolección solo cuesta lo que los tuits nuevos.
+
+    Con `dedup=True` solo se añade el representante de cada grupo de
+    retuits y casi duplicados (nadie etiqueta dos veces el mismo texto); el
+    resto va a `clusters_filename` como id_tuit -> id_cluster (el id_tuit de
+    su representante), para repartirles después la etiqueta. El índice de
+    representantes se guarda en `index_filename` (ver `load_dedup_index`).
+    """
+    input_path = os.path.join('data', 'raw', input_filename)
+    legacy_path = os.path.join('data', 'raw', legacy_filename)
+    output_path = os.path.join('data', 'processed', output_filename)
+    clusters_path = os.path.join('data', 'processed', clusters_filename)
+    index_path = os.path.join('data', 'processed', index_filename)
+    n_jobs = n_jobs or os.cpu_count() or 1
+
+    if not os.path.exists(input_path) and not os.path.exists(legacy_path):
+        print(f"ERROR: Archivo de entrada no encontrado en {input_path}. Ejecuta collector.py primero.")
+        return
+
+    # 1. Datos brutos (JSON Lines del colector; el JSON antiguo se migra) y
+    #    tuits ya presentes en el corpus procesado
+    store = TweetStore(input_path, legacy_path=legacy_path)
+    processed_ids = load_processed_ids(output_path, clusters_path)
+    print(f"{len(store)} tuits brutos, {len(processed_ids)} ya en el corpus procesado.")
+    index = load_dedup_index(output_path, index_path) if dedup else None
+
+    def new_records():
+        for record in store.iter_records():
+            id_tuit = str(record['id_tuit'])
+            if id_tuit not in processed_ids:
+                processed_ids.add(id_tuit)
+                yield {'id_tuit': id_tuit, 'texto_original': record.get('texto_original', '')}
+
+    # 4. Añadir al archivo para etiquetado manual (en formato CSV, ideal para Excel/Hojas de cálculo)
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    _ensure_trailing_newline(output_path)
+    write_header = not os.path.exists(output_path) or os.path.getsize(output_path) == 0
+    writer = ChunkWriter(index, clusters_path)
+
+    start = time.perf_counter()
+    with open(output_path, 'a', encoding='utf-8', newline='') as out, \
+            ProcessPoolExecutor(max_workers=n_jobs) as executor:
+        # Ventana acotada de bloques en vuelo: orden de entrada y memoria constante
+        in_flight = deque()
+        for batch in _batches(new_records(), chunk_size):
+            in_flight.append(executor.submit(prepare_chunk, batch))
+            while len(in_flight) >= n_jobs * 2:
+                writer.write(in_flight.popleft().result(), out, write_header)
+                write_header = False
+        while in_flight:
+            writer.write(in_flight.popleft().result(), out, write_header)
+            write_header = False
+
+    if index is not None:
+        # El corpus tiene ahora las filas que ya cubría el índice más las escritas
+        if writer.n_written:
+            index.metadata.update(filas_corpus=int(index.metadata.get('filas_corpus', 0)) + writer.n_written,
+                                  ultimo_id=writer.last_id)
+        index.save(index_path, **index.metadata)
+
+    elapsed = time.perf_counter() - start
+    print(f"\n✅ Pre-procesamiento completado: {writer.n_written} tuits nuevos añadidos en {elapsed:.1f} s a: {output_path}")
+    if dedup and writer.n_seen:
+        print(f"   {writer.n_seen - writer.n_written} de {writer.n_seen} eran retuits o casi duplicados "
+              f"({1 - writer.n_written / writer.n_seen:.1%} menos que etiquetar); agrupados en: {clusters_path}")
     print("Siguiente paso: Abrir el archivo CSV y rellenar las columnas 'etiqueta_tono' e 'etiqueta_intencion'.")
 
 
+class ChunkWriter:
+    """
+    Añade cada bloque limpio al corpus. Con un DedupIndex solo escribe los
+    representantes nuevos y guarda id_tuit -> id_cluster de los demás.
+    """
+
+    def __init__(self, index=None, clusters_path=None):
+        self.index = index
+        self.clusters_path = clusters_path
+        self.n_seen = 0
+        self.n_written = 0
+        self.last_id = None   # id_tuit de la última fila escrita
+
+    def write(self, df, out, write_header):
+        self.n_seen += len(df)
+        if self.index is not None:
+            cluster_of, is_new = self.index.add(df['id_tuit'], df['texto_procesado'])
+            clusters = pd.DataFrame({'id_tuit': df['id_tuit'], 'id_cluster': cluster_of})[~is_new]
+            if len(clusters):
+                self._append_clusters(clusters)
+            df = df[is_new]
+        df.to_csv(out, header=write_header, index=False)
+        out.flush()
+        self.n_written += len(df)
+        if len(df):
+            self.last_id = df['id_tuit'].iloc[-1]
+        return len(df)
+
+    def _append_clusters(self, clusters):
+        write_header = not os.path.exists(self.clusters_path) or os.path.getsize(self.clusters_path) == 0
+        with open(self.clusters_path, 'a', encoding='utf-8', newline='') as f:
+            clusters[CLUSTER_COLUMNS].to_csv(f, header=write_header, index=False)
+
+
 if __name__ == '__main__':
-    preprocess_data()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Añade los tuits nuevos al corpus para etiquetado.")
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument('--jobs', type=int, default=None, help="Procesos de limpieza (por defecto, uno por núcleo).")
+    parser.add_argument('--no-dedup', action='store_true',
+                        help="Añade también los retuits y casi duplicados de tuits ya presentes.")
+    args = parser.parse_args()
+    preprocess_data(chunk_size=args.chunk_size, n_jobs=args.jobs, dedup=not args.no_dedup)
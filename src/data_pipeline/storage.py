@@ -0,0 +1,222 @@
+# src/data_pipeline/storage.py
+"""
+Capa de persistencia sobre el esquema de database/setup.sql.
+
+Crea las tablas `expresiones_raw` y `resultados_ia` y carga en bloque los
+tuits del colector y las predicciones con `executemany` dentro de una
+transacción por lote, haciendo upsert por `id_tuit`. Funciona con SQLite en
+local y con PostgreSQL (el dialecto para el que está escrito setup.sql).
+
+Uso:
+    python src/data_pipeline/storage.py --db sqlite:///data/sentimiento.db --raw --etiquetado
+"""
+
+import argparse
+import os
+import re
+import sqlite3
+import sys
+
+BASE_DIR = os.path.join(os.path.dirname(__file__), '..', '..')
+SCHEMA_PATH = os.path.join(BASE_DIR, 'database', 'setup.sql')
+DEFAULT_DB_URL = 'sqlite:///' + os.path.join('data', 'sentimiento.db')
+DEFAULT_BATCH_SIZE = 10_000
+
+# Si llega una etiqueta vacía no se pisa la que ya hubiera (p. ej. manual)
+_UPSERT_RAW = """
+INSERT INTO expresiones_raw (id_tuit, texto_original, fecha_recoleccion, etiqueta_tono, etiqueta_intencion)
+VALUES ({p}, {p}, COALESCE({p}, CURRENT_TIMESTAMP), {p}, {p})
+ON CONFLICT (id_tuit) DO UPDATE SET
+    texto_original = excluded.texto_original,
+    etiqueta_tono = CASE WHEN excluded.etiqueta_tono <> '' THEN excluded.etiqueta_tono
+                         ELSE expresiones_raw.etiqueta_tono END,
+    etiqueta_intencion = CASE WHEN excluded.etiqueta_intencion <> '' THEN excluded.etiqueta_intencion
+                              ELSE expresiones_raw.etiqueta_intencion END
+"""
+
+# Las predicciones referencian expresiones_raw: se asegura la fila padre sin tocarla
+_ENSURE_RAW = """
+INSERT INTO expresiones_raw (id_tuit, texto_original, etiqueta_tono, etiqueta_intencion)
+VALUES ({p}, {p}, '', '')
+ON CONFLICT (id_tuit) DO NOTHING
+"""
+
+_UPSERT_PREDICTION = """
+INSERT INTO resultados_ia (id_tuit, texto_procesado, prediccion_tono, confianza_tono, prediccion_intencion)
+VALUES ({p}, {p}, {p}, {p}, {p})
+ON CONFLICT (id_tuit) DO UPDATE SET
+    texto_procesado = excluded.texto_procesado,
+    prediccion_tono = excluded.prediccion_tono,
+    confianza_tono = excluded.confianza_tono,
+    prediccion_intencion = excluded.prediccion_intencion,
+    fecha_clasificacion = CURRENT_TIMESTAMP
+"""
+
+
+def _clean(value):
+    """NaN/None de pandas -> cadena vacía."""
+    if value is None or value != value:
+        return ''
+    return str(value)
+
+
+class Database:
+    """
+    Conexión a SQLite (`sqlite:///ruta.db` o una ruta) o PostgreSQL
+    (`postgresql://...`, requiere psycopg2).
+    """
+
+    def __init__(self, url=DEFAULT_DB_URL):
+        self.url = url
+        if url.startswith(('postgresql://', 'postgres://')):
+            try:
+                import psycopg2
+            except ImportError as e:
+                raise ImportError("Para usar PostgreSQL instala psycopg2: pip install psycopg2-binary") from e
+            self.dialect = 'postgresql'
+            self.conn = psycopg2.connect(url)
+            self._placeholder = '%s'
+        else:
+            path = url[len('sqlite:///'):] if url.startswith('sqlite:///') else url
+            if path != ':memory:':
+                os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            self.dialect = 'sqlite'
+            self.conn = sqlite3.connect(path)
+            # Ajustes para cargas masivas: WAL y fsync solo en los checkpoints
+            self.conn.execute('PRAGMA journal_mode=WAL')
+            self.conn.execute('PRAGMA synchronous=NORMAL')
+            self.conn.execute('PRAGMA foreign_keys=ON')
+            self._placeholder = '?'
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _sql(self, template):
+        return template.format(p=self._placeholder)
+
+    def create_schema(self, schema_path=SCHEMA_PATH):
+        """Ejecuta setup.sql (adaptando SERIAL a SQLite). Es idempotente."""
+        with open(schema_path, 'r', encoding='utf-8') as f:
+            script = f.read()
+        if self.dialect == 'sqlite':
+            script = re.sub(r'\bSERIAL PRIMARY KEY\b', 'INTEGER PRIMARY KEY AUTOINCREMENT', script)
+        cur = self.conn.cursor()
+        for statement in script.split(';'):
+            if re.sub(r'--.*', '', statement).strip():
+                cur.execute(statement)
+        self.conn.commit()
+
+    def _executemany_batched(self, sql_list, rows, batch_size):
+        """
+        Ejecuta cada sentencia de `sql_list` con executemany sobre lotes de
+        `batch_size` filas; cada lote es una transacción.
+        `sql_list` es una lista de (sql, función que extrae los parámetros de una fila).
+        """
+        total = 0
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= batch_size:
+                total += self._flush(sql_list, batch)
+                batch = []
+        if batch:
+            total += self._flush(sql_list, batch)
+        return total
+
+    def _flush(self, sql_list, batch):
+        cur = self.conn.cursor()
+        try:
+            for sql, params in sql_list:
+                cur.executemany(sql, [params(row) for row in batch])
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
+        return len(batch)
+
+    def upsert_raw(self, records, batch_size=DEFAULT_BATCH_SIZE):
+        """
+        Carga tuits en `expresiones_raw`. Cada registro es un dict con
+        id_tuit, texto_original y, opcionalmente, fecha, etiqueta_tono y
+        etiqueta_intencion.
+        """
+        return self._executemany_batched([(
+            self._sql(_UPSERT_RAW),
+            lambda r: (
+                str(r['id_tuit']),
+                _clean(r.get('texto_original')),
+                _clean(r.get('fecha')) or None,
+                _clean(r.get('etiqueta_tono')),
+                _clean(r.get('etiqueta_intencion')),
+            ),
+        )], records, batch_size)
+
+    def upsert_predictions(self, rows, batch_size=DEFAULT_BATCH_SIZE):
+        """
+        Carga predicciones en `resultados_ia`. Cada fila es un dict con
+        id_tuit, texto_original, texto_procesado, etiqueta_tono,
+        confianza_tono y etiqueta_intencion (columnas de predict_model.py).
+        """
+        return self._executemany_batched([
+            (self._sql(_ENSURE_RAW),
+             lambda r: (str(r['id_tuit']), _clean(r.get('texto_original')))),
+            (self._sql(_UPSERT_PREDICTION),
+             lambda r: (
+                 str(r['id_tuit']),
+                 _clean(r.get('texto_procesado')),
+                 _clean(r.get('etiqueta_tono')),
+                 round(float(r.get('confianza_tono') or 0.0), 4),
+                 _clean(r.get('etiqueta_intencion')),
+             )),
+        ], rows, batch_size)
+
+    def count(self, table):
+        if table not in ('expresiones_raw', 'resultados_ia'):
+            raise ValueError(f"Tabla desconocida: {table}")
+        cur = self.conn.cursor()
+        cur.execute(f"SELECT COUNT(*) FROM {table}")
+        return cur.fetchone()[0]
+
+
+def _iter_labeled_corpus(path):
+    import pandas as pd
+
+    for chunk in pd.read_csv(path, dtype={'id_tuit': str}, chunksize=DEFAULT_BATCH_SIZE, encoding='utf-8'):
+        yield from chunk.to_dict('records')
+
+
+def main():
+    sys.path.insert(0, os.path.abspath(BASE_DIR))
+    from src.data_pipeline.tweet_store import TweetStore
+
+    parser = argparse.ArgumentParser(description="Crea el esquema y carga los datos en la base de datos.")
+    parser.add_argument('--db', default=DEFAULT_DB_URL, help="sqlite:///ruta.db o postgresql://...")
+    parser.add_argument('--raw', action='store_true', help="Carga los tuits del colector (JSON Lines).")
+    parser.add_argument('--etiquetado', action='store_true', help="Carga las etiquetas de corpus_etiquetado.csv.")
+    args = parser.parse_args()
+
+    with Database(args.db) as db:
+        db.create_schema()
+        print(f"✅ Esquema creado/verificado en {args.db}")
+
+        if args.raw:
+            store = TweetStore(os.path.join('data', 'raw', 'tweets_raw_ES.jsonl'),
+                               legacy_path=os.path.join('data', 'raw', 'tweets_raw_ES.json'))
+            n = db.upsert_raw(store.iter_records())
+            print(f"-> {n} tuits brutos cargados en expresiones_raw")
+
+        if args.etiquetado:
+            n = db.upsert_raw(_iter_labeled_corpus(os.path.join('data', 'processed', 'corpus_etiquetado.csv')))
+            print(f"-> {n} tuits etiquetados cargados en expresiones_raw")
+
+        print(f"Total: {db.count('expresiones_raw')} expresiones, {db.count('resultados_ia')} clasificaciones.")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+# src/data_pipeline/text_cleaning.py
+"""
+Normalización de texto compartida por TODO el proyecto.
+
+Entrenamiento, predicción por lotes, preprocesado y la aplicación web importan
+`clean_text` / `clean_batch` desde aquí, de modo que el texto que ve el modelo
+al entrenar es exactamente el mismo que ve al servir.
+"""
+
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+# Patrones precompilados. El ruido se elimina con UNA sola pasada de un
+# patrón fusionado en lugar de encadenar 4-5 re.sub:
+#   1. 'RT @usuario: ' al inicio -> 'RT : ' (solo si el texto empieza por 'RT @')
+#   2. Menciones (@usuario), URLs (http://, https://, www.) y restos de URLs
+#      de Twitter (t.co/xxxx) -> ''
+_RT_RE = re.compile(r'^RT @\w+:\s?')
+_NOISE_RE = re.compile(r'@\w+|https?://\S+|www\.\S+|t\.co/\w+')
+
+# A partir de este tamaño compensa repartir la limpieza entre procesos (ver `batch_jobs`)
+PARALLEL_MIN_SIZE = 200_000
+
+
+def clean_text(text):
+    """Limpia un tuit: retuits, menciones, URLs y espacios sobrantes."""
+    if not isinstance(text, str):
+        return ""
+    if text.startswith('RT @'):
+        text = _RT_RE.sub('RT : ', text, count=1)
+    # str.split() sin argumentos colapsa cualquier secuencia de espacios
+    # (incluidos saltos de línea) y recorta los extremos.
+    return ' '.join(_NOISE_RE.sub('', text).split())
+
+
+def _clean_unique(texts):
+    return [clean_text(t) for t in texts]
+
+
+def batch_jobs(n_texts):
+    """
+    Procesos para `clean_batch` en un script por lotes: uno por núcleo con
+    lotes muy grandes, uno con los demás. Solo para llamadas desde un
+    `if __name__ == '__main__'`: en Windows los procesos hijos vuelven a
+    importar el módulo principal (p. ej. la app) y no pueden abrir otro pool.
+    """
+    return (os.cpu_count() or 1) if n_texts >= PARALLEL_MIN_SIZE else 1
+
+
+def clean_batch(texts, n_jobs=1):
+    """
+    Limpia una colección completa de textos (lista, array de NumPy o Series).
+
+    Los textos repetidos (muy frecuentes por los retuits) se limpian una sola
+    vez. Con `n_jobs` > 1 los textos únicos se reparten entre varios procesos
+    (nunca por defecto: lo piden los scripts por lotes, ver `batch_jobs`). Si
+    la entrada es una Series de pandas se devuelve una Series con el mismo
+    índice; en otro caso, una lista.
+    """
+    is_series = hasattr(texts, 'iloc')
+    values = texts.tolist() if hasattr(texts, 'tolist') else list(texts)
+
+    # Deduplicación: cada texto distinto se limpia una única vez
+    unique_texts = list(dict.fromkeys(v for v in values if isinstance(v, str)))
+
+    if n_jobs is not None and n_jobs > 1 and len(unique_texts) > n_jobs:
+        chunk = (len(unique_texts) + n_jobs - 1) // n_jobs
+        parts = [unique_texts[i:i + chunk] for i in range(0, len(unique_texts), chunk)]
+        with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+            cleaned_unique = [t for part in executor.map(_clean_unique, parts) for t in part]
+    else:
+        cleaned_unique = _clean_unique(unique_texts)
+
+    mapping = dict(zip(unique_texts, cleaned_unique))
+    cleaned = [mapping.get(v, "") if isinstance(v, str) else "" for v in values]
+
+    if is_series:
+        import pandas as pd
+        return pd.Series(cleaned, index=texts.index, name=texts.name)
+    return cleaned
@@ -0,0 +1,181 @@
+# src/data_pipeline/tweet_store.py
+"""
+Almacenamiento de solo-añadir (JSON Lines) para los tuits recolectados.
+
+Cada tuit es una línea JSON en 'tweets_raw_ES.jsonl'. Guardar una página nueva
+solo escribe esas líneas al final del archivo (no se reescribe el corpus), y
+un índice en memoria de `id_tuit` evita duplicados. El estado de la paginación
+(`next_token` por consulta) se guarda aparte en un archivo de checkpoint que se
+reemplaza de forma atómica.
+"""
+
+import json
+import os
+import tempfile
+from datetime import datetime, timezone
+
+
+def replacement_mode(path):
+    """
+    Permisos para el temporal que va a sustituir a `path`: los del archivo
+    actual o, si no existe, los de un archivo nuevo según la umask.
+    `mkstemp` lo crea con 0600 y `os.replace` los conserva, así que sin esto
+    otro usuario (p. ej. el del servidor) dejaría de poder leerlo.
+    """
+    try:
+        return os.stat(path).st_mode & 0o777
+    except FileNotFoundError:
+        umask = os.umask(0)
+        os.umask(umask)
+        return 0o666 & ~umask
+
+
+def atomic_write_json(path, data):
+    """Escribe `data` en un temporal y lo renombra: nunca queda un JSON a medias."""
+    directory = os.path.dirname(path) or '.'
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.tmp-', suffix='.json')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp_path, replacement_mode(path))
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def iter_json_array(path):
+    """Itera los elementos de un archivo JSON con una lista (formato antiguo del colector)."""
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    yield from data
+
+
+class TweetStore:
+    """
+    Corpus de tuits en JSON Lines con índice de `id_tuit` para deduplicar.
+
+    Si solo existe el archivo antiguo (una lista JSON), se migra una vez a
+    JSON Lines al abrir el almacén; el archivo antiguo no se modifica.
+    """
+
+    def __init__(self, path, legacy_path=None):
+        self.path = path
+        self.legacy_path = legacy_path
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+
+        if not os.path.exists(path) and legacy_path and os.path.exists(legacy_path):
+            self._migrate_legacy()
+
+        self._repair_tail()
+        self.ids = set()
+        for record in self.iter_records():
+            self.ids.add(str(record['id_tuit']))
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __contains__(self, id_tuit):
+        return str(id_tuit) in self.ids
+
+    def _migrate_legacy(self):
+        try:
+            records = list(iter_json_array(self.legacy_path))
+        except json.JSONDecodeError:
+            print(f"Advertencia: {self.legacy_path} está corrupto o vacío. Se empieza un corpus nuevo.")
+            return
+        tmp_path = self.path + '.migrating'
+        seen = set()
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            for record in records:
+                id_tuit = str(record['id_tuit'])
+                if id_tuit in seen:
+                    continue
+                seen.add(id_tuit)
+                f.write(json.dumps(record, ensure_ascii=False) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+        print(f"✅ Migrados {len(seen)} tuits de {self.legacy_path} a {self.path}")
+
+    def _repair_tail(self):
+        """Si una caída dejó una línea a medias al final, se descarta."""
+        if not os.path.exists(self.path) or os.path.getsize(self.path) == 0:
+            return
+        with open(self.path, 'rb+') as f:
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) == b'\n':
+                return
+            # Buscamos el último salto de línea desde el final
+            size = f.seek(0, os.SEEK_END)
+            block = 4096
+            pos = size
+            while pos > 0:
+                step = min(block, pos)
+                pos -= step
+                f.seek(pos)
+                chunk = f.read(step)
+                newline = chunk.rfind(b'\n')
+                if newline != -1:
+                    f.truncate(pos + newline + 1)
+                    return
+            f.truncate(0)
+
+    def iter_records(self):
+        """Recorre el corpus línea a línea sin cargarlo entero en memoria."""
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    yield json.loads(line)
+
+    def append(self, records):
+        """
+        Añade al final los tuits cuyo `id_tuit` no estaba ya guardado.
+        La página entera se escribe de una vez y se sincroniza con el disco.
+        Devuelve la lista de tuits realmente añadidos.
+        """
+        new_records = []
+        for record in records:
+            id_tuit = str(record['id_tuit'])
+            if id_tuit in self.ids:
+                continue
+            self.ids.add(id_tuit)
+            new_records.append(record)
+
+        if new_records:
+            payload = ''.join(json.dumps(r, ensure_ascii=False) + '\n' for r in new_records)
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(payload)
+                f.flush()
+                os.fsync(f.fileno())
+        return new_records
+
+
+class Checkpoint:
+    """Estado de la paginación por consulta (`next_token`), guardado de forma atómica."""
+
+    def __init__(self, path):
+        self.path = path
+        self.state = {}
+        if os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    self.state = json.load(f)
+            except json.JSONDecodeError:
+                print(f"Advertencia: checkpoint {path} ilegible. Se ignora.")
+
+    def get(self, query):
+        return self.state.get(query, {})
+
+    def update(self, query, **values):
+        entry = dict(self.state.get(query, {}), **values)
+        entry['actualizado'] = datetime.now(timezone.utc).isoformat()
+        self.state[query] = entry
+        atomic_write_json(self.path, self.state)
@@ -0,0 +1,293 @@
+# src/inference/compact_model.py
+"""
+Formato compacto del modelo (TF-IDF + clasificador lineal) y un puntuador que
+solo necesita NumPy/SciPy.
+
+`export_compact_model` escribe dos archivos en `models/`:
+  - modelo_compacto_<nombre>.npz: idf, coeficientes, intercepto, clases y la
+    configuración del tokenizador (y, si lo hay, el cabezal de intención:
+    otro clasificador lineal sobre la misma matriz TF-IDF).
+  - vocabulario_<nombre>.npy: vocabulario ordenado como array de bytes de
+    ancho fijo, que se abre con mmap y se comparte entre procesos.
+
+`CompactScorer` reproduce `TfidfVectorizer.transform` + `predict_proba` de
+una `LogisticRegression` sin importar scikit-learn ni deserializar objetos
+Python, por lo que arranca más rápido y evita la validación de sklearn en
+cada petición.
+"""
+
+import os
+import re
+
+import numpy as np
+import scipy.sparse as sp
+
+COMPACT_MODEL_TEMPLATE = 'modelo_compacto_{}.npz'
+VOCABULARY_TEMPLATE = 'vocabulario_{}.npy'
+FORMAT_VERSION = 1
+
+
+def compact_paths(models_dir, name='v1'):
+    """Rutas (npz, vocabulario) del modelo compacto `name` dentro de `models_dir`."""
+    return (os.path.join(models_dir, COMPACT_MODEL_TEMPLATE.format(name)),
+            os.path.join(models_dir, VOCABULARY_TEMPLATE.format(name)))
+
+
+def _check_exportable(vectorizer):
+    unsupported = {
+        'analyzer': vectorizer.analyzer != 'word',
+        'tokenizer': vectorizer.tokenizer is not None,
+        'preprocessor': vectorizer.preprocessor is not None,
+        'stop_words': vectorizer.stop_words is not None,
+        'strip_accents': vectorizer.strip_accents is not None,
+        'binary': bool(vectorizer.binary),
+        'norm': vectorizer.norm not in ('l1', 'l2', None),
+    }
+    bad = [name for name, is_bad in unsupported.items() if is_bad]
+    if bad:
+        raise ValueError(f"Configuración del vectorizador no soportada por el formato compacto: {', '.join(bad)}")
+
+
+def _multi_class_mode(model):
+    if len(model.classes_) == 2:
+        return 'binary'
+    if getattr(model, 'multi_class', 'auto') == 'ovr' or getattr(model, 'solver', '') == 'liblinear':
+        return 'ovr'
+    return 'multinomial'
+
+
+def export_compact_model(model, vectorizer, models_dir, name='v1', intent_model=None):
+    """
+    Exporta un TfidfVectorizer + LogisticRegression entrenados al formato
+    compacto. `intent_model` (opcional) es el clasificador de intención
+    entrenado sobre el mismo vectorizador.
+    """
+    _check_exportable(vectorizer)
+    model_path, vocab_path = compact_paths(models_dir, name)
+
+    terms = list(vectorizer.vocabulary_.keys())
+    columns = np.array([vectorizer.vocabulary_[t] for t in terms])
+    encoded = np.array([t.encode('utf-8') for t in terms])
+    # Vocabulario ordenado por bytes: las columnas se reordenan igual, de modo
+    # que la posición en el array ES el índice de la característica.
+    order = np.argsort(encoded, kind='stable')
+    vocabulary = encoded[order]
+    columns = columns[order]
+
+    if vectorizer.use_idf:
+        idf = vectorizer.idf_[columns]
+    else:
+        idf = np.ones(len(columns))
+
+    os.makedirs(models_dir, exist_ok=True)
+    # Se escribe a un temporal y se renombra: un proceso que tenga mapeado el
+    # vocabulario anterior (la app) sigue leyendo el archivo viejo sin errores
+    with open(vocab_path + '.tmp', 'wb') as f:
+        np.save(f, vocabulary, allow_pickle=False)
+    with open(model_path + '.tmp', 'wb') as f:
+        _write_arrays(f, model, vectorizer, idf, columns, intent_model)
+    os.replace(vocab_path + '.tmp', vocab_path)
+    os.replace(model_path + '.tmp', model_path)
+    return model_path, vocab_path
+
+
+def _write_arrays(f, model, vectorizer, idf, columns, intent_model=None):
+    intent_arrays = {}
+    if intent_model is not None:
+        intent_arrays = {
+            'intent_coef': np.asarray(intent_model.coef_)[:, columns].astype(np.float64),
+            'intent_intercept': np.asarray(intent_model.intercept_, dtype=np.float64),
+            'intent_classes': np.array([str(c) for c in intent_model.classes_]),
+            'intent_multi_class': np.array(_multi_class_mode(intent_model)),
+        }
+    np.savez(
+        f,
+        format_version=np.array(FORMAT_VERSION),
+        idf=idf.astype(np.float64),
+        coef=np.asarray(model.coef_)[:, columns].astype(np.float64),
+        intercept=np.asarray(model.intercept_, dtype=np.float64),
+        classes=np.array([str(c) for c in model.classes_]),
+        multi_class=np.array(_multi_class_mode(model)),
+        lowercase=np.array(bool(vectorizer.lowercase)),
+        token_pattern=np.array(vectorizer.token_pattern),
+        ngram_range=np.array(vectorizer.ngram_range),
+        norm=np.array(vectorizer.norm or ''),
+        sublinear_tf=np.array(bool(vectorizer.sublinear_tf)),
+        **intent_arrays,
+    )
+
+
+class LinearHead:
+    """Clasificador lineal (coeficientes + intercepto) sobre una matriz TF-IDF ya calculada."""
+
+    def __init__(self, coef, intercept, classes, multi_class):
+        self.coef = coef
+        self.intercept = intercept
+        self.classes_ = classes
+        self.multi_class = str(multi_class)
+
+    def decision_function(self, X):
+        scores = np.asarray(X @ self.coef.T) + self.intercept
+        return scores.ravel() if scores.shape[1] == 1 else scores
+
+    def predict_proba(self, X):
+        scores = self.decision_function(X)
+        if self.multi_class == 'binary':
+            positive = 1.0 / (1.0 + np.exp(-scores))
+            return np.column_stack([1.0 - positive, positive])
+        if self.multi_class == 'ovr':
+            proba = 1.0 / (1.0 + np.exp(-scores))
+            return proba / proba.sum(axis=1, keepdims=True)
+        scores = scores - scores.max(axis=1, keepdims=True)
+        np.exp(scores, scores)
+        return scores / scores.sum(axis=1, keepdims=True)
+
+    def predict(self, X):
+        scores = self.decision_function(X)
+        if scores.ndim == 1:
+            return self.classes_[(scores > 0).astype(int)]
+        return self.classes_[scores.argmax(axis=1)]
+
+
+class CompactScorer:
+    """
+    Puntuador TF-IDF + lineal sobre los arrays exportados.
+
+    Expone la misma interfaz que usan la app y los scripts (`transform`,
+    `predict`, `predict_proba`, `classes_`), así que puede sustituir tanto al
+    vectorizador como al modelo. `intent` es el cabezal de intención
+    (LinearHead) si se exportó, o None.
+    """
+
+    def __init__(self, arrays, vocabulary):
+        if int(arrays['format_version']) != FORMAT_VERSION:
+            raise ValueError(f"Versión de formato compacto no soportada: {arrays['format_version']}")
+        self.vocabulary = vocabulary
+        self.idf = arrays['idf']
+        self.head = LinearHead(arrays['coef'], arrays['intercept'], arrays['classes'], arrays['multi_class'])
+        self.classes_ = self.head.classes_
+        self.intent = None
+        if 'intent_coef' in arrays:
+            self.intent = LinearHead(arrays['intent_coef'], arrays['intent_intercept'],
+                                     arrays['intent_classes'], arrays['intent_multi_class'])
+        self.lowercase = bool(arrays['lowercase'])
+        self.token_pattern = re.compile(str(arrays['token_pattern']))
+        self.min_n, self.max_n = (int(n) for n in arrays['ngram_range'])
+        self.norm = str(arrays['norm']) or None
+        self.sublinear_tf = bool(arrays['sublinear_tf'])
+
+    @classmethod
+    def load(cls, models_dir, name='v1'):
+        model_path, vocab_path = compact_paths(models_dir, name)
+        with np.load(model_path, allow_pickle=False) as data:
+            arrays = {key: data[key] for key in data.files}
+        # El vocabulario se abre con mmap: varios procesos comparten las mismas páginas
+        vocabulary = np.load(vocab_path, mmap_mode='r', allow_pickle=False)
+        return cls(arrays, vocabulary)
+
+    @property
+    def n_features(self):
+        return len(self.idf)
+
+    def _ngrams(self, text):
+        if self.lowercase:
+            text = text.lower()
+        tokens = self.token_pattern.findall(text)
+        if self.max_n == 1:
+            return tokens
+        # Mismo orden y reglas que sklearn (_word_ngrams)
+        grams = list(tokens) if self.min_n == 1 else []
+        n_tokens = len(tokens)
+        for n in range(max(self.min_n, 2), min(self.max_n + 1, n_tokens + 1)):
+            for i in range(n_tokens - n + 1):
+                grams.append(' '.join(tokens[i:i + n]))
+        return grams
+
+    def transform(self, texts):
+        """Matriz TF-IDF dispersa (CSR) equivalente a `TfidfVectorizer.transform`."""
+        rows, terms = [], []
+        for row, text in enumerate(texts):
+            grams = self._ngrams(text if isinstance(text, str) else '')
+            rows.extend([row] * len(grams))
+            terms.extend(g.encode('utf-8') for g in grams)
+        n_docs = len(texts)
+
+        if terms:
+            # Búsqueda vectorizada de todos los n-gramas del lote en el vocabulario
+            terms = np.array(terms)
+            positions = np.searchsorted(self.vocabulary, terms)
+            positions = np.minimum(positions, len(self.vocabulary) - 1)
+            found = self.vocabulary[positions] == terms
+            rows = np.asarray(rows)[found]
+            columns = positions[found]
+        else:
+            rows = columns = np.empty(0, dtype=np.int64)
+
+        # coo -> csr suma los n-gramas repetidos: frecuencia de término
+        X = sp.coo_matrix(
+            (np.ones(len(rows)), (rows, columns)),
+            shape=(n_docs, self.n_features),
+        ).tocsr()
+        if self.sublinear_tf:
+            np.log(X.data, X.data)
+            X.data += 1
+        # TF-IDF y normalización directamente sobre los datos de la CSR
+        X.data *= self.idf[X.indices]
+        if self.norm:
+            nnz_rows = np.repeat(np.arange(n_docs), np.diff(X.indptr))
+            weights = X.data ** 2 if self.norm == 'l2' else np.abs(X.data)
+            norms = np.bincount(nnz_rows, weights=weights, minlength=n_docs)
+            if self.norm == 'l2':
+                norms = np.sqrt(norms)
+            norms[norms == 0] = 1.0
+            X.data /= norms[nnz_rows]
+        return X
+
+    def _as_matrix(self, X):
+        return X if sp.issparse(X) or isinstance(X, np.ndarray) else self.transform(X)
+
+    def decision_function(self, X):
+        return self.head.decision_function(self._as_matrix(X))
+
+    def predict_proba(self, X):
+        return self.head.predict_proba(self._as_matrix(X))
+
+    def predict(self, X):
+        return self.head.predict(self._as_matrix(X))
+
+
+def load_compact_if_available(models_dir, name='v1'):
+    """Devuelve un CompactScorer si existen los archivos compactos; si no, None."""
+    model_path, vocab_path = compact_paths(models_dir, name)
+    if not (os.path.exists(model_path) and os.path.exists(vocab_path)):
+        return None
+    return CompactScorer.load(models_dir, name)
+
+
+if __name__ == '__main__':
+    # Convierte los .pkl ya entrenados de una versión del registro (por
+    # defecto, la activa) al formato compacto sin re-entrenar
+    import pickle
+    import sys
+
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+    from src.inference.model_registry import (MANIFEST_PATH, load_manifest, register_version, resolve_intent_path,
+                                              resolve_paths)
+
+    version = sys.argv[1] if len(sys.argv) > 1 else load_manifest()['activa']
+    model_file, vectorizer_file = resolve_paths(version)
+    intent_file = resolve_intent_path(version)
+    with open(model_file, 'rb') as f:
+        trained_model = pickle.load(f)
+    with open(vectorizer_file, 'rb') as f:
+        trained_vectorizer = pickle.load(f)
+    trained_intent = None
+    if intent_file:
+        with open(intent_file, 'rb') as f:
+            trained_intent = pickle.load(f)
+    paths = export_compact_model(trained_model, trained_vectorizer, os.path.dirname(MANIFEST_PATH), version,
+                                 intent_model=trained_intent)
+    entry = load_manifest()['versiones'][version]
+    register_version(version, model_file, vectorizer_file, compact=version, intent_path=intent_file,
+                     description=entry.get('descripcion', ''))
+    print(f"✅ Modelo compacto de la versión {version} exportado en: {paths[0]} y {paths[1]}")
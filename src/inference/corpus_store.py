@@ -0,0 +1,300 @@
+# src/inference/corpus_store.py
+"""
+Corpus del buscador en formato columnar, con el sentimiento ya calculado.
+
+En lugar de una lista de dicts (un objeto Python por tuit y por campo), cada
+columna es un array de NumPy:
+  - texto y texto limpio: todos los textos UTF-8 concatenados en un único
+    buffer de bytes más un array de offsets (texto i = buffer[off[i]:off[i+1]]).
+  - tono e intención predichos: códigos int8 sobre la lista de etiquetas
+    (-1 = sin predicción), y la confianza del tono en float32.
+  - fecha: datetime64[s] (columna 'fecha'/'fecha_recoleccion' si existe; si
+    no, la que lleva codificada el id del tuit, que es un snowflake de Twitter).
+  - matriz TF-IDF del texto limpio (CSR: data/indices/indptr), la misma que
+    alimenta los cabezales; la usa el buscador de tuits similares.
+
+Las etiquetas se calculan en UN lote (una limpieza, un transform y los
+cabezales de tono e intención sobre la misma matriz) y el resultado se guarda
+en data/cache/corpus_store/ con una clave que depende del CSV (tamaño y fecha
+de modificación) y de la versión del modelo: al reiniciar la app solo se lee
+el npz. Filtrar y agregar los resultados de una búsqueda por tono, intención o
+fecha son operaciones vectorizadas sobre los arrays.
+"""
+
+import glob
+import hashlib
+import os
+import time
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+
+BASE_DIR = os.path.join(os.path.dirname(__file__), '..', '..')
+CACHE_DIR = os.path.join(BASE_DIR, 'data', 'cache', 'corpus_store')
+FORMAT_VERSION = 2
+DATE_COLUMNS = ('fecha', 'fecha_recoleccion')
+# Los ids de tuit son snowflakes: los bits altos son milisegundos desde esta época
+TWITTER_EPOCH_MS = 1288834974657
+NO_LABEL = -1
+
+
+def is_date_only(value):
+    """¿Fecha sin hora ('AAAA-MM-DD')? Como límite superior incluye todo ese día."""
+    return isinstance(value, str) and len(value.strip()) == 10
+
+
+def parse_date(value):
+    """Fecha u hora ISO -> datetime64[s] (en UTC si trae zona horaria). ValueError si no es válida."""
+    timestamp = pd.Timestamp(value)
+    if timestamp is pd.NaT:
+        raise ValueError(f"Fecha no válida: {value!r}")
+    if timestamp.tzinfo is not None:
+        timestamp = timestamp.tz_convert('UTC').tz_localize(None)
+    return np.datetime64(timestamp.to_datetime64(), 's')
+
+
+def pack_texts(texts):
+    """(buffer uint8, offsets int64) con los textos UTF-8 concatenados."""
+    encoded = [t.encode('utf-8') if isinstance(t, str) else b'' for t in texts]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(b) for b in encoded], out=offsets[1:])
+    return np.frombuffer(b''.join(encoded), dtype=np.uint8), offsets
+
+
+def unpack_texts(data, offsets):
+    """Inversa de `pack_texts`: lista de textos."""
+    data = data.tobytes()
+    return [data[offsets[i]:offsets[i + 1]].decode('utf-8') for i in range(len(offsets) - 1)]
+
+
+def _encode_labels(values):
+    """(códigos int8, etiquetas) a partir de una lista de etiquetas ('' o None = sin etiqueta)."""
+    values = [v if isinstance(v, str) and v else None for v in values]
+    codes, labels = pd.factorize(pd.Series(values, dtype=object), sort=True)
+    return codes.astype(np.int8), np.array([str(label) for label in labels], dtype=str)
+
+
+def _snowflake_dates(ids):
+    """Fecha de publicación codificada en los ids de tuit (NaT si no parecen snowflakes)."""
+    numeric = pd.to_numeric(pd.Series(ids), errors='coerce').to_numpy(dtype=np.float64)
+    ms = numeric / 2 ** 22 + TWITTER_EPOCH_MS
+    valid = np.isfinite(ms) & (ms > TWITTER_EPOCH_MS) & (ms < time.time() * 1000 + 86_400_000)
+    dates = np.where(valid, ms, 0).astype(np.int64).astype('datetime64[ms]').astype('datetime64[s]')
+    dates[~valid] = np.datetime64('NaT')
+    return dates
+
+
+def tweet_dates(df):
+    """Fecha de cada tuit (datetime64[s]; NaT si no se conoce): columna de fecha o, si no, su id."""
+    dates = _snowflake_dates(df['id_tuit']) if 'id_tuit' in df else np.full(len(df), np.datetime64('NaT', 's'))
+    for column in DATE_COLUMNS:
+        if column in df:
+            explicit = pd.to_datetime(df[column], errors='coerce', utc=True).dt.tz_localize(None)
+            explicit = explicit.to_numpy(dtype='datetime64[s]')
+            dates = np.where(np.isnat(explicit), dates, explicit)
+            break
+    return dates
+
+
+def cache_key(csv_path, model_fingerprint):
+    st = os.stat(csv_path)
+    payload = f"{FORMAT_VERSION}|{os.path.abspath(csv_path)}:{st.st_size}:{st.st_mtime_ns}|{model_fingerprint}"
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()[:16]
+
+
+class CorpusStore:
+    """
+    Corpus columnar del buscador. Uso:
+        store = CorpusStore.load_or_build(DATA_PATH, router.current, clean_batch)
+        ids = store.filter(index.search('vergüenza'), tono='Negativo')
+        store.facets(ids)  ->  {'tono': {'Negativo': 12, ...}, 'intencion': {...}, ...}
+    """
+
+    ARRAYS = ('text_data', 'text_offsets', 'clean_data', 'clean_offsets', 'tone_codes', 'tone_labels',
+              'confidence', 'intent_codes', 'intent_labels', 'dates',
+              'tfidf_data', 'tfidf_indices', 'tfidf_indptr', 'tfidf_shape')
+
+    def __init__(self, arrays, model_fingerprint=None):
+        for name in self.ARRAYS:
+            setattr(self, name, arrays[name])
+        self.model_fingerprint = model_fingerprint
+
+    @classmethod
+    def empty(cls):
+        return cls.from_columns([], [], [], np.zeros(0, dtype=np.float32), [], np.zeros(0, dtype='datetime64[s]'))
+
+    @classmethod
+    def from_columns(cls, texts, cleaned, tones, confidence, intents, dates, model_fingerprint=None, features=None):
+        # Sin modelo no hay matriz TF-IDF: n x 0
+        features = sp.csr_matrix((len(texts), 0), dtype=np.float32) if features is None else sp.csr_matrix(features)
+        text_data, text_offsets = pack_texts(texts)
+        clean_data, clean_offsets = pack_texts(cleaned)
+        tone_codes, tone_labels = _encode_labels(tones)
+        intent_codes, intent_labels = _encode_labels(intents)
+        return cls({
+            'text_data': text_data, 'text_offsets': text_offsets,
+            'clean_data': clean_data, 'clean_offsets': clean_offsets,
+            'tone_codes': tone_codes, 'tone_labels': tone_labels,
+            'confidence': np.asarray(confidence, dtype=np.float32),
+            'intent_codes': intent_codes, 'intent_labels': intent_labels,
+            'dates': np.asarray(dates, dtype='datetime64[s]'),
+            'tfidf_data': features.data.astype(np.float32), 'tfidf_indices': features.indices.astype(np.int32),
+            'tfidf_indptr': features.indptr.astype(np.int64), 'tfidf_shape': np.array(features.shape, dtype=np.int64),
+        }, model_fingerprint)
+
+    @classmethod
+    def build(cls, df, loaded, clean_fn, text_column='texto_procesado'):
+        """
+        Limpia y clasifica todo el corpus en un solo lote con `loaded` (un
+        LoadedModel del registro; None = sin predicciones).
+        """
+        texts = df[text_column].fillna('').astype(str).tolist()
+        cleaned = clean_fn(texts)
+        n = len(texts)
+        tones, intents = [None] * n, [None] * n
+        confidence = np.zeros(n, dtype=np.float32)
+        X = None
+        if loaded is not None and n:
+            X = loaded.vectorizer.transform(cleaned)
+            probabilities = loaded.model.predict_proba(X)
+            tones = np.asarray(loaded.model.classes_).astype(str)[probabilities.argmax(axis=1)]
+            confidence = probabilities.max(axis=1)
+            if loaded.intent_model is not None:
+                intents = loaded.intent_model.predict(X).astype(str)
+        return cls.from_columns(texts, cleaned, tones, confidence, intents, tweet_dates(df),
+                                loaded.fingerprint if loaded is not None else None, X)
+
+    # -- Persistencia --
+
+    def save(self, path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Temporal + rename: otro worker que arranque a la vez nunca lee un npz a medias
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            np.savez(f, format_version=np.array(FORMAT_VERSION),
+                     model_fingerprint=np.array(self.model_fingerprint or ''),
+                     **{name: getattr(self, name) for name in self.ARRAYS})
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as data:
+            if int(data['format_version']) != FORMAT_VERSION:
+                raise ValueError(f"Versión de formato del corpus no soportada: {data['format_version']}")
+            arrays = {name: data[name] for name in cls.ARRAYS}
+            fingerprint = str(data['model_fingerprint']) or None
+        return cls(arrays, fingerprint)
+
+    @classmethod
+    def load_or_build(cls, csv_path, loaded, clean_fn, cache_dir=CACHE_DIR, text_column='texto_procesado'):
+        """(store, True si venía de la caché). Sin modelo no se guarda nada en la caché."""
+        fingerprint = loaded.fingerprint if loaded is not None else None
+        path = os.path.join(cache_dir, f"corpus_{cache_key(csv_path, fingerprint)}.npz")
+        if fingerprint and os.path.exists(path):
+            try:
+                return cls.load(path), True
+            except (OSError, ValueError, KeyError) as e:
+                print(f"⚠️ Caché del corpus ilegible ({e}); se reconstruye.")
+        store = cls.build(pd.read_csv(csv_path), loaded, clean_fn, text_column)
+        if fingerprint:
+            store.save(path)
+            # Las cachés de versiones anteriores del CSV o del modelo ya no se van a leer
+            for old_path in glob.glob(os.path.join(cache_dir, 'corpus_*.npz')):
+                if os.path.abspath(old_path) != os.path.abspath(path):
+                    try:
+                        os.remove(old_path)
+                    except OSError:
+                        pass
+        return store, False
+
+    # -- Acceso --
+
+    def __len__(self):
+        return len(self.text_offsets) - 1
+
+    def nbytes(self):
+        return sum(getattr(self, name).nbytes for name in self.ARRAYS)
+
+    def text(self, row_id):
+        return self.text_data[self.text_offsets[row_id]:self.text_offsets[row_id + 1]].tobytes().decode('utf-8')
+
+    def tfidf_matrix(self):
+        """Matriz TF-IDF (CSR) del corpus en el espacio del vectorizador con el que se construyó."""
+        return sp.csr_matrix((self.tfidf_data, self.tfidf_indices, self.tfidf_indptr),
+                             shape=tuple(int(n) for n in self.tfidf_shape))
+
+    def cleaned_texts(self):
+        return unpack_texts(self.clean_data, self.clean_offsets)
+
+    @staticmethod
+    def _label(labels, code):
+        return str(labels[code]) if code != NO_LABEL else None
+
+    def rows(self, row_ids):
+        """Dicts solo para las filas que se van a mostrar (p. ej. una página de resultados)."""
+        return [{
+            'tweet_text': self.text(i),
+            'tono': self._label(self.tone_labels, self.tone_codes[i]),
+            'confianza': round(float(self.confidence[i]), 4),
+            'intencion': self._label(self.intent_labels, self.intent_codes[i]),
+            'fecha': None if np.isnat(self.dates[i]) else str(self.dates[i]),
+        } for i in (int(i) for i in row_ids)]
+
+    # -- Filtros y facetas --
+
+    @staticmethod
+    def _code(labels, label):
+        matches = np.flatnonzero(labels == label)
+        return int(matches[0]) if len(matches) else None
+
+    def filter(self, row_ids=None, tono=None, intencion=None, desde=None, hasta=None, min_confianza=None):
+        """
+        Filas de `row_ids` (por defecto, todo el corpus) que cumplen los
+        filtros. `desde`/`hasta` son fechas u horas ISO ('2025-11-30',
+        '2025-11-30T12:00'), ambas incluidas; un `hasta` sin hora incluye todo
+        ese día. ValueError si alguna no es válida.
+        """
+        ids = np.arange(len(self)) if row_ids is None else np.asarray(row_ids, dtype=np.int64)
+        mask = np.ones(len(ids), dtype=bool)
+        for codes, labels, label in ((self.tone_codes, self.tone_labels, tono),
+                                     (self.intent_codes, self.intent_labels, intencion)):
+            if label:
+                code = self._code(labels, label)
+                if code is None:
+                    return ids[:0]
+                mask &= codes[ids] == code
+        if desde:
+            mask &= self.dates[ids] >= parse_date(desde)
+        if hasta:
+            end = parse_date(hasta)
+            if is_date_only(hasta):
+                mask &= self.dates[ids] < end + np.timedelta64(1, 'D')
+            else:
+                mask &= self.dates[ids] <= end
+        if min_confianza is not None:
+            mask &= self.confidence[ids] >= float(min_confianza)
+        return ids[mask]
+
+    def _counts(self, codes, labels, ids):
+        selected = codes[ids]
+        counts = np.bincount(selected[selected != NO_LABEL], minlength=len(labels))
+        return {str(label): int(count) for label, count in zip(labels, counts) if count}
+
+    def facets(self, row_ids=None):
+        """Recuentos por tono e intención, confianza media por tono y rango de fechas de `row_ids`."""
+        ids = np.arange(len(self)) if row_ids is None else np.asarray(row_ids, dtype=np.int64)
+        tone_codes = self.tone_codes[ids]
+        known = tone_codes != NO_LABEL
+        counts = np.bincount(tone_codes[known], minlength=len(self.tone_labels))
+        sums = np.bincount(tone_codes[known], weights=self.confidence[ids][known], minlength=len(self.tone_labels))
+        dates = self.dates[ids]
+        dates = dates[~np.isnat(dates)]
+        return {
+            'total': int(len(ids)),
+            'tono': self._counts(self.tone_codes, self.tone_labels, ids),
+            'intencion': self._counts(self.intent_codes, self.intent_labels, ids),
+            'confianza_media': {str(label): round(float(s / c), 4)
+                                for label, s, c in zip(self.tone_labels, sums, counts) if c},
+            'fechas': [str(dates.min()), str(dates.max())] if len(dates) else None,
+        }
@@ -0,0 +1,557 @@
+# src/inference/model_registry.py
+"""
+Registro de versiones del modelo de tono.
+
+`models/manifest.json` enumera las versiones disponibles (archivos del modelo,
+del vectorizador y, opcionalmente, del cabezal de intención y del formato
+compacto) con su sha256, cuál
+está activa y, opcionalmente, una versión candidata:
+
+    {
+      "activa": "v1",
+      "candidata": {"version": "v2", "modo": "shadow", "fraccion": 0.1},
+      "versiones": {
+        "v1": {"modelo": "model_clasificador_v1.pkl", "vectorizador": "vectorizer_v1.pkl",
+               "intencion": "model_intencion_v1.pkl", "compacto": "v1",
+               "sha256": {...}, "registrada": "...", "descripcion": "..."}
+      }
+    }
+
+Los scripts obtienen las rutas con `resolve_paths()` en lugar de tenerlas
+escritas a mano. La app usa `ModelRouter`: vigila el manifiesto, carga y
+calienta en segundo plano la versión nueva y la intercambia de golpe (una
+asignación), así que ninguna petición se queda sin modelo. En modo "shadow"
+una fracción de los lotes se puntúa también con la candidata, fuera del
+camino de la respuesta; en modo "split" esa fracción la sirve la candidata.
+En ambos casos se registran la concordancia y la latencia de cada versión.
+
+Los archivos de una versión registrada no se reescriben: train_model.py
+guarda cada entrenamiento como una versión nueva (v2, v3...) y la deja como
+candidata en sombra, así que volver atrás es activar la anterior.
+
+Uso:
+    python src/inference/model_registry.py list
+    python src/inference/model_registry.py register v2 --model m.pkl --vectorizer v.pkl
+    python src/inference/model_registry.py candidate v2 --mode shadow --fraction 0.1
+    python src/inference/model_registry.py activate v2
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import pickle
+import random
+import re
+import sys
+import tempfile
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+BASE_DIR = os.path.join(os.path.dirname(__file__), '..', '..')
+sys.path.insert(0, os.path.abspath(BASE_DIR))
+from src.data_pipeline.tweet_store import atomic_write_json, replacement_mode
+from src.inference.compact_model import CompactScorer, compact_paths
+
+MODELS_DIR = os.path.abspath(os.path.join(BASE_DIR, 'models'))
+MANIFEST_PATH = os.environ.get('MODEL_MANIFEST_PATH', os.path.join(MODELS_DIR, 'manifest.json'))
+DEFAULT_VERSION = 'v1'
+# Cada cuántos segundos se mira si el manifiesto ha cambiado
+REGISTRY_CHECK_INTERVAL = float(os.environ.get('REGISTRY_CHECK_INTERVAL', '5'))
+# Lotes en sombra pendientes como máximo; por encima se descartan (no se acumula retraso)
+MAX_PENDING_SHADOW = 8
+CANDIDATE_MODES = ('shadow', 'split')
+
+# Generaciones que ya había en models/ antes del registro
+KNOWN_VERSIONS = {
+    'v0': {'modelo': 'modelo_tono.pkl', 'vectorizador': 'vectorizador.pkl', 'intencion': None, 'compacto': None,
+           'descripcion': 'MultinomialNB original'},
+    'v1': {'modelo': 'model_clasificador_v1.pkl', 'vectorizador': 'vectorizer_v1.pkl',
+           'intencion': 'model_intencion_v1.pkl', 'compacto': 'v1',
+           'descripcion': 'LogisticRegression con class_weight=balanced (train_model.py)'},
+}
+
+LoadedModel = namedtuple('LoadedModel', ['version', 'model', 'vectorizer', 'fingerprint', 'load_seconds',
+                                         'intent_model'], defaults=(None,))
+LoadedModel.__doc__ = """
+Una versión cargada. `fingerprint` cambia si cambian sus archivos (clave de
+la caché). `intent_model` (o None) clasifica la intención sobre la misma
+matriz que devuelve `vectorizer.transform`.
+"""
+
+
+class RegistryError(Exception):
+    """Versión desconocida, archivo ausente o checksum que no coincide."""
+
+
+# --- Manifiesto ---
+
+def sha256_file(path, chunk_size=1 << 20):
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(chunk_size), b''):
+            h.update(block)
+    return h.hexdigest()
+
+
+def version_files(entry, models_dir=MODELS_DIR):
+    """Archivos (relativos a models/) que forman una versión."""
+    files = [entry['modelo'], entry['vectorizador']]
+    if entry.get('intencion'):
+        files.append(entry['intencion'])
+    if entry.get('compacto'):
+        files.extend(os.path.relpath(p, models_dir) for p in compact_paths(models_dir, entry['compacto']))
+    return files
+
+
+def _entry(model_file, vectorizer_file, compact, description, models_dir, intent_file=None):
+    entry = {'modelo': model_file, 'vectorizador': vectorizer_file, 'intencion': intent_file, 'compacto': compact}
+    # Igual con el cabezal de intención (las versiones antiguas no lo tienen)
+    if intent_file and not os.path.exists(os.path.join(models_dir, intent_file)):
+        entry['intencion'] = None
+    # El compacto solo se registra si existe (p. ej. v0 no es exportable)
+    if compact and not all(os.path.exists(p) for p in compact_paths(models_dir, compact)):
+        entry['compacto'] = None
+    entry['sha256'] = {f: sha256_file(os.path.join(models_dir, f)) for f in version_files(entry, models_dir)}
+    entry['registrada'] = time.strftime('%Y-%m-%dT%H:%M:%S')
+    entry['descripcion'] = description
+    return entry
+
+
+def bootstrap_manifest(models_dir=MODELS_DIR):
+    """Manifiesto inicial con las generaciones conocidas que existan en models/."""
+    versions = {}
+    for name, known in KNOWN_VERSIONS.items():
+        if all(os.path.exists(os.path.join(models_dir, known[k])) for k in ('modelo', 'vectorizador')):
+            versions[name] = _entry(known['modelo'], known['vectorizador'], known['compacto'],
+                                    known['descripcion'], models_dir, known['intencion'])
+    return {'activa': DEFAULT_VERSION if DEFAULT_VERSION in versions else next(iter(versions), None),
+            'candidata': None, 'versiones': versions}
+
+
+def load_manifest(path=MANIFEST_PATH):
+    """Lee el manifiesto; si aún no existe, lo deriva de los archivos de models/ (sin guardarlo)."""
+    if not os.path.exists(path):
+        return bootstrap_manifest(os.path.dirname(path))
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_manifest(manifest, path=MANIFEST_PATH):
+    # Escritura atómica: quien lo vigila nunca lee un manifiesto a medias
+    atomic_write_json(path, manifest)
+
+
+def atomic_write_pickle(obj, path):
+    """Serializa `obj` en un temporal del mismo directorio y lo renombra: nunca queda un .pkl a medias."""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.tmp-', suffix='.pkl')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump(obj, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp_path, replacement_mode(path))
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def next_version_name(path=MANIFEST_PATH):
+    """Siguiente nombre 'vN' libre del manifiesto (v2 si solo están v0 y v1)."""
+    numbers = [int(m.group(1)) for m in map(re.compile(r'v(\d+)$').match, load_manifest(path)['versiones']) if m]
+    return f"v{max(numbers, default=1) + 1}"
+
+
+def register_version(name, model_path, vectorizer_path, compact=None, activate=False,
+                     description='', path=MANIFEST_PATH, intent_path=None):
+    """
+    Añade (o actualiza) una versión con los sha256 de sus archivos, que deben
+    estar dentro de models/. Llamar después de escribir los archivos: el
+    manifiesto es lo último que cambia, así que nadie carga una versión a medias.
+    """
+    models_dir = os.path.dirname(os.path.abspath(path))
+    files = []
+    for file_path in (model_path, vectorizer_path, intent_path):
+        if file_path is None:
+            files.append(None)
+            continue
+        rel = os.path.relpath(os.path.abspath(file_path), models_dir)
+        if rel.startswith('..'):
+            raise RegistryError(f"{file_path} no está dentro de {models_dir}")
+        files.append(rel)
+
+    manifest = load_manifest(path)
+    manifest['versiones'][name] = _entry(files[0], files[1], compact, description, models_dir, files[2])
+    if activate or not manifest.get('activa'):
+        manifest['activa'] = name
+    save_manifest(manifest, path)
+    return manifest['versiones'][name]
+
+
+def set_active(name, path=MANIFEST_PATH):
+    manifest = load_manifest(path)
+    if name not in manifest['versiones']:
+        raise RegistryError(f"Versión desconocida: {name}")
+    manifest['activa'] = name
+    if (manifest.get('candidata') or {}).get('version') == name:
+        manifest['candidata'] = None
+    save_manifest(manifest, path)
+
+
+def set_candidate(name, mode='shadow', fraction=0.1, path=MANIFEST_PATH):
+    """Versión candidata en sombra o con reparto de tráfico. `name=None` la retira."""
+    manifest = load_manifest(path)
+    if name is None:
+        manifest['candidata'] = None
+    else:
+        if name not in manifest['versiones']:
+            raise RegistryError(f"Versión desconocida: {name}")
+        if mode not in CANDIDATE_MODES:
+            raise RegistryError(f"Modo desconocido: {mode} (opciones: {', '.join(CANDIDATE_MODES)})")
+        manifest['candidata'] = {'version': name, 'modo': mode, 'fraccion': max(0.0, min(1.0, float(fraction)))}
+    save_manifest(manifest, path)
+
+
+def resolve_paths(version=None, path=MANIFEST_PATH):
+    """(ruta del modelo, ruta del vectorizador) de `version` (por defecto, la activa)."""
+    manifest = load_manifest(path)
+    version = version or manifest['activa']
+    if version not in manifest['versiones']:
+        raise RegistryError(f"Versión desconocida: {version}")
+    entry = manifest['versiones'][version]
+    models_dir = os.path.dirname(os.path.abspath(path))
+    return os.path.join(models_dir, entry['modelo']), os.path.join(models_dir, entry['vectorizador'])
+
+
+def resolve_intent_path(version=None, path=MANIFEST_PATH):
+    """Ruta del cabezal de intención de `version` (por defecto, la activa), o None si no tiene."""
+    manifest = load_manifest(path)
+    version = version or manifest['activa']
+    if version not in manifest['versiones']:
+        raise RegistryError(f"Versión desconocida: {version}")
+    intent_file = manifest['versiones'][version].get('intencion')
+    return os.path.join(os.path.dirname(os.path.abspath(path)), intent_file) if intent_file else None
+
+
+def verify_version(entry, models_dir=MODELS_DIR):
+    """Lista de archivos ausentes o cuyo sha256 no coincide con el manifiesto."""
+    bad = []
+    for rel, expected in entry.get('sha256', {}).items():
+        file_path = os.path.join(models_dir, rel)
+        if not os.path.exists(file_path) or sha256_file(file_path) != expected:
+            bad.append(rel)
+    return bad
+
+
+def _fingerprint(version, entry):
+    digest = hashlib.sha1(json.dumps(entry.get('sha256', {}), sort_keys=True).encode('utf-8')).hexdigest()[:12]
+    return f'{version}:{digest}'
+
+
+def load_version(version=None, manifest=None, prefer_compact=True, verify=True, path=MANIFEST_PATH):
+    """Carga una versión (por defecto, la activa) comprobando antes sus checksums."""
+    start = time.perf_counter()
+    manifest = manifest or load_manifest(path)
+    version = version or manifest['activa']
+    entry = manifest['versiones'].get(version)
+    if entry is None:
+        raise RegistryError(f"Versión desconocida: {version}")
+    models_dir = os.path.dirname(os.path.abspath(path))
+
+    if verify:
+        bad = verify_version(entry, models_dir)
+        if bad:
+            raise RegistryError(f"Checksum incorrecto o archivo ausente en la versión {version}: {', '.join(bad)}")
+
+    if prefer_compact and entry.get('compacto'):
+        # El compacto reordena las columnas: su cabezal de intención va en el mismo npz
+        model = vectorizer = CompactScorer.load(models_dir, entry['compacto'])
+        intent_model = model.intent
+    else:
+        with open(os.path.join(models_dir, entry['modelo']), 'rb') as f:
+            model = pickle.load(f)
+        with open(os.path.join(models_dir, entry['vectorizador']), 'rb') as f:
+            vectorizer = pickle.load(f)
+        intent_model = None
+        if entry.get('intencion'):
+            with open(os.path.join(models_dir, entry['intencion']), 'rb') as f:
+                intent_model = pickle.load(f)
+
+    return LoadedModel(version, model, vectorizer, _fingerprint(version, entry), time.perf_counter() - start,
+                       intent_model)
+
+
+# --- Enrutado en la app ---
+
+class ModelRouter:
+    """
+    Versión activa (y candidata) de la app, con recarga en caliente.
+
+    Un hilo de fondo mira el manifiesto cada `check_interval` segundos. Si
+    cambia la versión activa (o sus archivos), la carga, la calienta con
+    `warmup_texts` y solo entonces sustituye `self.current`: las peticiones
+    en curso terminan con el modelo anterior y las nuevas usan el nuevo.
+    Los modelos se pueden fijar con `pinned` (un LoadedModel): entonces no se
+    vigila el manifiesto.
+    """
+
+    def __init__(self, manifest_path=MANIFEST_PATH, prefer_compact=True, check_interval=REGISTRY_CHECK_INTERVAL,
+                 warmup_texts=('calentamiento del modelo',), clean_fn=None, on_swap=None, pinned=None):
+        self.manifest_path = manifest_path
+        self.prefer_compact = prefer_compact
+        self.check_interval = check_interval
+        self.warmup_texts = list(warmup_texts)
+        self.clean_fn = clean_fn or (lambda texts: list(texts))
+        self.on_swap = on_swap
+        self.pinned = pinned is not None
+
+        self.current = pinned
+        self.candidate = None
+        self.candidate_mode = None
+        self.candidate_fraction = 0.0
+        self.last_error = None
+
+        self._manifest_mtime = None
+        # _refresh_lock serializa las recargas (lentas); _lock solo protege
+        # contadores, así que las peticiones nunca esperan a una carga
+        self._refresh_lock = threading.Lock()
+        self._lock = threading.Lock()
+        self._watcher = None
+        self._watcher_pid = None
+        self._shadow_pool = None
+        self._shadow_pending = 0
+        self._stats = {}
+
+    # -- Carga y recarga --
+
+    def _warm(self, loaded):
+        X = loaded.vectorizer.transform(self.clean_fn(self.warmup_texts))
+        loaded.model.predict_proba(X)
+        if loaded.intent_model is not None:
+            loaded.intent_model.predict_proba(X)
+        return loaded
+
+    def _load(self, manifest, version):
+        return self._warm(load_version(version, manifest, prefer_compact=self.prefer_compact,
+                                       path=self.manifest_path))
+
+    def refresh(self):
+        """Relee el manifiesto y, si algo cambió, carga y calienta antes de intercambiar."""
+        if self.pinned:
+            return False
+        try:
+            mtime = os.stat(self.manifest_path).st_mtime_ns if os.path.exists(self.manifest_path) else 0
+        except OSError:
+            return False
+        if mtime == self._manifest_mtime:
+            return False
+
+        with self._refresh_lock:
+            try:
+                manifest = load_manifest(self.manifest_path)
+                active = manifest['activa']
+                new_current = self.current
+                if self.current is None or self.current.fingerprint != self._fingerprint(manifest, active):
+                    new_current = self._load(manifest, active)
+
+                candidate_cfg = manifest.get('candidata') or {}
+                new_candidate = None
+                if candidate_cfg.get('version') and candidate_cfg['version'] != active:
+                    name = candidate_cfg['version']
+                    if self.candidate is not None and self.candidate.fingerprint == self._fingerprint(manifest, name):
+                        new_candidate = self.candidate
+                    else:
+                        new_candidate = self._load(manifest, name)
+            except Exception as e:
+                # Se sigue sirviendo la versión anterior
+                self.last_error = f"{type(e).__name__}: {e}"
+                print(f"❌ ERROR al cargar la versión del registro: {self.last_error}")
+                self._manifest_mtime = mtime
+                return False
+
+            swapped = new_current is not self.current
+            previous = self.current
+            # Intercambio atómico: cada petición lee self.current una sola vez
+            self.current = new_current
+            self.candidate = new_candidate
+            self.candidate_mode = candidate_cfg.get('modo') if new_candidate else None
+            self.candidate_fraction = float(candidate_cfg.get('fraccion', 0.0)) if new_candidate else 0.0
+            self._manifest_mtime = mtime
+            self.last_error = None
+
+        if swapped and self.on_swap:
+            self.on_swap(previous, new_current)
+        return swapped
+
+    def _fingerprint(self, manifest, version):
+        entry = manifest['versiones'].get(version)
+        if entry is None:
+            raise RegistryError(f"Versión desconocida: {version}")
+        return _fingerprint(version, entry)
+
+    def ensure_watcher(self):
+        """Arranca (de forma perezosa, y de nuevo tras un fork) el hilo que vigila el manifiesto."""
+        if self.pinned:
+            return
+        if self._watcher is not None and self._watcher_pid == os.getpid() and self._watcher.is_alive():
+            return
+        with self._refresh_lock:
+            if self._watcher is not None and self._watcher_pid == os.getpid() and self._watcher.is_alive():
+                return
+            self._watcher = threading.Thread(target=self._watch, name='model-registry', daemon=True)
+            self._watcher_pid = os.getpid()
+            self._shadow_pool = None
+            self._watcher.start()
+
+    def _watch(self):
+        while True:
+            time.sleep(self.check_interval)
+            self.refresh()
+
+    # -- Reparto de tráfico --
+
+    def choose(self):
+        """
+        (versión que sirve el lote, versión que lo puntúa en sombra o None).
+        En modo split la candidata sirve una fracción de los lotes y la activa
+        los puntúa en sombra, así que la concordancia se mide igual en ambos modos.
+        """
+        current, candidate = self.current, self.candidate
+        if candidate is None or random.random() >= self.candidate_fraction:
+            return current, None
+        if self.candidate_mode == 'split':
+            return candidate, current
+        return current, candidate
+
+    def record_latency(self, version, role, seconds, n_texts):
+        with self._lock:
+            stats = self._stats.setdefault(version, {'lotes': 0, 'textos': 0, 'segundos': 0.0, 'roles': {}})
+            stats['lotes'] += 1
+            stats['textos'] += n_texts
+            stats['segundos'] += seconds
+            stats['roles'][role] = stats['roles'].get(role, 0) + 1
+
+    def _record_agreement(self, served, shadow, served_labels, shadow_labels):
+        agree = sum(a == b for a, b in zip(served_labels, shadow_labels))
+        key = f'{served.version}~{shadow.version}'
+        with self._lock:
+            stats = self._stats.setdefault(key, {'comparados': 0, 'coinciden': 0})
+            stats['comparados'] += len(served_labels)
+            stats['coinciden'] += agree
+        return agree
+
+    def score_shadow(self, served, shadow, cleaned_texts, served_labels, on_result=None):
+        """
+        Puntúa `cleaned_texts` con `shadow` en un hilo aparte (no retrasa la
+        respuesta) y registra concordancia y latencia. Si hay demasiados lotes
+        en sombra pendientes, este se descarta.
+        """
+        with self._lock:
+            if self._shadow_pending >= MAX_PENDING_SHADOW:
+                self._stats['shadow_descartados'] = self._stats.get('shadow_descartados', 0) + 1
+                return None
+            self._shadow_pending += 1
+            if self._shadow_pool is None:
+                self._shadow_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix='shadow')
+
+        def run():
+            try:
+                start = time.perf_counter()
+                probabilities = shadow.model.predict_proba(shadow.vectorizer.transform(cleaned_texts))
+                labels = [str(c) for c in shadow.model.classes_[probabilities.argmax(axis=1)]]
+                seconds = time.perf_counter() - start
+                self.record_latency(shadow.version, 'sombra', seconds, len(cleaned_texts))
+                agree = self._record_agreement(served, shadow, served_labels, labels)
+                if on_result:
+                    on_result(shadow, seconds, agree, len(labels))
+            finally:
+                with self._lock:
+                    self._shadow_pending -= 1
+
+        return self._shadow_pool.submit(run)
+
+    def stats(self):
+        current, candidate = self.current, self.candidate
+        with self._lock:
+            stats = json.loads(json.dumps(self._stats))
+        for key, values in stats.items():
+            if isinstance(values, dict) and values.get('textos'):
+                values['ms_por_texto'] = round(values['segundos'] / values['textos'] * 1000, 4)
+            if isinstance(values, dict) and values.get('comparados'):
+                values['concordancia'] = round(values['coinciden'] / values['comparados'], 4)
+        return {
+            'activa': current.fingerprint if current else None,
+            'candidata': candidate.fingerprint if candidate else None,
+            'modo': self.candidate_mode,
+            'fraccion': self.candidate_fraction,
+            'ultimo_error': self.last_error,
+            'estadisticas': stats,
+        }
+
+
+# --- CLI ---
+
+def main():
+    parser = argparse.ArgumentParser(description="Registro de versiones del modelo (models/manifest.json).")
+    parser.add_argument('--manifest', default=MANIFEST_PATH)
+    sub = parser.add_subparsers(dest='command', required=True)
+    sub.add_parser('list', help="Muestra las versiones registradas.")
+    sub.add_parser('verify', help="Comprueba los sha256 de todas las versiones.")
+    reg = sub.add_parser('register', help="Registra (o actualiza) una versión.")
+    reg.add_argument('name')
+    reg.add_argument('--model', required=True)
+    reg.add_argument('--vectorizer', required=True)
+    reg.add_argument('--intent', default=None, help="Clasificador de intención (.pkl) sobre el mismo vectorizador.")
+    reg.add_argument('--compact', default=None, help="Nombre del formato compacto (modelo_compacto_<nombre>.npz).")
+    reg.add_argument('--description', default='')
+    reg.add_argument('--activate', action='store_true')
+    act = sub.add_parser('activate', help="Cambia la versión activa.")
+    act.add_argument('name')
+    cand = sub.add_parser('candidate', help="Versión candidata en sombra o con reparto de tráfico.")
+    cand.add_argument('name', nargs='?', default=None)
+    cand.add_argument('--mode', choices=CANDIDATE_MODES, default='shadow')
+    cand.add_argument('--fraction', type=float, default=0.1)
+    cand.add_argument('--clear', action='store_true')
+    args = parser.parse_args()
+
+    try:
+        if args.command == 'register':
+            register_version(args.name, args.model, args.vectorizer, args.compact, args.activate,
+                             args.description, args.manifest, args.intent)
+            print(f"✅ Versión {args.name} registrada.")
+        elif args.command == 'activate':
+            set_active(args.name, args.manifest)
+            print(f"✅ Versión activa: {args.name}")
+        elif args.command == 'candidate':
+            set_candidate(None if args.clear else args.name, args.mode, args.fraction, args.manifest)
+            print("✅ Candidata retirada." if args.clear else
+                  f"✅ Candidata: {args.name} ({args.mode}, {args.fraction:.0%} del tráfico)")
+    except RegistryError as e:
+        print(f"❌ ERROR: {e}")
+        sys.exit(1)
+
+    manifest = load_manifest(args.manifest)
+    if not os.path.exists(args.manifest):
+        save_manifest(manifest, args.manifest)
+        print(f"Manifiesto creado en: {args.manifest}")
+    models_dir = os.path.dirname(os.path.abspath(args.manifest))
+    candidate = manifest.get('candidata') or {}
+    for name, entry in manifest['versiones'].items():
+        mark = '*' if name == manifest['activa'] else ('~' if name == candidate.get('version') else ' ')
+        status = ''
+        if args.command == 'verify':
+            bad = verify_version(entry, models_dir)
+            status = '✅' if not bad else f"❌ {', '.join(bad)}"
+        print(f"{mark} {name:<14} {entry['modelo']:<30} {entry['vectorizador']:<22} "
+              f"intencion={'sí' if entry.get('intencion') else 'no':<3} "
+              f"compacto={entry.get('compacto') or '-':<6} {status}")
+
+
+if __name__ == '__main__':
+    main()
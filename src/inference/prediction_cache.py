@@ -0,0 +1,103 @@
+# src/inference/prediction_cache.py
+
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+
+DEFAULT_CACHE_SIZE = int(os.environ.get('PREDICTION_CACHE_SIZE', '100000'))
+DEFAULT_CACHE_TTL = float(os.environ.get('PREDICTION_CACHE_TTL', '3600'))
+
+
+def artifact_fingerprint(*paths):
+    """
+    Versión del modelo derivada de los archivos de artefactos (ruta, tamaño y
+    fecha de modificación). Cambia en cuanto se reescribe cualquiera de ellos.
+    """
+    parts = []
+    for path in paths:
+        try:
+            st = os.stat(path)
+            parts.append(f"{os.path.basename(path)}:{st.st_size}:{st.st_mtime_ns}")
+        except OSError:
+            parts.append(f"{os.path.basename(path)}:missing")
+    return hashlib.sha1('|'.join(parts).encode('utf-8')).hexdigest()[:12]
+
+
+class PredictionCache:
+    """
+    Caché LRU acotada de predicciones, con caducidad opcional (TTL).
+
+    La clave es un hash del texto YA LIMPIO y de la versión del modelo, de modo
+    que los retuits y frases repetidas que quedan idénticos tras `clean_text`
+    se clasifican una sola vez. Es segura para varios hilos.
+    """
+
+    def __init__(self, maxsize=DEFAULT_CACHE_SIZE, ttl=DEFAULT_CACHE_TTL):
+        self.maxsize = int(maxsize)
+        self.ttl = float(ttl) if ttl else None
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def make_key(cleaned_text, model_version):
+        payload = f"{model_version}\x00{cleaned_text}".encode('utf-8')
+        return hashlib.blake2b(payload, digest_size=16).digest()
+
+    def get(self, key):
+        """Devuelve el valor guardado o None si no está (o ha caducado)."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            value, expires_at = entry
+            if expires_at is not None and expires_at < time.monotonic():
+                del self._data[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        if self.maxsize <= 0:
+            return
+        expires_at = time.monotonic() + self.ttl if self.ttl else None
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        """Vacía la caché (p. ej. al cambiar los artefactos del modelo)."""
+        with self._lock:
+            self._data.clear()
+            self.invalidations += 1
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._data),
+                'maxsize': self.maxsize,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'invalidations': self.invalidations,
+            }
@@ -0,0 +1,106 @@
+# src/inference/predictor.py
+
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+# --- Configuración por defecto del micro-batching ---
+# Se puede ajustar con variables de entorno sin tocar el código.
+DEFAULT_MAX_BATCH_SIZE = int(os.environ.get('BATCH_MAX_SIZE', '256'))
+DEFAULT_MAX_LATENCY_MS = float(os.environ.get('BATCH_MAX_LATENCY_MS', '10'))
+
+
+class MicroBatcher:
+    """
+    Agrupa peticiones concurrentes en una sola llamada de predicción.
+
+    Cada petición deja sus textos en una cola. Un hilo de fondo recoge todo lo
+    que llegue dentro de la ventana de latencia (o hasta completar el tamaño
+    máximo de lote) y llama UNA sola vez a `predict_fn` con la lista completa.
+    Así `vectorizer.transform` y `model.predict_proba` trabajan sobre una única
+    matriz dispersa en lugar de una fila por petición.
+
+    `predict_fn` recibe una lista de textos y devuelve una lista de resultados
+    del mismo tamaño y en el mismo orden.
+    """
+
+    def __init__(self, predict_fn, max_batch_size=DEFAULT_MAX_BATCH_SIZE,
+                 max_latency_ms=DEFAULT_MAX_LATENCY_MS):
+        self.predict_fn = predict_fn
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.max_latency = max(0.0, float(max_latency_ms)) / 1000.0
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._worker = None
+        self._worker_pid = None
+
+    def _ensure_worker(self):
+        # El hilo se arranca de forma perezosa y se vuelve a crear si el
+        # proceso ha hecho fork (los hilos no sobreviven a un fork).
+        if self._worker is not None and self._worker_pid == os.getpid() and self._worker.is_alive():
+            return
+        with self._lock:
+            if self._worker is not None and self._worker_pid == os.getpid() and self._worker.is_alive():
+                return
+            self._queue = queue.Queue()
+            self._worker = threading.Thread(target=self._run, name='micro-batcher', daemon=True)
+            self._worker_pid = os.getpid()
+            self._worker.start()
+
+    def submit(self, texts):
+        """Encola una lista de textos y devuelve un Future con sus resultados."""
+        future = Future()
+        if not texts:
+            future.set_result([])
+            return future
+        self._ensure_worker()
+        self._queue.put((list(texts), future))
+        return future
+
+    def predict(self, texts, timeout=None):
+        """Versión bloqueante de `submit`."""
+        return self.submit(texts).result(timeout=timeout)
+
+    def _collect_batch(self):
+        """Espera la primera petición y acumula las que lleguen dentro de la ventana."""
+        first = self._queue.get()
+        batch = [first]
+        n_texts = len(first[0])
+        deadline = time.monotonic() + self.max_latency
+
+        while n_texts < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            batch.append(item)
+            n_texts += len(item[0])
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect_batch()
+
+            # Un único lote plano con todos los textos de todas las peticiones
+            all_texts = []
+            for texts, _ in batch:
+                all_texts.extend(texts)
+
+            try:
+                results = self.predict_fn(all_texts)
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+
+            # Repartimos los resultados a cada petición en el mismo orden
+            start = 0
+            for texts, future in batch:
+                end = start + len(texts)
+                future.set_result(results[start:end])
+                start = end
@@ -0,0 +1,134 @@
+# src/inference/profiler.py
+"""
+Perfilador por muestreo de peticiones lentas, activable en caliente.
+
+Mientras está activo, un hilo de fondo toma cada `interval_ms` la pila de los
+hilos que están atendiendo una petición muestreada (`sys._current_frames()`).
+No instrumenta cada llamada como cProfile, así que el coste sobre la
+petición es casi nulo. Si la petición acaba tardando más de `slow_ms`, sus
+pilas se guardan en formato "collapsed" (una línea `f1;f2;f3 N` por pila),
+que se puede abrir con flamegraph.pl o speedscope.
+"""
+
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter, deque
+
+DEFAULT_SLOW_MS = float(os.environ.get('PROFILER_SLOW_MS', '200'))
+DEFAULT_INTERVAL_MS = float(os.environ.get('PROFILER_INTERVAL_MS', '5'))
+DEFAULT_SAMPLE_RATE = float(os.environ.get('PROFILER_SAMPLE_RATE', '1.0'))
+# Perfiles lentos que se conservan en memoria
+MAX_PROFILES = 20
+
+
+def _collapse(frame):
+    stack = []
+    while frame is not None:
+        code = frame.f_code
+        stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+        frame = frame.f_back
+    return ';'.join(reversed(stack))
+
+
+class SlowRequestProfiler:
+    """
+    Uso desde la app:
+        token = profiler.start_request('search_tweets')   # None si no se muestrea
+        ...
+        profiler.finish_request(token)
+    """
+
+    def __init__(self, enabled=False, slow_ms=DEFAULT_SLOW_MS, interval_ms=DEFAULT_INTERVAL_MS,
+                 sample_rate=DEFAULT_SAMPLE_RATE, output_dir=None):
+        self.slow_ms = slow_ms
+        self.interval_ms = interval_ms
+        self.sample_rate = sample_rate
+        self.output_dir = output_dir
+        self.profiles = deque(maxlen=MAX_PROFILES)
+        self._active = {}   # id del hilo -> Counter de pilas
+        self._lock = threading.Lock()
+        self._sampler = None
+        self._sampler_pid = None
+        self.enabled = False
+        if enabled:
+            self.enable()
+
+    def enable(self, slow_ms=None, interval_ms=None, sample_rate=None):
+        if slow_ms is not None:
+            self.slow_ms = float(slow_ms)
+        if interval_ms is not None:
+            self.interval_ms = float(interval_ms)
+        if sample_rate is not None:
+            self.sample_rate = float(sample_rate)
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def config(self):
+        return {
+            'enabled': self.enabled,
+            'slow_ms': self.slow_ms,
+            'interval_ms': self.interval_ms,
+            'sample_rate': self.sample_rate,
+            'perfiles_guardados': len(self.profiles),
+        }
+
+    def _ensure_sampler(self):
+        # Como en MicroBatcher: hilo perezoso, recreado tras un fork
+        if self._sampler is not None and self._sampler_pid == os.getpid() and self._sampler.is_alive():
+            return
+        self._sampler = threading.Thread(target=self._run, name='slow-request-profiler', daemon=True)
+        self._sampler_pid = os.getpid()
+        self._sampler.start()
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval_ms / 1000.0)
+            with self._lock:
+                if not self._active:
+                    continue
+                frames = sys._current_frames()
+                for thread_id, stacks in self._active.items():
+                    frame = frames.get(thread_id)
+                    if frame is not None:
+                        stacks[_collapse(frame)] += 1
+
+    def start_request(self, name):
+        """Empieza a muestrear el hilo actual. Devuelve un token (o None si no toca)."""
+        if not self.enabled or random.random() >= self.sample_rate:
+            return None
+        thread_id = threading.get_ident()
+        with self._lock:
+            self._active[thread_id] = Counter()
+            self._ensure_sampler()
+        return (name, thread_id, time.perf_counter())
+
+    def finish_request(self, token):
+        """Deja de muestrear; si la petición fue lenta, guarda su perfil."""
+        if token is None:
+            return None
+        name, thread_id, start = token
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        with self._lock:
+            stacks = self._active.pop(thread_id, Counter())
+        if elapsed_ms < self.slow_ms or not stacks:
+            return None
+
+        profile = {
+            'peticion': name,
+            'duracion_ms': round(elapsed_ms, 2),
+            'fecha': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'muestras': sum(stacks.values()),
+            'collapsed': '\n'.join(f'{stack} {count}' for stack, count in stacks.most_common()),
+        }
+        self.profiles.append(profile)
+        if self.output_dir:
+            os.makedirs(self.output_dir, exist_ok=True)
+            filename = f"{time.strftime('%Y%m%d-%H%M%S')}-{name}-{int(elapsed_ms)}ms.collapsed"
+            with open(os.path.join(self.output_dir, filename), 'w', encoding='utf-8') as f:
+                f.write(profile['collapsed'] + '\n')
+        return profile
@@ -0,0 +1,94 @@
+# src/inference/search_index.py
+
+import re
+import unicodedata
+from array import array
+from collections import defaultdict
+
+_WORD_RE = re.compile(r'\w+')
+
+
+def normalize_for_search(text):
+    """Pasa a minúsculas y elimina tildes/diacríticos ('Vergüenza' -> 'verguenza')."""
+    if not isinstance(text, str):
+        return ""
+    if text.isascii():
+        return text.lower()
+    decomposed = unicodedata.normalize('NFKD', text.casefold())
+    return ''.join(ch for ch in decomposed if not unicodedata.combining(ch))
+
+
+def _trigrams(word):
+    return {word[i:i + 3] for i in range(len(word) - 2)}
+
+
+class InvertedIndex:
+    """
+    Índice invertido de trigramas sobre el texto limpio del corpus.
+
+    Cada trigrama de cada palabra apunta a la lista ordenada de filas que lo
+    contienen. Una consulta intersecta las listas de todos los trigramas de
+    todas sus palabras (empezando por la más corta) y solo verifica la
+    subcadena exacta contra esas filas candidatas, en lugar de recorrer todo
+    el corpus. La búsqueda no distingue mayúsculas ni tildes.
+    """
+
+    def __init__(self, texts):
+        self._texts = [normalize_for_search(t) for t in texts]
+        postings = defaultdict(list)
+        findall = _WORD_RE.findall
+        for row_id, text in enumerate(self._texts):
+            grams = {word[i:i + 3] for word in findall(text) for i in range(len(word) - 2)}
+            for gram in grams:
+                postings[gram].append(row_id)
+        # array('I') ocupa 4 bytes por entrada frente a ~28 de un int de Python
+        self._postings = {gram: array('I', rows) for gram, rows in postings.items()}
+
+    def __len__(self):
+        return len(self._texts)
+
+    def _candidates(self, words):
+        """Intersección de las listas de trigramas; None si no hay trigramas que usar."""
+        grams = set()
+        for word in words:
+            grams |= _trigrams(word)
+        if not grams:
+            return None
+
+        lists = []
+        for gram in grams:
+            rows = self._postings.get(gram)
+            if rows is None:
+                return []
+            lists.append(rows)
+        lists.sort(key=len)
+
+        candidates = set(lists[0])
+        for rows in lists[1:]:
+            candidates.intersection_update(rows)
+            if not candidates:
+                return []
+        return sorted(candidates)
+
+    def search(self, query):
+        """Devuelve los índices de fila (ordenados) cuyo texto contiene `query`."""
+        needle = normalize_for_search(query).strip()
+        if not needle:
+            return []
+
+        candidates = self._candidates(_WORD_RE.findall(needle))
+        if candidates is None:
+            # Consulta de menos de 3 caracteres por palabra: no hay trigramas,
+            # se verifica sobre todo el corpus.
+            candidates = range(len(self._texts))
+
+        texts = self._texts
+        return [row_id for row_id in candidates if needle in texts[row_id]]
+
+
+def paginate(items, page, per_page):
+    """Devuelve (elementos de la página, página efectiva, número total de páginas)."""
+    total_pages = max(1, (len(items) + per_page - 1) // per_page)
+    page = min(max(1, page), total_pages)
+    start = (page - 1) * per_page
+    return items[start:start + per_page], page, total_pages
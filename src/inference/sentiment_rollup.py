@@ -0,0 +1,315 @@
+# src/inference/sentiment_rollup.py
+"""
+Agregados de sentimiento por intervalo de tiempo, mantenidos de forma incremental.
+
+Por cada (consulta, granularidad, intervalo, dimensión, etiqueta) se guardan
+el número de tuits y la suma de la confianza, en SQLite (data/cache/
+sentimiento_rollup.db, modo WAL: la app con varios workers y el predictor por
+lotes escriben a la vez). Cada clasificación nueva suma su aportación con un
+upsert; nada se recalcula:
+  - granularidades: 'hora' y 'dia' (intervalos UTC alineados);
+  - dimensiones: 'tono' e 'intencion';
+  - consulta: la búsqueda del colector que trajo el tuit ('' si no se sabe) y
+    además '*', el total de todas.
+
+Los tuits con id_tuit (predicción por lotes) se registran en `clasificados`:
+si un tuit se vuelve a clasificar (p. ej. con otro modelo), se resta su
+aportación anterior y se suma la nueva, así que repetir una ejecución no
+cuenta dos veces. Las predicciones de la app (sin id) se acumulan en memoria
+como tuplas (sin pandas en el camino de cada petición) y un hilo propio de
+cada proceso las vuelca en bloque cada `flush_interval` segundos, lleguen o
+no más peticiones.
+
+Una serie temporal lee solo las filas de los intervalos pedidos (clave
+primaria), así que el coste es constante por intervalo sea cual sea el
+volumen de tuits.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.inference.corpus_store import is_date_only
+
+BASE_DIR = os.path.join(os.path.dirname(__file__), '..', '..')
+DEFAULT_PATH = os.path.join(BASE_DIR, 'data', 'cache', 'sentimiento_rollup.db')
+GRANULARITIES = {'hora': 3600, 'dia': 86400}
+DIMENSIONS = ('tono', 'intencion')
+ALL_QUERIES = '*'
+# Máximo de intervalos por serie (p. ej. 10 000 horas = 416 días)
+MAX_BUCKETS = 10_000
+_ID_BATCH = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS agregados (
+    consulta TEXT NOT NULL,
+    granularidad TEXT NOT NULL,
+    intervalo INTEGER NOT NULL,
+    dimension TEXT NOT NULL,
+    etiqueta TEXT NOT NULL,
+    n INTEGER NOT NULL,
+    suma_confianza REAL NOT NULL,
+    PRIMARY KEY (consulta, granularidad, intervalo, dimension, etiqueta)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS clasificados (
+    id_tuit TEXT PRIMARY KEY,
+    consulta TEXT NOT NULL,
+    instante INTEGER NOT NULL,
+    tono TEXT NOT NULL,
+    confianza_tono REAL NOT NULL,
+    intencion TEXT NOT NULL,
+    confianza_intencion REAL NOT NULL
+) WITHOUT ROWID;
+"""
+
+_UPSERT = """
+INSERT INTO agregados (consulta, granularidad, intervalo, dimension, etiqueta, n, suma_confianza)
+VALUES (?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (consulta, granularidad, intervalo, dimension, etiqueta) DO UPDATE SET
+    n = n + excluded.n,
+    suma_confianza = suma_confianza + excluded.suma_confianza
+"""
+
+_COLUMNS = ['consulta', 'instante', 'tono', 'confianza_tono', 'intencion', 'confianza_intencion']
+
+
+def to_epoch(dates):
+    """datetime64 / cadenas ISO / None -> segundos UTC (int64; NaT -> ahora)."""
+    dates = pd.to_datetime(pd.Series(dates, dtype=object), errors='coerce', utc=True)
+    seconds = dates.to_numpy(dtype='datetime64[s]', na_value=np.datetime64('NaT')).astype(np.int64)
+    return np.where(dates.isna().to_numpy(), int(time.time()), seconds)
+
+
+def _contributions(frame, sign=1):
+    """Filas de `agregados` (como deltas) que aporta un DataFrame de clasificaciones."""
+    parts = []
+    for granularity, size in GRANULARITIES.items():
+        bucket = frame['instante'].to_numpy(dtype=np.int64) // size * size
+        for dimension in DIMENSIONS:
+            labels = frame[dimension]
+            known = (labels != '').to_numpy()
+            if not known.any():
+                continue
+            part = pd.DataFrame({
+                'consulta': frame['consulta'].to_numpy()[known],
+                'intervalo': bucket[known],
+                'etiqueta': labels.to_numpy()[known],
+                'confianza': frame[f'confianza_{dimension}'].to_numpy(dtype=np.float64)[known],
+            })
+            # Cada tuit cuenta en su consulta y en el total '*'
+            part = pd.concat([part, part.assign(consulta=ALL_QUERIES)])
+            grouped = part.groupby(['consulta', 'intervalo', 'etiqueta'], sort=False)['confianza'].agg(['size', 'sum'])
+            grouped = grouped.reset_index()
+            grouped.insert(1, 'granularidad', granularity)
+            grouped.insert(3, 'dimension', dimension)
+            parts.append(grouped)
+    if not parts:
+        return pd.DataFrame(columns=['consulta', 'granularidad', 'intervalo', 'dimension', 'etiqueta', 'size', 'sum'])
+    deltas = pd.concat(parts, ignore_index=True)
+    deltas['size'] *= sign
+    deltas['sum'] *= sign
+    return deltas
+
+
+def _frame(tones, confidences, intents=None, intent_confidences=None, dates=None, queries=None):
+    n = len(tones)
+    return pd.DataFrame({
+        'consulta': [q if isinstance(q, str) else '' for q in queries] if queries is not None else [''] * n,
+        'instante': to_epoch(dates if dates is not None else [None] * n),
+        'tono': [t if isinstance(t, str) else '' for t in tones],
+        'confianza_tono': np.nan_to_num(np.asarray(confidences, dtype=np.float64)),
+        'intencion': [t if isinstance(t, str) else '' for t in intents] if intents is not None else [''] * n,
+        'confianza_intencion': (np.nan_to_num(np.asarray(intent_confidences, dtype=np.float64))
+                                if intent_confidences is not None else np.zeros(n)),
+    }, columns=_COLUMNS)
+
+
+def _confidence(value):
+    return 0.0 if value is None or value != value else float(value)
+
+
+def _rows(tones, confidences, intents=None, intent_confidences=None, dates=None, queries=None):
+    """Las filas de `_frame` como tuplas de Python: para los lotes pequeños de la app."""
+    n = len(tones)
+    instants = to_epoch(dates).tolist() if dates is not None else [int(time.time())] * n
+    return [(query if isinstance(query, str) else '', instant, tone if isinstance(tone, str) else '',
+             _confidence(confidence), intent if isinstance(intent, str) else '', _confidence(intent_confidence))
+            for query, instant, tone, confidence, intent, intent_confidence in zip(
+                queries if queries is not None else [''] * n, instants, tones, confidences,
+                intents if intents is not None else [''] * n,
+                intent_confidences if intent_confidences is not None else [0.0] * n)]
+
+
+class SentimentRollup:
+    """
+    Uso:
+        rollup = SentimentRollup()
+        rollup.add(tonos, confianzas, intenciones, conf_intenciones, fechas, consultas, ids)
+        rollup.series('hora', desde='2025-12-01', hasta='2025-12-02', consulta='*')
+    """
+
+    def __init__(self, path=DEFAULT_PATH, flush_interval=1.0):
+        self.path = path
+        self.flush_interval = flush_interval
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._pending = []   # tuplas con las columnas de _COLUMNS
+        self._flusher = None
+        self._flusher_pid = None
+
+    # -- Conexión (una por hilo y proceso: los workers de serve.py hacen fork) --
+
+    def _connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.executescript(_SCHEMA)
+            self._local.conn, self._local.pid = conn, os.getpid()
+        return conn
+
+    # -- Escritura --
+
+    def add(self, tones, confidences, intents=None, intent_confidences=None, dates=None, queries=None, ids=None):
+        """
+        Suma un lote de clasificaciones. Sin `dates` se usa el instante actual.
+        Con `ids` se escribe en el momento (y se corrigen las que ya estaban);
+        sin ellos se acumula en memoria hasta el siguiente volcado periódico.
+        """
+        if not len(tones):
+            return
+        if ids is None:
+            rows = _rows(tones, confidences, intents, intent_confidences, dates, queries)
+            with self._lock:
+                self._pending.extend(rows)
+            if self.flush_interval > 0:
+                self._ensure_flusher()
+            else:
+                self.flush()
+            return
+
+        frame = _frame(tones, confidences, intents, intent_confidences, dates, queries)
+        frame['id_tuit'] = [str(i) for i in ids]
+        # Si el lote repite un id, cuenta la última clasificación
+        frame = frame.drop_duplicates('id_tuit', keep='last')
+        conn = self._connection()
+        with conn:
+            previous = self._previous(conn, frame['id_tuit'].tolist())
+            deltas = pd.concat([_contributions(frame), _contributions(previous, sign=-1)], ignore_index=True)
+            conn.executemany(
+                "INSERT OR REPLACE INTO clasificados (id_tuit, consulta, instante, tono, confianza_tono, intencion, "
+                "confianza_intencion) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                frame[['id_tuit'] + _COLUMNS].itertuples(index=False, name=None))
+            self._apply(conn, deltas)
+
+    def _previous(self, conn, ids):
+        rows = []
+        for start in range(0, len(ids), _ID_BATCH):
+            chunk = ids[start:start + _ID_BATCH]
+            rows.extend(conn.execute(
+                f"SELECT {', '.join(_COLUMNS)} FROM clasificados WHERE id_tuit IN ({', '.join('?' * len(chunk))})",
+                chunk).fetchall())
+        return pd.DataFrame(rows, columns=_COLUMNS)
+
+    @staticmethod
+    def _apply(conn, deltas):
+        if deltas.empty:
+            return
+        totals = deltas.groupby(['consulta', 'granularidad', 'intervalo', 'dimension', 'etiqueta'],
+                                sort=False)[['size', 'sum']].sum().reset_index()
+        totals = totals[totals['size'] != 0]
+        conn.executemany(_UPSERT, ((c, g, int(i), d, e, int(n), float(s))
+                                   for c, g, i, d, e, n, s in totals.itertuples(index=False, name=None)))
+
+    def flush(self):
+        """Vuelca las clasificaciones acumuladas en memoria."""
+        with self._lock:
+            pending, self._pending = self._pending, []
+        if not pending:
+            return
+        try:
+            conn = self._connection()
+            with conn:
+                self._apply(conn, _contributions(pd.DataFrame(pending, columns=_COLUMNS)))
+        except Exception:
+            # Se devuelven al búfer para el siguiente volcado
+            with self._lock:
+                self._pending[:0] = pending
+            raise
+
+    def _ensure_flusher(self):
+        # El hilo se arranca de forma perezosa y se vuelve a crear si el
+        # proceso ha hecho fork (como el de MicroBatcher).
+        if self._flusher is not None and self._flusher_pid == os.getpid() and self._flusher.is_alive():
+            return
+        with self._lock:
+            if self._flusher is not None and self._flusher_pid == os.getpid() and self._flusher.is_alive():
+                return
+            self._flusher = threading.Thread(target=self._flush_periodically, name='rollup-flush', daemon=True)
+            self._flusher_pid = os.getpid()
+            self._flusher.start()
+
+    def _flush_periodically(self):
+        while True:
+            time.sleep(self.flush_interval)
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"⚠️ No se pudieron volcar los agregados de sentimiento: {e}")
+
+    # -- Lectura --
+
+    def series(self, granularity='hora', desde=None, hasta=None, consulta=ALL_QUERIES, limit=48):
+        """
+        Serie temporal de `consulta` con un punto por intervalo entre `desde` y
+        `hasta` (fechas ISO, ambas incluidas: un `hasta` sin hora incluye todo
+        ese día, como en CorpusStore.filter; por defecto los `limit` últimos
+        intervalos hasta el más reciente con datos). Cada punto trae el total
+        y, por tono e intención, el número de tuits y la confianza media.
+        """
+        if granularity not in GRANULARITIES:
+            raise ValueError(f"Granularidad no válida: {granularity} (usa {', '.join(GRANULARITIES)})")
+        size = GRANULARITIES[granularity]
+        self.flush()
+        conn = self._connection()
+        if hasta:
+            end = int(to_epoch([pd.Timestamp(hasta)])[0])
+            if is_date_only(hasta):
+                end += GRANULARITIES['dia'] - 1
+            end = end // size * size
+        else:
+            latest = conn.execute("SELECT MAX(intervalo) FROM agregados WHERE consulta = ? AND granularidad = ?",
+                                  (consulta, granularity)).fetchone()[0]
+            end = latest if latest is not None else int(time.time()) // size * size
+        start = int(to_epoch([pd.Timestamp(desde)])[0]) // size * size if desde else end - (limit - 1) * size
+        if end < start:
+            raise ValueError("'desde' es posterior a 'hasta'.")
+        if (end - start) // size + 1 > MAX_BUCKETS:
+            raise ValueError(f"Demasiados intervalos: el máximo es {MAX_BUCKETS}.")
+
+        points = {bucket: {'intervalo': pd.Timestamp(bucket, unit='s').isoformat(), 'total': 0,
+                           'tono': {}, 'intencion': {}}
+                  for bucket in range(start, end + 1, size)}
+        rows = conn.execute(
+            "SELECT intervalo, dimension, etiqueta, n, suma_confianza FROM agregados "
+            "WHERE consulta = ? AND granularidad = ? AND intervalo BETWEEN ? AND ? AND n > 0",
+            (consulta, granularity, start, end))
+        for bucket, dimension, label, n, total_confidence in rows:
+            point = points[bucket]
+            point[dimension][label] = {'n': n, 'confianza_media': round(total_confidence / n, 4)}
+            if dimension == 'tono':
+                point['total'] += n
+        return list(points.values())
+
+    def queries(self):
+        """Consultas con datos (sin el total '*')."""
+        self.flush()
+        rows = self._connection().execute("SELECT DISTINCT consulta FROM agregados WHERE consulta <> ?",
+                                          (ALL_QUERIES,))
+        return sorted(row[0] for row in rows)
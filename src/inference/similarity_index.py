@@ -0,0 +1,140 @@
+# src/inference/similarity_index.py
+"""
+Búsqueda de tuits similares (vecinos más cercanos por coseno) en el espacio
+TF-IDF del vectorizador entrenado.
+
+El corpus se guarda como una matriz dispersa CSR (documentos x términos) con
+las filas normalizadas L2, así que el coseno con una consulta (también
+normalizada) es un producto matriz-vector disperso:
+  - Exacta: el producto se hace por bloques de filas y de cada bloque solo se
+    conserva su top-k (np.argpartition), sin materializar ni ordenar todas
+    las puntuaciones a la vez.
+  - Con poda (por defecto): la matriz traspuesta (términos x documentos) es un
+    índice invertido con pesos. Los candidatos son los documentos que
+    comparten alguno de los términos más pesados de la consulta, saltando los
+    términos demasiado frecuentes (su idf es bajo y sus listas, enormes).
+    Los candidatos se puntúan después con la consulta completa, así que la
+    poda solo puede dejar fuera documentos, nunca cambia sus puntuaciones.
+"""
+
+import numpy as np
+import scipy.sparse as sp
+
+DEFAULT_K = 10
+# Filas por bloque en la búsqueda exacta
+DEFAULT_BLOCK_SIZE = 65_536
+# Poda: términos de la consulta que se usan para generar candidatos y
+# fracción máxima del corpus que puede tener un término para usarse (las
+# listas de hasta MIN_POSTINGS documentos se usan siempre: en un corpus
+# pequeño no se poda nada)
+DEFAULT_MAX_TERMS = 6
+DEFAULT_MAX_DF = 0.02
+MIN_POSTINGS = 5_000
+
+
+def l2_normalize(X):
+    """Copia CSR float32 de X con las filas de norma 1 (las filas vacías quedan a 0)."""
+    X = sp.csr_matrix(X, dtype=np.float32, copy=True)
+    norms = np.sqrt(np.bincount(np.repeat(np.arange(X.shape[0]), np.diff(X.indptr)),
+                                weights=X.data.astype(np.float64) ** 2, minlength=X.shape[0]))
+    norms[norms == 0] = 1.0
+    X.data /= np.repeat(norms, np.diff(X.indptr)).astype(np.float32)
+    return X
+
+
+def _top_k(scores, k):
+    """(posiciones, puntuaciones) de las k mayores, de mayor a menor."""
+    if len(scores) > k:
+        top = np.argpartition(-scores, k - 1)[:k]
+    else:
+        top = np.arange(len(scores))
+    order = np.argsort(-scores[top], kind='stable')
+    return top[order], scores[top][order]
+
+
+class SimilarityIndex:
+    """
+    Índice de similitud sobre la matriz TF-IDF del corpus. Uso:
+        index = SimilarityIndex(vectorizer.transform(textos_limpios))
+        ids, scores = index.search(vectorizer.transform([consulta]), k=10)
+    """
+
+    def __init__(self, matrix, block_size=DEFAULT_BLOCK_SIZE):
+        self.matrix = l2_normalize(matrix)
+        # Traspuesta en CSR = índice invertido: término -> documentos y pesos
+        self.postings = self.matrix.T.tocsr()
+        self.document_frequency = np.diff(self.postings.indptr)
+        self.block_size = block_size
+
+    def __len__(self):
+        return self.matrix.shape[0]
+
+    @property
+    def n_features(self):
+        return self.matrix.shape[1]
+
+    def nbytes(self):
+        return sum(m.data.nbytes + m.indices.nbytes + m.indptr.nbytes for m in (self.matrix, self.postings))
+
+    def _query_vector(self, query):
+        """Consulta (1 x términos, dispersa o densa) -> (índices de término, pesos normalizados)."""
+        q = l2_normalize(sp.csr_matrix(query).reshape(1, -1))
+        if q.shape[1] != self.n_features:
+            raise ValueError(f"La consulta tiene {q.shape[1]} términos y el índice {self.n_features}: "
+                             "¿se vectorizó con otro modelo?")
+        return q.indices, q.data
+
+    def _dense(self, terms, weights):
+        q = np.zeros(self.n_features, dtype=np.float32)
+        q[terms] = weights
+        return q
+
+    def search_exact(self, query, k=DEFAULT_K):
+        """Top-k exacto: producto matriz-vector por bloques de filas."""
+        terms, weights = self._query_vector(query)
+        if not len(terms) or not len(self):
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+        q = self._dense(terms, weights)
+        best_ids, best_scores = [], []
+        for start in range(0, len(self), self.block_size):
+            scores = self.matrix[start:start + self.block_size] @ q
+            top, top_scores = _top_k(scores, k)
+            keep = top_scores > 0
+            best_ids.append(top[keep] + start)
+            best_scores.append(top_scores[keep])
+        ids, scores = np.concatenate(best_ids), np.concatenate(best_scores)
+        top, top_scores = _top_k(scores, k)
+        return ids[top], top_scores
+
+    def candidates(self, terms, weights, max_terms=DEFAULT_MAX_TERMS, max_df=DEFAULT_MAX_DF):
+        """Documentos que comparten alguno de los términos más pesados (y no demasiado frecuentes) de la consulta."""
+        df = self.document_frequency[terms]
+        usable = df <= max(MIN_POSTINGS, max_df * len(self))
+        if not usable.any():
+            # Todos los términos son muy frecuentes: se usa solo el más raro
+            usable = df == df.min()
+        terms, weights = terms[usable], weights[usable]
+        selected = terms[np.argsort(-weights, kind='stable')[:max_terms]]
+        postings = self.postings
+        # Unión de las listas con una máscara (más barata que np.unique con muchos candidatos)
+        mask = np.zeros(len(self), dtype=bool)
+        for t in selected:
+            mask[postings.indices[postings.indptr[t]:postings.indptr[t + 1]]] = True
+        return np.flatnonzero(mask)
+
+    def search(self, query, k=DEFAULT_K, prune=True, max_terms=DEFAULT_MAX_TERMS, max_df=DEFAULT_MAX_DF):
+        """
+        (ids de fila, similitud coseno) de los k documentos más parecidos a
+        `query` (vector TF-IDF 1 x términos), de mayor a menor.
+        """
+        if not prune:
+            return self.search_exact(query, k)
+        terms, weights = self._query_vector(query)
+        if not len(terms) or not len(self):
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+        candidate_ids = self.candidates(terms, weights, max_terms, max_df)
+        # Puntuación exacta (consulta completa) solo de los candidatos
+        scores = self.matrix[candidate_ids] @ self._dense(terms, weights)
+        top, top_scores = _top_k(scores, k)
+        keep = top_scores > 0
+        return candidate_ids[top[keep]].astype(np.int64), top_scores[keep]
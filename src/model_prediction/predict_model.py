@@ -1,51 +1,133 @@
+import numpy as np
 import pandas as pd
 import pickle
-import re
 import os
+import sys
+import time
+import argparse
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+
+# Raíz del proyecto en sys.path para importar los módulos compartidos de 'src'
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from src.data_pipeline.deduplicator import deduplicate
+from src.data_pipeline.text_cleaning import batch_jobs, clean_batch
+from src.inference.corpus_store import tweet_dates
+from src.inference.model_registry import RegistryError, load_version, resolve_paths
+from src.inference.sentiment_rollup import SentimentRollup
+from src.data_pipeline.storage import Database
 
 # --- Rutas de Archivos ---
 # Las rutas deben coincidir con las usadas en el entrenamiento y los datos nuevos
 BASE_DIR = os.path.join(os.path.dirname(__file__), '..', '..')
 RAW_DATA_PATH = os.path.join(BASE_DIR, 'data', 'raw', 'nuevos_tweets.csv') # Archivo de entrada de tuits nuevos
-MODEL_PATH = os.path.join(BASE_DIR, 'models', 'model_clasificador_v1.pkl')
-VECTORIZER_PATH = os.path.join(BASE_DIR, 'models', 'vectorizer_v1.pkl')
+# Versión del registro (models/manifest.json) con la que se clasifica; None = la activa
+MODEL_VERSION = None
+MODEL_PATH, VECTORIZER_PATH = resolve_paths()
+# Con --model/--vectorizer (y --intent-model) se usan esos .pkl en lugar del registro
+CUSTOM_ARTIFACTS = None
+# Usar el formato compacto si la versión lo tiene (sin sklearn ni pickle)
+PREFER_COMPACT = True
+# Agrupar también los casi duplicados (MinHash/LSH), no solo los idénticos tras normalizar
+NEAR_DUPLICATES = False
 OUTPUT_PATH = os.path.join(BASE_DIR, 'data', 'predictions', 'tweets_clasificados.csv')
+# Agregados por hora/día que consulta /api/tendencias (None = no se actualizan;
+# SENTIMENT_ROLLUP_PATH, como en la app, apunta a otros)
+ROLLUP_PATH = os.environ.get('SENTIMENT_ROLLUP_PATH', os.path.join(BASE_DIR, 'data', 'cache', 'sentimiento_rollup.db'))
 # -------------------------
 
-def clean_text(text):
+OUTPUT_COLUMNS = ['id_tuit', 'texto_original', 'texto_procesado', 'etiqueta_tono', 'confianza_tono', 'etiqueta_intencion',
+                  'confianza_intencion', 'id_cluster']
+# Columnas de la entrada que acompañan al resultado (para los agregados), pero no van al CSV
+PASSTHROUGH_COLUMNS = ['fecha', 'consulta']
+DEFAULT_CHUNKSIZE = 50_000
+
+
+def load_artifacts(version=None, custom_paths=None, prefer_compact=True):
+    """
+    Carga el modelo, el vectorizador y el cabezal de intención (None si la
+    versión no lo tiene) de una versión del registro (por defecto la activa),
+    comprobando sus checksums. Si la versión tiene formato compacto, se usa
+    ese. `custom_paths` = (modelo, vectorizador, intención o None) carga esos
+    .pkl directamente.
+    """
+    if custom_paths is not None:
+        model_path, vectorizer_path, intent_path = custom_paths
+        with open(model_path, 'rb') as f:
+            model = pickle.load(f)
+        with open(vectorizer_path, 'rb') as f:
+            vectorizer = pickle.load(f)
+        intent_model = None
+        if intent_path:
+            with open(intent_path, 'rb') as f:
+                intent_model = pickle.load(f)
+        return model, vectorizer, intent_model
+    loaded = load_version(version, prefer_compact=prefer_compact)
+    return loaded.model, loaded.vectorizer, loaded.intent_model
+
+
+def classify_chunk(df, model, vectorizer, intent_model=None, near_duplicates=False, n_jobs=1):
+    """
+    Limpia, vectoriza y clasifica un DataFrame con la columna 'texto_original'.
+    Tono e intención se predicen sobre la misma matriz TF-IDF (un solo transform).
+
+    Los retuits y textos idénticos tras normalizar forman un clúster; con
+    `near_duplicates=True` también las copias truncadas y casi duplicados
+    (MinHash/LSH). Buscarlos cuesta más que predecir con el modelo lineal
+    (benchmarks/bench_dedup.py), así que solo compensa si se quiere que
+    todo el clúster comparta etiqueta. `n_jobs` son los procesos de limpieza.
+    """
+    df = df.copy()
+    df['texto_procesado'] = clean_batch(df['texto_original'], n_jobs=n_jobs)
+
+    # Se vectorizan y predicen solo los representantes y se reparten a cada fila
+    dedup = deduplicate(df['texto_procesado'], already_clean=True, near=near_duplicates)
+    X_new = vectorizer.transform(df['texto_procesado'].iloc[dedup.representatives])
+
+    # La clase más probable es la predicción; su probabilidad, la confianza
+    probabilities = model.predict_proba(X_new)
+    best = probabilities.argmax(axis=1)
+    df['etiqueta_tono'] = dedup.expand(model.classes_[best])
+    df['confianza_tono'] = dedup.expand(probabilities.max(axis=1).round(4))
+    # Sin cabezal de intención (versiones antiguas) las columnas quedan vacías
+    if intent_model is not None:
+        intent_probabilities = intent_model.predict_proba(X_new)
+        intent_classes = np.asarray(intent_model.classes_)
+        df['etiqueta_intencion'] = dedup.expand(intent_classes[intent_probabilities.argmax(axis=1)])
+        df['confianza_intencion'] = dedup.expand(intent_probabilities.max(axis=1).round(4))
+    else:
+        df['etiqueta_intencion'] = ''
+        df['confianza_intencion'] = np.nan
+    # Clúster = id_tuit de su representante
+    df['id_cluster'] = dedup.expand(df['id_tuit'].astype(str).to_numpy()[dedup.representatives])
+    return df[OUTPUT_COLUMNS + [c for c in PASSTHROUGH_COLUMNS if c in df]]
+
+
+def update_rollup(rollup, result_df):
+    """Suma un bloque clasificado a los agregados por hora/día (un tuit ya contado se corrige, no se duplica)."""
+    rollup.add(result_df['etiqueta_tono'], result_df['confianza_tono'],
+               result_df['etiqueta_intencion'], result_df['confianza_intencion'],
+               dates=tweet_dates(result_df), queries=result_df.get('consulta'), ids=result_df['id_tuit'])
+
+def predict_new_data(db_url=None, parallel_clean=False):
     """
-    Función de preprocesamiento de texto.
-    DEBE SER IDÉNTICA a la utilizada en el script de entrenamiento/preprocesamiento.
+    Carga el modelo y el vectorizador para clasificar tuits nuevos.
+    Con `db_url` las predicciones (y su confianza) se guardan también en resultados_ia.
+    Con `parallel_clean=True` (desde la línea de comandos) un lote muy grande
+    se limpia en varios procesos.
     """
-    if not isinstance(text, str):
-        return ""
-    # 1. Eliminar RTs (adaptado para tu preprocesamiento)
-    text = re.sub(r'^RT @\w+:\s?', 'RT : ', text)
-    # 2. Eliminar menciones (@usuario)
-    text = re.sub(r'@\w+', '', text)
-    # 3. Eliminar URLs (http:// o https://)
-    text = re.sub(r'https?://\S+|www\.\S+', '', text)
-    # 4. Eliminar el texto de la URL de twitter (t.co)
-    text = re.sub(r't\.co/\w+', '', text)
-    # 5. Eliminar saltos de línea y espacios extra
-    text = re.sub(r'\s+', ' ', text).strip()
-    return text
-
-def predict_new_data():
-    """Carga el modelo y el vectorizador para clasificar tuits nuevos."""
     print("Iniciando la predicción de nuevos tuits...")
 
     # 1. Cargar el modelo y el vectorizador
     try:
-        with open(MODEL_PATH, 'rb') as f:
-            model = pickle.load(f)
-        with open(VECTORIZER_PATH, 'rb') as f:
-            vectorizer = pickle.load(f)
+        model, vectorizer, intent_model = load_artifacts(MODEL_VERSION, CUSTOM_ARTIFACTS, PREFER_COMPACT)
         print("Modelo y vectorizador cargados con éxito.")
-    except FileNotFoundError:
-        print("\n❌ ERROR: Faltan archivos clave.")
+        if intent_model is None:
+            print("⚠️ Esta versión no tiene cabezal de intención: 'etiqueta_intencion' quedará vacía.")
+    except (FileNotFoundError, RegistryError) as e:
+        print("\n❌ ERROR: Faltan archivos clave o no coinciden con el registro.")
         print(f"Asegúrate de ejecutar 'train_model.py' y que los archivos .pkl existan en la carpeta 'models'.")
-        print(f"Falta: {MODEL_PATH} y/o {VECTORIZER_PATH}")
+        print(f"Detalle: {e}")
         return
 
     # 2. Cargar los nuevos datos
@@ -58,31 +140,222 @@ def predict_new_data():
         print("Asegúrate de crear 'nuevos_tweets.csv' con tuits no etiquetados en 'data/raw'.")
         return
 
-    # 3. Preprocesar y Vectorizar el texto
-    df['texto_procesado'] = df['texto_original'].apply(clean_text)
-    
-    # Transformamos el texto nuevo usando el vectorizador entrenado
-    X_new = vectorizer.transform(df['texto_procesado'])
-    print("Datos preprocesados y transformados (vectorizados).")
-
-    # 4. Realizar la predicción
-    predictions = model.predict(X_new)
+    # 3. Preprocesar, vectorizar y predecir
+    # (limpieza compartida + transform del vectorizador entrenado + predict)
+    output_df = classify_chunk(df, model, vectorizer, intent_model, NEAR_DUPLICATES,
+                               n_jobs=batch_jobs(len(df)) if parallel_clean else 1)
+    n_clusters = output_df['id_cluster'].nunique()
+    print(f"Datos preprocesados, vectorizados y clasificados ({n_clusters} representantes para {len(output_df)} tuits).")
 
-    # 5. Guardar los resultados
-    df['etiqueta_tono'] = predictions
-    df['etiqueta_intencion'] = '' # La intención se deja vacía o se asigna por un modelo secundario
-    
+    # 4. Guardar los resultados
     # Asegurarse de que la carpeta de salida exista
     os.makedirs(os.path.dirname(OUTPUT_PATH), exist_ok=True)
-    
-    # Seleccionar las columnas en el orden deseado para la salida
-    output_df = df[['id_tuit', 'texto_original', 'texto_procesado', 'etiqueta_tono', 'etiqueta_intencion']]
-    output_df.to_csv(OUTPUT_PATH, index=False, encoding='utf-8')
+    output_df[OUTPUT_COLUMNS].to_csv(OUTPUT_PATH, index=False, encoding='utf-8')
+    if db_url:
+        save_predictions_to_db(output_df, db_url)
+    if ROLLUP_PATH:
+        update_rollup(SentimentRollup(ROLLUP_PATH), output_df)
 
     print(f"\n🎉 Predicciones completadas y guardadas en: {OUTPUT_PATH}")
     print("\nResumen de las clases de tono predichas:")
-    print(df['etiqueta_tono'].value_counts())
+    print(output_df['etiqueta_tono'].value_counts())
+    if intent_model is not None:
+        print("\nResumen de las intenciones predichas:")
+        print(output_df['etiqueta_intencion'].value_counts())
+
+
+def save_predictions_to_db(output_df, db_url, db=None):
+    """Upsert por lotes de las predicciones en resultados_ia (esquema de database/setup.sql)."""
+    owns_db = db is None
+    db = db or Database(db_url)
+    try:
+        if owns_db:
+            db.create_schema()
+        n = db.upsert_predictions(output_df.to_dict('records'))
+    finally:
+        if owns_db:
+            db.close()
+    return n
+
+
+# --- Modo streaming (fuera de memoria y multiproceso) ---
+
+# Cada proceso del pool carga el modelo UNA sola vez en estas variables
+_WORKER_MODEL = None
+_WORKER_VECTORIZER = None
+_WORKER_INTENT_MODEL = None
+
+
+def _init_worker(version, custom_paths, prefer_compact):
+    global _WORKER_MODEL, _WORKER_VECTORIZER, _WORKER_INTENT_MODEL
+    # verify=False: los checksums ya se comprobaron en el proceso principal
+    if custom_paths is None:
+        loaded = load_version(version, prefer_compact=prefer_compact, verify=False)
+        _WORKER_MODEL, _WORKER_VECTORIZER, _WORKER_INTENT_MODEL = loaded.model, loaded.vectorizer, loaded.intent_model
+    else:
+        _WORKER_MODEL, _WORKER_VECTORIZER, _WORKER_INTENT_MODEL = load_artifacts(version, custom_paths, prefer_compact)
+
+
+def _classify_in_worker(df, near_duplicates=False):
+    return classify_chunk(df, _WORKER_MODEL, _WORKER_VECTORIZER, _WORKER_INTENT_MODEL, near_duplicates)
+
+
+def _load_done_ids(output_path):
+    """Ids ya clasificados en una ejecución anterior (solo se lee la columna id_tuit)."""
+    if not os.path.exists(output_path) or os.path.getsize(output_path) == 0:
+        return set()
+    done = set()
+    for chunk in pd.read_csv(output_path, usecols=['id_tuit'], dtype={'id_tuit': str},
+                             chunksize=DEFAULT_CHUNKSIZE, encoding='utf-8'):
+        done.update(chunk['id_tuit'])
+    return done
+
+
+def predict_streaming(chunksize=DEFAULT_CHUNKSIZE, workers=None, resume=False,
+                      input_path=RAW_DATA_PATH, output_path=OUTPUT_PATH, db_url=None):
+    """
+    Clasifica el archivo de entrada por bloques de `chunksize` filas.
+
+    Los bloques se reparten entre un pool de procesos (cada uno carga el modelo
+    una vez) y se escriben en el CSV de salida en el mismo orden de entrada a
+    medida que terminan. Solo hay unos pocos bloques en memoria a la vez, así
+    que el consumo de memoria no depende del tamaño del archivo.
+    Los duplicados se agrupan dentro de cada bloque (id_cluster).
+    Con `resume=True` se saltan los id_tuit que ya están en el CSV de salida.
+    Con `db_url` cada bloque se guarda también en resultados_ia.
+    """
+    workers = workers or os.cpu_count() or 1
+    print(f"Iniciando la predicción en streaming (bloques de {chunksize}, {workers} procesos)...")
+
+    if not os.path.exists(input_path):
+        print(f"\n❌ ERROR: No se encontró el archivo de datos raw en: {input_path}")
+        return
+    try:
+        # Se valida (checksums incluidos) antes de lanzar el pool
+        load_artifacts(MODEL_VERSION, CUSTOM_ARTIFACTS, PREFER_COMPACT)
+    except (FileNotFoundError, RegistryError) as e:
+        print("\n❌ ERROR: Faltan archivos clave o no coinciden con el registro.")
+        print(f"Detalle: {e}")
+        return
+
+    done_ids = _load_done_ids(output_path) if resume else set()
+    if done_ids:
+        print(f"Reanudando: se omitirán {len(done_ids)} tuits ya clasificados en {output_path}")
+
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    write_header = not (resume and os.path.exists(output_path) and os.path.getsize(output_path) > 0)
+    mode = 'a' if resume else 'w'
+    # Al añadir a un CSV existente se respetan sus columnas (p. ej. uno anterior sin confianza_tono)
+    columns = OUTPUT_COLUMNS if write_header else list(pd.read_csv(output_path, nrows=0).columns)
+
+    db = None
+    if db_url:
+        db = Database(db_url)
+        db.create_schema()
+
+    def pending_chunks():
+        reader = pd.read_csv(input_path, chunksize=chunksize, dtype={'id_tuit': str}, encoding='utf-8')
+        for chunk in reader:
+            if done_ids:
+                chunk = chunk[~chunk['id_tuit'].isin(done_ids)]
+            if len(chunk):
+                yield chunk
+
+    label_counts = Counter()
+    n_rows = 0
+    start = time.perf_counter()
+
+    writer = ChunkWriter(columns, label_counts, db, SentimentRollup(ROLLUP_PATH) if ROLLUP_PATH else None)
+    with open(output_path, mode, encoding='utf-8', newline='') as out, \
+            ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                initargs=(MODEL_VERSION, CUSTOM_ARTIFACTS, PREFER_COMPACT)) as executor:
+        # Ventana acotada de bloques en vuelo: se conserva el orden y la memoria no crece
+        in_flight = deque()
+        for chunk in pending_chunks():
+            in_flight.append(executor.submit(_classify_in_worker, chunk, NEAR_DUPLICATES))
+            if len(in_flight) < workers * 2:
+                continue
+            n_rows += writer.write(in_flight.popleft().result(), out, write_header)
+            write_header = False
+            _report_progress(n_rows, start)
+
+        while in_flight:
+            n_rows += writer.write(in_flight.popleft().result(), out, write_header)
+            write_header = False
+            _report_progress(n_rows, start)
+
+    if db is not None:
+        db.close()
+
+    elapsed = time.perf_counter() - start
+    print(f"\n🎉 {n_rows} predicciones nuevas guardadas en: {output_path} ({elapsed:.1f} s)")
+    print("\nResumen de las clases de tono predichas:")
+    for label, count in label_counts.most_common():
+        print(f"{label}: {count}")
+
+
+class ChunkWriter:
+    """Escribe cada bloque clasificado en el CSV (y en la base de datos y los agregados, si hay)."""
+
+    def __init__(self, columns, label_counts, db=None, rollup=None):
+        self.columns = columns
+        self.label_counts = label_counts
+        self.db = db
+        self.rollup = rollup
+
+    def write(self, result_df, out, write_header):
+        result_df.reindex(columns=self.columns).to_csv(out, header=write_header, index=False)
+        out.flush()
+        if self.db is not None:
+            self.db.upsert_predictions(result_df.to_dict('records'))
+        if self.rollup is not None:
+            update_rollup(self.rollup, result_df)
+        self.label_counts.update(result_df['etiqueta_tono'])
+        return len(result_df)
+
+
+def _report_progress(n_rows, start):
+    elapsed = time.perf_counter() - start
+    print(f"-> {n_rows} tuits clasificados ({n_rows / max(elapsed, 1e-9):,.0f} tuits/s)")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Clasifica tuits nuevos con el modelo entrenado.")
+    parser.add_argument('--stream', action='store_true',
+                        help="Procesa la entrada por bloques y en paralelo (memoria constante).")
+    parser.add_argument('--chunksize', type=int, default=DEFAULT_CHUNKSIZE,
+                        help="Filas por bloque en modo streaming.")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="Procesos del pool (por defecto, uno por núcleo).")
+    parser.add_argument('--resume', action='store_true',
+                        help="Omite los id_tuit que ya están en el CSV de salida.")
+    parser.add_argument('--model-version', default=None,
+                        help="Versión del registro (models/manifest.json); por defecto, la activa.")
+    parser.add_argument('--model', default=None,
+                        help="Ruta a otro modelo .pkl (p. ej. models/model_clasificador_incremental.pkl).")
+    parser.add_argument('--vectorizer', default=None,
+                        help="Ruta al vectorizador .pkl que acompaña a --model.")
+    parser.add_argument('--intent-model', default=None,
+                        help="Ruta al clasificador de intención .pkl entrenado con ese vectorizador.")
+    parser.add_argument('--near-dup', action='store_true',
+                        help="Agrupa también copias truncadas y casi duplicados (MinHash/LSH) en id_cluster.")
+    parser.add_argument('--no-rollup', action='store_true',
+                        help="No actualiza los agregados por hora/día de /api/tendencias.")
+    parser.add_argument('--db', default=None,
+                        help="Guarda también las predicciones en resultados_ia (sqlite:///ruta.db o postgresql://...).")
+    return parser.parse_args()
 
 
 if __name__ == "__main__":
-    predict_new_data()
\ No newline at end of file
+    args = parse_args()
+    MODEL_VERSION = args.model_version
+    NEAR_DUPLICATES = args.near_dup
+    if args.no_rollup:
+        ROLLUP_PATH = None
+    if args.model or args.vectorizer or args.intent_model:
+        model_path, vectorizer_path = resolve_paths(MODEL_VERSION)
+        CUSTOM_ARTIFACTS = (args.model or model_path, args.vectorizer or vectorizer_path, args.intent_model)
+    if args.stream or args.resume:
+        predict_streaming(chunksize=args.chunksize, workers=args.workers, resume=args.resume, db_url=args.db)
+    else:
+        predict_new_data(db_url=args.db, parallel_clean=True)
\ No newline at end of file
@@ -1,51 +1,57 @@
 # src/model_testing/evaluate_model.py
 
-import pandas as pd
-import pickle
 from sklearn.metrics import classification_report, accuracy_score
-from sklearn.model_selection import train_test_split
-from sklearn.feature_extraction.text import TfidfVectorizer
+import argparse
 import os
+import sys
 
-# --- Rutas de Archivos (DEBEN COINCIDIR con train_model.py) ---
-BASE_DIR = os.path.join(os.path.dirname(__file__), '..', '..')
-INPUT_FILE = os.path.join(BASE_DIR, 'data', 'processed', 'corpus_etiquetado.csv')
-MODEL_PATH = os.path.join(BASE_DIR, 'models', 'model_clasificador_v1.pkl')
-VECTORIZER_PATH = os.path.join(BASE_DIR, 'models', 'vectorizer_v1.pkl')
+# Raíz del proyecto en sys.path para importar los módulos compartidos de 'src'
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from src.inference.model_registry import RegistryError, load_version, resolve_paths
+# Misma carga (limpieza y deduplicación) y misma división que el entrenamiento
+from src.model_training.train_model import load_labeled_data, split_data
 
-def evaluate_model():
+def evaluate_model(version=None):
     """
-    Carga el modelo y el vectorizador entrenados, y evalúa su rendimiento
-    en el conjunto de prueba (test set).
+    Carga el modelo y el vectorizador entrenados (la versión activa del
+    registro o `version`), y evalúa su rendimiento en el conjunto de prueba (test set).
+    Si la versión tiene cabezal de intención, se evalúa también sobre la misma
+    matriz de prueba.
     """
     print("Iniciando la evaluación del modelo...")
 
     # 1. Cargar el modelo y el vectorizador
     try:
-        with open(MODEL_PATH, 'rb') as f:
-            model = pickle.load(f)
-        with open(VECTORIZER_PATH, 'rb') as f:
-            vectorizer = pickle.load(f)
-        print("Modelo y vectorizador cargados con éxito.")
-    except FileNotFoundError:
+        model_path, vectorizer_path = resolve_paths(version)
+        # Los .pkl de sklearn (no el compacto): se evalúa el modelo tal cual se entrenó
+        loaded = load_version(version, prefer_compact=False)
+        model, vectorizer, intent_model = loaded.model, loaded.vectorizer, loaded.intent_model
+        print(f"Modelo y vectorizador cargados con éxito ({os.path.basename(model_path)}).")
+    except (FileNotFoundError, RegistryError):
         print("\n❌ ERROR: Asegúrate de que los archivos .pkl existan en la carpeta 'models'.")
         return
 
     # 2. Cargar y preparar datos (DEBE SER IDÉNTICO AL ENTRENAMIENTO)
-    df = pd.read_csv(INPUT_FILE)
-    df.dropna(subset=['etiqueta_tono', 'texto_procesado'], inplace=True)
-    X = df['texto_procesado']
-    y = df['etiqueta_tono']
+    X, y, intent = load_labeled_data(with_intent=True)
 
     # 3. Dividir el conjunto de datos (EL MISMO random_state y test_size)
     # Se debe replicar exactamente la división del entrenamiento
-    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.3, random_state=42, stratify=y)
+    X_train, X_test, y_train, y_test, intent_train, intent_test = split_data(X, y, intent)
     
     print(f"Evaluando con {len(X_test)} ejemplos de prueba.")
 
     # 4. Vectorización del conjunto de prueba
     X_test_vec = vectorizer.transform(X_test)
     
+    # 5-6. Predicción y Evaluación
+    report_metrics(model, intent_model, X_test_vec, y_test, intent_test)
+
+
+def report_metrics(model, intent_model, X_test_vec, y_test, intent_test):
+    """
+    Informe de tono (y de intención, si hay cabezal) sobre una matriz de
+    prueba ya vectorizada. Devuelve las precisiones: {'tono': ..., 'intencion': ... o None}.
+    """
     # 5. Predicción y Evaluación
     y_pred = model.predict(X_test_vec)
     
@@ -57,5 +63,22 @@ def evaluate_model():
     print("\n--- INFORME DE CLASIFICACIÓN (Métricas Clave por Clase) ---")
     print(classification_report(y_test, y_pred))
 
+    # 6. Intención: mismo X_test_vec, solo las filas con intención etiquetada
+    if intent_model is None:
+        print("\n(Esta versión no tiene cabezal de intención.)")
+        return {'tono': float(accuracy), 'intencion': None}
+    labeled = (intent_test != '').to_numpy()
+    intent_pred = intent_model.predict(X_test_vec[labeled])
+    intent_accuracy = accuracy_score(intent_test[labeled], intent_pred)
+    print("\n========================================================")
+    print(f"✅ Precisión del Cabezal de Intención en Test Set: {intent_accuracy:.2f}")
+    print("========================================================")
+    print(classification_report(intent_test[labeled], intent_pred, zero_division=0))
+    return {'tono': float(accuracy), 'intencion': float(intent_accuracy)}
+
 if __name__ == '__main__':
-    evaluate_model()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Evalúa el modelo sobre el conjunto de prueba.")
+    parser.add_argument('--model-version', default=None,
+                        help="Versión del registro (models/manifest.json); por defecto, la activa.")
+    args = parser.parse_args()
+    evaluate_model(args.model_version)
\ No newline at end of file
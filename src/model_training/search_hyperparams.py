@@ -0,0 +1,214 @@
+# src/model_training/search_hyperparams.py
+
+import hashlib
+import itertools
+import json
+import os
+import random
+import sys
+import time
+
+import numpy as np
+import scipy.sparse as sp
+from joblib import Parallel, delayed
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import f1_score
+from sklearn.model_selection import StratifiedKFold
+
+# Raíz del proyecto en sys.path para importar los módulos compartidos de 'src'
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from src.model_training.train_model import (TRAINING_CONFIG_PATH, load_labeled_data, save_training_config,
+                                            split_data, train_model)
+from src.data_pipeline.tweet_store import atomic_write_json
+
+# --- Rutas de Archivos ---
+BASE_DIR = os.path.join(os.path.dirname(__file__), '..', '..')
+FEATURE_CACHE_DIR = os.path.join(BASE_DIR, 'data', 'cache', 'features')
+REPORT_PATH = os.path.join(BASE_DIR, 'models', 'hyperparam_search.json')
+# -------------------------
+
+# Espacio de búsqueda. Cada configuración de vectorizador se vectoriza una sola
+# vez por fold (y queda en caché en disco); los clasificadores la reutilizan.
+VECTORIZER_GRID = {
+    'max_features': [500, 2000, 10000, None],
+    'ngram_range': [(1, 1), (1, 2), (1, 3)],
+    'sublinear_tf': [False, True],
+}
+CLASSIFIER_GRID = {
+    'C': [0.1, 0.3, 1.0, 3.0, 10.0],
+}
+N_FOLDS = 5
+
+
+def _expand(grid):
+    keys = list(grid)
+    return [dict(zip(keys, values)) for values in itertools.product(*(grid[k] for k in keys))]
+
+
+def _config_key(vectorizer_params, data_fingerprint, fold):
+    payload = json.dumps([vectorizer_params, data_fingerprint, fold], sort_keys=True, default=list)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:20]
+
+
+def _data_fingerprint(texts, labels, folds):
+    """Hash de los textos, etiquetas y folds: si cambia el corpus, la caché deja de valer."""
+    h = hashlib.sha256()
+    for text, label in zip(texts, labels):
+        h.update(text.encode('utf-8'))
+        h.update(b'\x00')
+        h.update(str(label).encode('utf-8'))
+        h.update(b'\x01')
+    for train_idx, _ in folds:
+        h.update(np.asarray(train_idx).tobytes())
+    return h.hexdigest()
+
+
+def featurize_fold(vectorizer_params, texts, train_idx, valid_idx, key, cache_dir=FEATURE_CACHE_DIR):
+    """
+    Ajusta el vectorizador en el fold de entrenamiento y transforma ambos lados.
+    Las matrices se guardan en disco (npz disperso) con una clave que depende de
+    la configuración y de los datos, y se reutilizan en ejecuciones siguientes.
+    Devuelve los segundos por documento de transform (coste de inferencia).
+    """
+    meta_path = os.path.join(cache_dir, f'{key}.json')
+    if os.path.exists(meta_path):
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            return json.load(f)['transform_seconds_per_doc']
+
+    vectorizer = TfidfVectorizer(**vectorizer_params)
+    X_train = vectorizer.fit_transform([texts[i] for i in train_idx])
+    valid_texts = [texts[i] for i in valid_idx]
+    start = time.perf_counter()
+    X_valid = vectorizer.transform(valid_texts)
+    per_doc = (time.perf_counter() - start) / max(1, len(valid_texts))
+
+    os.makedirs(cache_dir, exist_ok=True)
+    sp.save_npz(os.path.join(cache_dir, f'{key}-train.npz'), X_train.tocsr())
+    sp.save_npz(os.path.join(cache_dir, f'{key}-valid.npz'), X_valid.tocsr())
+    # El .json se escribe al final: marca la entrada de caché como completa
+    atomic_write_json(meta_path, {'vectorizer_params': vectorizer_params, 'transform_seconds_per_doc': per_doc})
+    return per_doc
+
+
+def evaluate_classifier(classifier_params, keys, folds, labels, classes, cache_dir=FEATURE_CACHE_DIR):
+    """Validación cruzada de una configuración de clasificador sobre matrices en caché."""
+    f1_per_class, fit_times, predict_times = [], [], []
+    for key, (train_idx, valid_idx) in zip(keys, folds):
+        X_train = sp.load_npz(os.path.join(cache_dir, f'{key}-train.npz'))
+        X_valid = sp.load_npz(os.path.join(cache_dir, f'{key}-valid.npz'))
+        model = LogisticRegression(class_weight='balanced', max_iter=1000, random_state=42, **classifier_params)
+
+        start = time.perf_counter()
+        model.fit(X_train, labels[train_idx])
+        fit_times.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        y_pred = model.predict(X_valid)
+        predict_times.append((time.perf_counter() - start) / max(1, len(valid_idx)))
+
+        f1_per_class.append(f1_score(labels[valid_idx], y_pred, labels=classes, average=None, zero_division=0))
+
+    f1_per_class = np.mean(f1_per_class, axis=0)
+    return {
+        'f1_por_clase': {str(c): round(float(f), 4) for c, f in zip(classes, f1_per_class)},
+        'f1_macro': round(float(f1_per_class.mean()), 4),
+        'fit_segundos': round(float(np.mean(fit_times)), 4),
+        'predict_segundos_por_doc': float(np.mean(predict_times)),
+    }
+
+
+def search_hyperparams(n_iter=None, n_jobs=-1, promote=True, seed=42, activate=False):
+    """
+    Evalúa combinaciones de vectorizador y clasificador con validación cruzada
+    en todos los núcleos y promueve la mejor (por F1 macro): la guarda como
+    configuración de entrenamiento (la usan después train_model.py y el
+    pipeline) y la entrena como una versión nueva del registro, candidata en
+    sombra salvo con `activate`.
+    """
+    print("Iniciando la búsqueda de hiperparámetros...")
+    X, y = load_labeled_data()
+    # Solo se busca sobre la parte de entrenamiento: el test queda intacto
+    X_train, _, y_train, _ = split_data(X, y)
+    texts = list(X_train)
+    labels = np.asarray(y_train)
+
+    # La validación estratificada necesita al menos 2 ejemplos de cada tono
+    classes, counts = np.unique(labels, return_counts=True)
+    scarce = classes[counts < 2]
+    if len(scarce):
+        print(f"⚠️ Tonos con menos de 2 ejemplos de entrenamiento, fuera de la búsqueda: {', '.join(map(str, scarce))}")
+        keep = ~np.isin(labels, scarce)
+        texts = [text for text, kept in zip(texts, keep) if kept]
+        labels = labels[keep]
+        classes, counts = classes[counts >= 2], counts[counts >= 2]
+    if len(classes) < 2:
+        raise ValueError("Se necesitan al menos 2 tonos con 2 o más ejemplos de entrenamiento para la validación cruzada.")
+
+    n_folds = min(N_FOLDS, int(counts.min()))
+    folds = list(StratifiedKFold(n_splits=n_folds, shuffle=True, random_state=42).split(texts, labels))
+    fingerprint = _data_fingerprint(texts, labels, folds)
+
+    combos = list(itertools.product(_expand(VECTORIZER_GRID), _expand(CLASSIFIER_GRID)))
+    if n_iter and n_iter < len(combos):
+        combos = random.Random(seed).sample(combos, n_iter)
+    vectorizer_configs = []
+    for vec_params, _ in combos:
+        if vec_params not in vectorizer_configs:
+            vectorizer_configs.append(vec_params)
+    print(f"{len(combos)} combinaciones, {len(vectorizer_configs)} vectorizadores x {n_folds} folds.")
+
+    # 1. Vectorización: una tarea por (vectorizador, fold); lo que ya está en caché no se recalcula
+    keys = {json.dumps(v, sort_keys=True): [_config_key(v, fingerprint, i) for i in range(n_folds)]
+            for v in vectorizer_configs}
+    start = time.perf_counter()
+    tasks = [(v, i) for v in vectorizer_configs for i in range(n_folds)]
+    transform_costs = Parallel(n_jobs=n_jobs)(
+        delayed(featurize_fold)(v, texts, folds[i][0], folds[i][1], keys[json.dumps(v, sort_keys=True)][i])
+        for v, i in tasks
+    )
+    transform_cost = {}
+    for (v, _), cost in zip(tasks, transform_costs):
+        transform_cost.setdefault(json.dumps(v, sort_keys=True), []).append(cost)
+    print(f"Matrices de características listas en {time.perf_counter() - start:.1f} s (caché: {FEATURE_CACHE_DIR})")
+
+    # 2. Clasificadores en paralelo sobre las matrices en caché
+    start = time.perf_counter()
+    scores = Parallel(n_jobs=n_jobs)(
+        delayed(evaluate_classifier)(clf, keys[json.dumps(v, sort_keys=True)], folds, labels, classes)
+        for v, clf in combos
+    )
+    print(f"Validación cruzada completada en {time.perf_counter() - start:.1f} s")
+
+    results = []
+    for (v, clf), score in zip(combos, scores):
+        infer_per_doc = float(np.mean(transform_cost[json.dumps(v, sort_keys=True)])) + score['predict_segundos_por_doc']
+        results.append({
+            'vectorizador': v,
+            'clasificador': clf,
+            **score,
+            'inferencia_ms_por_1000_docs': round(infer_per_doc * 1_000_000, 3),
+        })
+    results.sort(key=lambda r: (-r['f1_macro'], r['inferencia_ms_por_1000_docs']))
+
+    print(f"\n{'F1 macro':>8}  {'F1 por clase':<44} {'fit (s)':>8} {'ms/1000 docs':>12}  configuración")
+    for r in results[:15]:
+        per_class = ' '.join(f"{c}={f:.2f}" for c, f in r['f1_por_clase'].items())
+        print(f"{r['f1_macro']:>8.3f}  {per_class:<44} {r['fit_segundos']:>8.3f} "
+              f"{r['inferencia_ms_por_1000_docs']:>12.2f}  {r['vectorizador']} {r['clasificador']}")
+
+    atomic_write_json(REPORT_PATH, {'n_folds': n_folds, 'resultados': results})
+    print(f"\nInforme completo guardado en: {REPORT_PATH}")
+
+    best = results[0]
+    if promote:
+        print(f"\n🏆 Mejor configuración: {best['vectorizador']} {best['clasificador']} (F1 macro {best['f1_macro']:.3f})")
+        save_training_config(best['vectorizador'], best['clasificador'],
+                             origin=f"search_hyperparams (F1 macro {best['f1_macro']:.3f}, {n_folds} folds)")
+        print(f"Configuración de entrenamiento guardada en: {TRAINING_CONFIG_PATH}")
+        train_model(activate=activate)
+    return results
+
+
+if __name__ == '__main__':
+    search_hyperparams()
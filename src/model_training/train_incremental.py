@@ -0,0 +1,178 @@
+# src/model_training/train_incremental.py
+
+import pandas as pd
+import numpy as np
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.linear_model import SGDClassifier
+import json
+import pickle
+import os
+import sys
+
+# Raíz del proyecto en sys.path para importar los módulos compartidos de 'src'
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from src.data_pipeline.text_cleaning import clean_batch
+from src.data_pipeline.tweet_store import atomic_write_json
+from src.inference.model_registry import register_version
+
+# --- Rutas de Archivos ---
+BASE_DIR = os.path.join(os.path.dirname(__file__), '..', '..')
+INPUT_FILE = os.path.join(BASE_DIR, 'data', 'processed', 'corpus_etiquetado.csv')
+MODEL_PATH = os.path.join(BASE_DIR, 'models', 'model_clasificador_incremental.pkl')
+VECTORIZER_PATH = os.path.join(BASE_DIR, 'models', 'vectorizer_incremental.pkl')
+# Estado del entrenamiento incremental: recuento por clase e ids ya aprendidos
+STATE_PATH = os.path.join(BASE_DIR, 'models', 'incremental_state.json')
+TRAINED_IDS_PATH = os.path.join(BASE_DIR, 'models', 'incremental_trained_ids.txt')
+# -------------------------
+
+# Clases de tono conocidas: partial_fit necesita conocerlas desde la primera llamada
+TONE_CLASSES = np.array(['Negativo', 'Neutral', 'Positivo'])
+DEFAULT_CHUNKSIZE = 10_000
+N_FEATURES = 2 ** 18
+
+
+def build_vectorizer():
+    """
+    Vectorizador sin estado (hashing trick): no hay vocabulario que ajustar,
+    así que los tuits nuevos se transforman igual que los antiguos y el modelo
+    se puede actualizar bloque a bloque.
+    """
+    return HashingVectorizer(
+        n_features=N_FEATURES,
+        ngram_range=(1, 2),
+        alternate_sign=False,
+        norm='l2',
+    )
+
+
+def build_model():
+    # log_loss = regresión logística entrenada por SGD (tiene predict_proba)
+    return SGDClassifier(loss='log_loss', alpha=1e-5, random_state=42)
+
+
+def load_incremental_state():
+    """Carga modelo, recuentos por clase e ids ya entrenados (o un estado vacío)."""
+    if os.path.exists(MODEL_PATH) and os.path.exists(STATE_PATH):
+        with open(MODEL_PATH, 'rb') as f:
+            model = pickle.load(f)
+        with open(STATE_PATH, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+    else:
+        model = None
+        state = {'class_counts': {c: 0 for c in TONE_CLASSES}, 'n_trained': 0}
+
+    trained_ids = set()
+    if model is not None and os.path.exists(TRAINED_IDS_PATH):
+        with open(TRAINED_IDS_PATH, 'r', encoding='utf-8') as f:
+            trained_ids = {line.strip() for line in f if line.strip()}
+    return model, state, trained_ids
+
+
+def balanced_sample_weight(labels, class_counts):
+    """
+    Equivalente incremental de class_weight='balanced' (no soportado por
+    partial_fit): peso = total / (n_clases * recuento_clase), con los recuentos
+    acumulados de TODO lo entrenado hasta ahora.
+    """
+    total = sum(class_counts.values())
+    n_classes = len(TONE_CLASSES)
+    weights = {c: total / (n_classes * count) if count else 1.0 for c, count in class_counts.items()}
+    return np.array([weights[label] for label in labels])
+
+
+def iter_new_labeled_chunks(trained_ids, chunksize=DEFAULT_CHUNKSIZE):
+    """Recorre el corpus por bloques y devuelve solo las filas etiquetadas aún no entrenadas."""
+    for chunk in pd.read_csv(INPUT_FILE, usecols=['id_tuit', 'texto_original', 'etiqueta_tono'],
+                             dtype={'id_tuit': str}, chunksize=chunksize, encoding='utf-8'):
+        chunk = chunk.dropna(subset=['etiqueta_tono', 'texto_original'])
+        chunk = chunk[~chunk['id_tuit'].isin(trained_ids)]
+
+        unknown = ~chunk['etiqueta_tono'].isin(TONE_CLASSES)
+        if unknown.any():
+            print(f"ADVERTENCIA: Se ignoran {unknown.sum()} filas con etiquetas desconocidas: "
+                  f"{sorted(chunk.loc[unknown, 'etiqueta_tono'].unique())}")
+            chunk = chunk[~unknown]
+        if len(chunk):
+            yield chunk
+
+
+def train_incremental(chunksize=DEFAULT_CHUNKSIZE, from_scratch=False, epochs=3):
+    """
+    Actualiza el modelo incremental SOLO con las filas etiquetadas nuevas.
+
+    El corpus se lee por bloques (memoria acotada) y cada bloque nuevo se
+    aprende con partial_fit, así que el coste depende de las etiquetas añadidas
+    y no de todo el histórico. Antes de aprender cada bloque se evalúa el
+    modelo sobre él (validación progresiva: test y después train).
+    """
+    if not os.path.exists(INPUT_FILE):
+        print(f"ERROR: Archivo de etiquetado no encontrado en {INPUT_FILE}.")
+        return
+
+    vectorizer = build_vectorizer()
+    if from_scratch:
+        model, state, trained_ids = None, {'class_counts': {c: 0 for c in TONE_CLASSES}, 'n_trained': 0}, set()
+    else:
+        model, state, trained_ids = load_incremental_state()
+    if model is None:
+        model = build_model()
+        trained_ids = set()
+        print("Iniciando un modelo incremental nuevo (HashingVectorizer + SGDClassifier).")
+    else:
+        print(f"Modelo incremental cargado: {state['n_trained']} tuits ya entrenados.")
+
+    new_ids = []
+    n_seen, n_correct = 0, 0
+    rng = np.random.RandomState(42)
+
+    for chunk in iter_new_labeled_chunks(trained_ids, chunksize):
+        texts = clean_batch(chunk['texto_original'], n_jobs=1)
+        X = vectorizer.transform(texts)
+        y = chunk['etiqueta_tono'].to_numpy()
+
+        # Validación progresiva sobre datos que el modelo aún no ha visto
+        if state['n_trained'] > 0:
+            n_correct += int((model.predict(X) == y).sum())
+            n_seen += len(y)
+
+        for label, count in zip(*np.unique(y, return_counts=True)):
+            state['class_counts'][label] += int(count)
+        sample_weight = balanced_sample_weight(y, state['class_counts'])
+
+        for _ in range(epochs):
+            order = rng.permutation(len(y))
+            model.partial_fit(X[order], y[order], classes=TONE_CLASSES, sample_weight=sample_weight[order])
+
+        state['n_trained'] += len(y)
+        new_ids.extend(chunk['id_tuit'])
+        print(f"-> Bloque de {len(y)} tuits nuevos aprendido (total entrenado: {state['n_trained']}).")
+
+    if not new_ids:
+        print("No hay tuits etiquetados nuevos. El modelo incremental no cambia.")
+        return
+
+    if n_seen:
+        print(f"\n✅ Precisión progresiva sobre los {n_seen} tuits nuevos (antes de aprenderlos): {n_correct / n_seen:.2f}")
+
+    # Guardar artefactos con la misma interfaz que los de train_model.py
+    # (transform / predict / predict_proba), que cargan la app y predict_model.py
+    os.makedirs(os.path.dirname(MODEL_PATH), exist_ok=True)
+    with open(MODEL_PATH, 'wb') as f:
+        pickle.dump(model, f)
+    with open(VECTORIZER_PATH, 'wb') as f:
+        pickle.dump(vectorizer, f)
+    with open(TRAINED_IDS_PATH, 'w' if from_scratch else 'a', encoding='utf-8') as f:
+        f.writelines(f"{id_tuit}\n" for id_tuit in new_ids)
+    atomic_write_json(STATE_PATH, state)
+    # Versión 'incremental' del registro: no se activa sola (model_registry.py activate incremental)
+    register_version('incremental', MODEL_PATH, VECTORIZER_PATH,
+                     description=f"HashingVectorizer + SGDClassifier ({state['n_trained']} tuits)")
+
+    print(f"\n🎉 Modelo incremental actualizado con {len(new_ids)} tuits nuevos.")
+    print(f"Modelo guardado en: {MODEL_PATH}")
+    print(f"Vectorizador guardado en: {VECTORIZER_PATH}")
+    print("Registrada como versión 'incremental' en models/manifest.json.")
+
+
+if __name__ == '__main__':
+    train_incremental()
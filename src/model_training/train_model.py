@@ -5,66 +5,135 @@ from sklearn.model_selection import train_test_split
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.linear_model import LogisticRegression  # Importamos LogisticRegression
 from sklearn.metrics import accuracy_score, classification_report
-import pickle
+import json
 import os
-import re
+import sys
+import argparse
+
+# Raíz del proyecto en sys.path para importar los módulos compartidos de 'src'
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from src.data_pipeline.deduplicator import deduplicate
+from src.data_pipeline.text_cleaning import clean_batch
+from src.data_pipeline.tweet_store import atomic_write_json
+from src.inference.compact_model import export_compact_model
+from src.inference.model_registry import (MODELS_DIR, atomic_write_pickle, load_manifest, next_version_name,
+                                          register_version, set_candidate)
 
 # --- Rutas de Archivos ---
 BASE_DIR = os.path.join(os.path.dirname(__file__), '..', '..')
 INPUT_FILE = os.path.join(BASE_DIR, 'data', 'processed', 'corpus_etiquetado.csv')
-MODEL_PATH = os.path.join(BASE_DIR, 'models', 'model_clasificador_v1.pkl')
-VECTORIZER_PATH = os.path.join(BASE_DIR, 'models', 'vectorizer_v1.pkl')
+# Los modelos van a models/ con el nombre de su versión (ver version_paths)
+# Configuración promovida por la búsqueda de hiperparámetros (ver training_config)
+TRAINING_CONFIG_PATH = os.path.join(MODELS_DIR, 'configuracion_entrenamiento.json')
 # -------------------------
 
-# La función de limpieza debe ser la misma usada en todo el proyecto
-def clean_text(text):
-    """Función de preprocesamiento de texto."""
-    if not isinstance(text, str):
-        return ""
-    text = re.sub(r'^RT @\w+:\s?', 'RT : ', text)
-    text = re.sub(r'@\w+', '', text)
-    text = re.sub(r'https?://\S+|www\.\S+', '', text)
-    text = re.sub(r't\.co/\w+', '', text)
-    text = re.sub(r'\s+', ' ', text).strip()
-    return text
+# Configuración por defecto (la búsqueda de hiperparámetros puede promover otra)
+DEFAULT_VECTORIZER_PARAMS = {'max_features': 500, 'ngram_range': (1, 2)}
+DEFAULT_CLASSIFIER_PARAMS = {'C': 1.0}
+
 
-def train_model():
+def training_config(path=TRAINING_CONFIG_PATH):
     """
-    Carga los datos etiquetados, entrena un clasificador de texto (Logistic Regression) 
-    con balanceo de clases, y guarda el modelo y el vectorizador.
+    (parámetros del vectorizador, parámetros del clasificador) con los que se
+    entrena: los de por defecto, sustituidos por los que haya promovido la
+    búsqueda de hiperparámetros. Lo usan train_model.py y el pipeline, así que
+    un re-entrenamiento nunca vuelve en silencio a la configuración por defecto.
     """
-    
-    if not os.path.exists(INPUT_FILE):
-        print(f"ERROR: Archivo de etiquetado no encontrado en {INPUT_FILE}.")
-        return
+    vectorizer_params, classifier_params = dict(DEFAULT_VECTORIZER_PARAMS), dict(DEFAULT_CLASSIFIER_PARAMS)
+    if os.path.exists(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            config = json.load(f)
+        vectorizer_params.update(config.get('vectorizador') or {})
+        classifier_params.update(config.get('clasificador') or {})
+    # JSON no tiene tuplas y TfidfVectorizer exige ngram_range como tupla
+    vectorizer_params['ngram_range'] = tuple(vectorizer_params['ngram_range'])
+    return vectorizer_params, classifier_params
 
-    # 1. Cargar y Filtrar Datos Etiquetados
-    df = pd.read_csv(INPUT_FILE)
-    df.dropna(subset=['etiqueta_tono', 'texto_original'], inplace=True)
+
+def save_training_config(vectorizer_params, classifier_params, origin='', path=TRAINING_CONFIG_PATH):
+    """Guarda la configuración promovida; borrar el archivo vuelve a la de por defecto."""
+    atomic_write_json(path, {'vectorizador': dict(vectorizer_params), 'clasificador': dict(classifier_params),
+                             'origen': origin, 'fecha': pd.Timestamp.now().strftime('%Y-%m-%dT%H:%M:%S')})
+
+
+def select_labeled(df, dedup=True, clean=clean_batch, signature_cache=None):
+    """
+    Filas etiquetadas de `df` (el corpus tal cual se lee del CSV) con la
+    columna texto_procesado. Con `dedup=True` se queda un representante por
+    grupo de retuits y casi duplicados: el mismo texto no pesa varias veces en
+    el entrenamiento ni puede caer a la vez en train y en test.
+
+    `clean` y `signature_cache` permiten al pipeline reutilizar la limpieza y
+    las firmas MinHash de la ejecución anterior; el resultado es el mismo.
+    """
+    df = df.dropna(subset=['etiqueta_tono', 'texto_original']).copy()
     
     # Aseguramos que el texto_procesado exista y esté limpio
-    df['texto_procesado'] = df['texto_original'].apply(clean_text)
+    # (misma limpieza que en la app y en la predicción por lotes)
+    df['texto_procesado'] = clean(df['texto_original'])
+
+    if dedup:
+        result = deduplicate(df['texto_procesado'], already_clean=True, signature_cache=signature_cache)
+        df = df.iloc[result.representatives].sort_index()
+        print(f"Deduplicación del corpus etiquetado: {result.summary()}")
 
     if len(df) < 50:
         print(f"ADVERTENCIA: Solo se han cargado {len(df)} tuits. Se recomienda un mínimo de 100 para estabilidad.")
+    return df
+
+
+def load_labeled_data(with_intent=False, dedup=True):
+    """
+    Carga el corpus etiquetado y devuelve (texto limpio, tono). Con
+    `with_intent=True` devuelve también la intención ('' si no está etiquetada).
+    Ver `select_labeled` para la deduplicación.
+    """
+    df = select_labeled(pd.read_csv(INPUT_FILE), dedup)
 
     X = df['texto_procesado']  # Características (texto limpio)
     y = df['etiqueta_tono']    # Objetivo (tono)
+    if with_intent:
+        return X, y, df['etiqueta_intencion'].fillna('').astype(str)
+    return X, y
 
-    # 2. Dividir el conjunto de datos (Usaremos el 30% para prueba)
-    X_train, X_test, y_train, y_test = train_test_split(
-        X, y, test_size=0.3, random_state=42, stratify=y
+
+def split_data(X, y, *extra):
+    """
+    División train/test del proyecto (30% para prueba, random_state=42,
+    estratificada por tono). Las columnas de `extra` (p. ej. la intención) se
+    dividen con las mismas filas.
+    """
+    return train_test_split(X, y, *extra, test_size=0.3, random_state=42, stratify=y)
+
+
+def train_intent_head(X_train_vec, intent_train, classifier_params=None):
+    """
+    Clasificador de intención sobre la MISMA matriz TF-IDF que el de tono, así
+    que en inferencia ambos comparten una única limpieza y un único transform.
+    Solo se usan las filas con intención etiquetada. Devuelve None si no hay
+    al menos dos intenciones distintas.
+    """
+    labeled = (intent_train != '').to_numpy()
+    if len(set(intent_train[labeled])) < 2:
+        print("ADVERTENCIA: No hay suficientes intenciones etiquetadas; no se entrena el cabezal de intención.")
+        return None
+    intent_model = LogisticRegression(
+        class_weight='balanced',
+        max_iter=1000,
+        random_state=42,
+        **dict(DEFAULT_CLASSIFIER_PARAMS, **(classifier_params or {}))
     )
-    print(f"\nDatos de Entrenamiento: {len(X_train)} | Datos de Prueba: {len(X_test)}")
-    
-    # 3. Vectorización (TF-IDF)
-    # Reutilizamos el parámetro max_features=500 y ngram_range=(1, 2)
-    vectorizer = TfidfVectorizer(max_features=500, ngram_range=(1, 2))
-    
-    # Ajustamos y transformamos los datos de entrenamiento
-    X_train_vec = vectorizer.fit_transform(X_train)
-    # Solo transformamos los datos de prueba
-    X_test_vec = vectorizer.transform(X_test)
+    intent_model.fit(X_train_vec[labeled], intent_train[labeled])
+    return intent_model
+
+
+def fit_classifiers(X_train_vec, X_test_vec, y_train, y_test, intent_train, intent_test, classifier_params=None):
+    """
+    Entrena los cabezales de tono e intención sobre matrices ya vectorizadas
+    e imprime su informe en el conjunto de prueba. Devuelve (modelo, cabezal
+    de intención o None).
+    """
+    classifier_params = dict(DEFAULT_CLASSIFIER_PARAMS, **(classifier_params or {}))
 
     # 4. Entrenamiento del Modelo (Logistic Regression con class_weight)
     print("Iniciando entrenamiento del modelo Logistic Regression con balanceo de clases...")
@@ -73,7 +142,8 @@ def train_model():
     model = LogisticRegression(
         class_weight='balanced',  # Parámetro clave para corregir el sesgo
         max_iter=1000, 
-        random_state=42
+        random_state=42,
+        **classifier_params
     )
     model.fit(X_train_vec, y_train)
 
@@ -85,19 +155,130 @@ def train_model():
     print("\n--- Informe de Clasificación (Detalle por etiqueta) ---")
     print(classification_report(y_test, y_pred))
 
-    # 6. Guardar Modelo y Vectorizador
-    os.makedirs(os.path.dirname(MODEL_PATH), exist_ok=True)
+    # 5b. Cabezal de intención sobre las mismas matrices
+    intent_model = train_intent_head(X_train_vec, intent_train, classifier_params)
+    if intent_model is not None:
+        labeled = (intent_test != '').to_numpy()
+        intent_pred = intent_model.predict(X_test_vec[labeled])
+        print(f"\n✅ Precisión del cabezal de intención: {accuracy_score(intent_test[labeled], intent_pred):.2f}")
+        print(classification_report(intent_test[labeled], intent_pred, zero_division=0))
+    return model, intent_model
+
+
+def version_paths(name):
+    """Rutas (modelo, vectorizador, cabezal de intención) de la versión `name` en models/."""
+    return (os.path.join(MODELS_DIR, f'model_clasificador_{name}.pkl'),
+            os.path.join(MODELS_DIR, f'vectorizer_{name}.pkl'),
+            os.path.join(MODELS_DIR, f'model_intencion_{name}.pkl'))
+
+
+def save_models(model, vectorizer, intent_model, vectorizer_params=None, classifier_params=None, activate=False):
+    """
+    Guarda el entrenamiento como una versión NUEVA del registro (v2, v3...):
+    archivos propios escritos de forma atómica, formato compacto y entrada en
+    el manifiesto. No se toca ninguna versión anterior. La nueva queda como
+    candidata en sombra salvo con `activate=True` (o si no hay ninguna activa).
+    Devuelve el nombre de la versión.
+    """
+    vectorizer_params = dict(DEFAULT_VECTORIZER_PARAMS, **(vectorizer_params or {}))
+    classifier_params = dict(DEFAULT_CLASSIFIER_PARAMS, **(classifier_params or {}))
+    name = next_version_name()
+    model_path, vectorizer_path, intent_path = version_paths(name)
+
+    # 6. Guardar Modelo y Vectorizador (temporal + rename: nunca un .pkl a medias)
+    atomic_write_pickle(model, model_path)
+    atomic_write_pickle(vectorizer, vectorizer_path)
+    if intent_model is not None:
+        atomic_write_pickle(intent_model, intent_path)
+
+    # 7. Exportar el formato compacto (npz + vocabulario mmap) para la app y
+    #    la predicción por lotes: se carga sin sklearn ni pickle.
+    compact_model_path, compact_vocab_path = export_compact_model(model, vectorizer, MODELS_DIR, name=name,
+                                                                  intent_model=intent_model)
+
+    # 8. Registrar la versión (sha256 de los archivos). El manifiesto se
+    #    escribe lo último: hasta entonces nadie conoce los archivos nuevos.
+    register_version(name, model_path, vectorizer_path, compact=name, activate=activate,
+                     intent_path=intent_path if intent_model is not None else None,
+                     description=f"LogisticRegression {classifier_params} + TF-IDF {vectorizer_params}")
+    active = load_manifest()['activa']
+    if active != name:
+        set_candidate(name, mode='shadow')
+
+    print(f"\n🎉 ¡Entrenamiento Completo! Versión {name}")
+    print(f"Modelo guardado en: {model_path}")
+    print(f"Vectorizador guardado en: {vectorizer_path}")
+    if intent_model is not None:
+        print(f"Cabezal de intención guardado en: {intent_path}")
+    print(f"Modelo compacto exportado en: {compact_model_path} y {compact_vocab_path}")
+    if active == name:
+        print(f"✅ {name} es la versión activa.")
+    else:
+        print(f"🔄 {name} queda como candidata en sombra frente a {active}. Para servirla:"
+              f" python src/inference/model_registry.py activate {name}")
+    return name
+
+
+def train_model(vectorizer_params=None, classifier_params=None, activate=False):
+    """
+    Carga los datos etiquetados, entrena un clasificador de texto (Logistic Regression) 
+    con balanceo de clases, y guarda el modelo y el vectorizador como una
+    versión nueva del registro (ver `save_models`). Devuelve su nombre.
+    Los parámetros que no se pasan salen de `training_config()`.
+    """
+    base_vectorizer_params, base_classifier_params = training_config()
+    vectorizer_params = dict(base_vectorizer_params, **(vectorizer_params or {}))
+    classifier_params = dict(base_classifier_params, **(classifier_params or {}))
     
-    with open(MODEL_PATH, 'wb') as f:
-        pickle.dump(model, f)
-        
-    with open(VECTORIZER_PATH, 'wb') as f:
-        pickle.dump(vectorizer, f)
+    if not os.path.exists(INPUT_FILE):
+        print(f"ERROR: Archivo de etiquetado no encontrado en {INPUT_FILE}.")
+        return
 
-    print(f"\n🎉 ¡Entrenamiento Completo!")
-    print(f"Modelo guardado en: {MODEL_PATH}")
-    print(f"Vectorizador guardado en: {VECTORIZER_PATH}")
+    # 1. Cargar y Filtrar Datos Etiquetados
+    X, y, intent = load_labeled_data(with_intent=True)
+
+    # 2. Dividir el conjunto de datos (Usaremos el 30% para prueba)
+    X_train, X_test, y_train, y_test, intent_train, intent_test = split_data(X, y, intent)
+    print(f"\nDatos de Entrenamiento: {len(X_train)} | Datos de Prueba: {len(X_test)}")
+    
+    # 3. Vectorización (TF-IDF)
+    # Por defecto max_features=500 y ngram_range=(1, 2), salvo configuración promovida
+    vectorizer = TfidfVectorizer(**vectorizer_params)
+    
+    # Ajustamos y transformamos los datos de entrenamiento
+    X_train_vec = vectorizer.fit_transform(X_train)
+    # Solo transformamos los datos de prueba
+    X_test_vec = vectorizer.transform(X_test)
+
+    # 4-5. Cabezales de tono e intención
+    model, intent_model = fit_classifiers(X_train_vec, X_test_vec, y_train, y_test, intent_train, intent_test,
+                                          classifier_params)
+
+    # 6-8. Guardar, exportar y registrar
+    return save_models(model, vectorizer, intent_model, vectorizer_params, classifier_params, activate)
 
 
 if __name__ == '__main__':
-    train_model()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Entrena el clasificador de tono.")
+    parser.add_argument('--incremental', action='store_true',
+                        help="Actualiza el modelo incremental (hashing + SGD) solo con las etiquetas nuevas.")
+    parser.add_argument('--from-scratch', action='store_true',
+                        help="Con --incremental, descarta el estado previo y reentrena desde cero.")
+    parser.add_argument('--chunksize', type=int, default=10_000,
+                        help="Filas del corpus leídas por bloque en modo incremental.")
+    parser.add_argument('--search', action='store_true',
+                        help="Búsqueda de hiperparámetros en paralelo; entrena la mejor configuración como versión nueva.")
+    parser.add_argument('--n-iter', type=int, default=None,
+                        help="Con --search, evalúa solo una muestra aleatoria de N configuraciones.")
+    parser.add_argument('--activate', action='store_true',
+                        help="Activa la versión entrenada en lugar de dejarla como candidata en sombra.")
+    args = parser.parse_args()
+
+    if args.search:
+        from src.model_training.search_hyperparams import search_hyperparams
+        search_hyperparams(n_iter=args.n_iter, activate=args.activate)
+    elif args.incremental:
+        from src.model_training.train_incremental import train_incremental
+        train_incremental(chunksize=args.chunksize, from_scratch=args.from_scratch)
+    else:
+        train_model(activate=args.activate)
\ No newline at end of file
@@ -0,0 +1,490 @@
+# src/pipeline.py
+"""
+Pipeline completo (recolección -> preprocesado -> entrenamiento -> evaluación
+-> predicción) como un grafo de etapas con caché por contenido.
+
+Cada etapa declara sus archivos de entrada, sus parámetros y su código; su
+clave es el sha256 de todo ello. Si coincide con la de la última ejecución
+(data/cache/pipeline_state.json) y sus salidas siguen ahí sin cambios, la
+etapa se salta. Las claves dependen del CONTENIDO de las entradas, no de si la
+etapa anterior se ejecutó: si un re-entrenamiento genera exactamente el mismo
+modelo, la predicción no se repite.
+
+Etapas:
+  collect     colector de la API (solo con --collect: necesita red y token).
+  preprocess  tuits brutos -> corpus para etiquetado (solo si cambian los brutos).
+  dataset     corpus etiquetado -> texto limpio, deduplicación e índices de la
+              división train/test (data/cache/pipeline/dataset.npz). La limpieza
+              y las firmas MinHash de la ejecución anterior se reutilizan: tras
+              etiquetar 100 filas más solo se procesan esas 100.
+  features    TF-IDF ajustado en train -> matrices de train y test + vectorizador.
+  train       cabezales de tono e intención sobre esas matrices -> versión nueva
+              del registro (v2, v3...), candidata en sombra; con --activate
+              pasa a ser la activa.
+  evaluate    informe de esa versión sobre la matriz de prueba en caché (sin
+              releer el corpus ni volver a dividirlo).
+  predict     predicción por lotes de data/raw/nuevos_tweets.csv con la versión activa.
+
+Cada etapa arranca, en su propio proceso, en cuanto terminan sus dependencias:
+evaluate y predict solo dependen de train y se ejecutan a la vez.
+
+Los intermedios son binarios: textos UTF-8 concatenados + offsets, códigos de
+etiqueta e índices en npz, y matrices CSR con scipy.sparse.save_npz.
+
+Uso:
+    python src/pipeline.py                  # ejecuta solo lo que ha cambiado
+    python src/pipeline.py --collect        # recolecta antes
+    python src/pipeline.py --status         # qué se ejecutaría, sin ejecutar nada
+    python src/pipeline.py --force train    # repite una etapa aunque esté al día
+    python src/pipeline.py --activate       # activa la versión entrenada
+    python src/pipeline.py --jobs 1         # etapas de una en una
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import pickle
+import sys
+import time
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+import sklearn
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+# Raíz del proyecto en sys.path para importar los módulos compartidos de 'src'
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from src.data_pipeline.deduplicator import SignatureCache
+from src.data_pipeline.text_cleaning import clean_batch
+from src.data_pipeline.tweet_store import atomic_write_json
+from src.inference.corpus_store import pack_texts, unpack_texts
+from src.inference.model_registry import (MODELS_DIR, load_manifest, load_version, set_active, sha256_file,
+                                          version_files)
+from src.model_prediction import predict_model as prediction
+from src.model_testing.evaluate_model import report_metrics
+from src.model_training import train_model as training
+
+# --- Rutas de Archivos ---
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+STATE_PATH = os.path.join(BASE_DIR, 'data', 'cache', 'pipeline_state.json')
+CACHE_DIR = os.path.join(BASE_DIR, 'data', 'cache', 'pipeline')
+DATASET_PATH = os.path.join(CACHE_DIR, 'dataset.npz')
+SIGNATURES_PATH = os.path.join(CACHE_DIR, 'firmas_minhash.npz')
+TRAIN_FEATURES_PATH = os.path.join(CACHE_DIR, 'features_train.npz')
+TEST_FEATURES_PATH = os.path.join(CACHE_DIR, 'features_test.npz')
+VECTORIZER_PATH = os.path.join(CACHE_DIR, 'vectorizador.pkl')
+EVALUATION_PATH = os.path.join(CACHE_DIR, 'evaluacion.json')
+# Versión del registro que generó la última ejecución de train
+TRAINED_VERSION_PATH = os.path.join(CACHE_DIR, 'version_entrenada.json')
+RAW_TWEETS_PATH = os.path.join(BASE_DIR, 'data', 'raw', 'tweets_raw_ES.jsonl')
+LEGACY_RAW_TWEETS_PATH = os.path.join(BASE_DIR, 'data', 'raw', 'tweets_raw_ES.json')
+CORPUS_PATH = training.INPUT_FILE
+# -------------------------
+
+# Cambiarla invalida todas las etapas (p. ej. si cambia el formato de los intermedios)
+PIPELINE_VERSION = 1
+DATASET_FORMAT_VERSION = 1
+
+
+# --- Dataset intermedio (npz) ---
+
+Dataset = namedtuple('Dataset', ['texts', 'cleaned', 'tones', 'intents', 'train_idx', 'test_idx'])
+Dataset.__doc__ = """
+Corpus etiquetado ya limpio y deduplicado: textos originales y limpios
+(listas), tono e intención (arrays de str; '' = sin intención) e índices de
+filas de train y test.
+"""
+
+
+def _encode(values):
+    codes, labels = pd.factorize(pd.Series(values, dtype=object).astype(str))
+    return codes.astype(np.int32), np.array(labels, dtype=str)
+
+
+def save_dataset(path, df, train_idx, test_idx):
+    texts = df['texto_original'].astype(str).tolist()
+    text_data, text_offsets = pack_texts(texts)
+    clean_data, clean_offsets = pack_texts(df['texto_procesado'].tolist())
+    tone_codes, tone_labels = _encode(df['etiqueta_tono'])
+    intent_codes, intent_labels = _encode(df['etiqueta_intencion'].fillna(''))
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        np.savez(f, format_version=np.array(DATASET_FORMAT_VERSION),
+                 text_data=text_data, text_offsets=text_offsets, clean_data=clean_data, clean_offsets=clean_offsets,
+                 tone_codes=tone_codes, tone_labels=tone_labels, intent_codes=intent_codes,
+                 intent_labels=intent_labels, train_idx=np.asarray(train_idx, dtype=np.int64),
+                 test_idx=np.asarray(test_idx, dtype=np.int64))
+
+
+def load_dataset(path=DATASET_PATH):
+    with np.load(path, allow_pickle=False) as data:
+        if int(data['format_version']) != DATASET_FORMAT_VERSION:
+            raise ValueError(f"Versión de formato del dataset no soportada: {data['format_version']}")
+        return Dataset(unpack_texts(data['text_data'], data['text_offsets']),
+                       unpack_texts(data['clean_data'], data['clean_offsets']),
+                       data['tone_labels'][data['tone_codes']], data['intent_labels'][data['intent_codes']],
+                       data['train_idx'], data['test_idx'])
+
+
+# --- Etapas ---
+
+def run_collect():
+    from src.data_pipeline import collector
+    collector.collect_queries_v2(collector.QUERIES_ES)
+
+
+def run_preprocess():
+    from src.data_pipeline.preprocessor import preprocess_data
+    preprocess_data()
+
+
+def build_dataset(corpus_path=CORPUS_PATH, output_path=DATASET_PATH, signatures_path=SIGNATURES_PATH):
+    """
+    Misma selección, limpieza, deduplicación y división que train_model.py,
+    pero reutilizando el texto limpio (por texto original) del dataset
+    anterior y las firmas MinHash guardadas: solo se procesan las filas nuevas.
+    """
+    known = {}
+    if os.path.exists(output_path):
+        try:
+            previous = load_dataset(output_path)
+            known = dict(zip(previous.texts, previous.cleaned))
+        except (OSError, ValueError, KeyError) as e:
+            print(f"⚠️ Dataset anterior ilegible ({e}); se limpia todo de nuevo.")
+    n_known = len(known)
+
+    def clean(texts):
+        values = texts.tolist()
+        pending = list(dict.fromkeys(t for t in values if t not in known))
+        known.update(zip(pending, clean_batch(pending)))
+        return pd.Series([known[t] for t in values], index=texts.index, name=texts.name)
+
+    signatures = SignatureCache.load(signatures_path)
+    df = training.select_labeled(pd.read_csv(corpus_path), clean=clean, signature_cache=signatures)
+    signatures.save(signatures_path)
+    print(f"Limpieza: {len(known) - n_known} textos nuevos ({n_known} de la ejecución anterior). "
+          f"Firmas MinHash: {signatures.misses} calculadas, {signatures.hits} reutilizadas.")
+
+    # División sobre las posiciones: mismas filas que split_data(X, y) en train_model.py
+    train_idx, test_idx = training.split_data(np.arange(len(df)), df['etiqueta_tono'])[:2]
+    save_dataset(output_path, df, train_idx, test_idx)
+    print(f"Datos de Entrenamiento: {len(train_idx)} | Datos de Prueba: {len(test_idx)}")
+    return {'filas': len(df), 'train': len(train_idx), 'test': len(test_idx)}
+
+
+def build_features(dataset_path=DATASET_PATH, train_path=TRAIN_FEATURES_PATH, test_path=TEST_FEATURES_PATH,
+                   vectorizer_path=VECTORIZER_PATH, vectorizer_params=None):
+    """
+    TF-IDF ajustado en train con la configuración de train_model.py (la
+    promovida por la búsqueda, si la hay); guarda las matrices (CSR sin
+    comprimir) y el vectorizador.
+    """
+    data = load_dataset(dataset_path)
+    vectorizer = TfidfVectorizer(**dict(training.training_config()[0], **(vectorizer_params or {})))
+    X_train = vectorizer.fit_transform([data.cleaned[i] for i in data.train_idx])
+    X_test = vectorizer.transform([data.cleaned[i] for i in data.test_idx])
+    os.makedirs(os.path.dirname(train_path), exist_ok=True)
+    sp.save_npz(train_path, X_train.tocsr(), compressed=False)
+    sp.save_npz(test_path, X_test.tocsr(), compressed=False)
+    with open(vectorizer_path, 'wb') as f:
+        pickle.dump(vectorizer, f)
+    return {'terminos': len(vectorizer.vocabulary_)}
+
+
+def _labels(data, rows):
+    return pd.Series(data.tones[rows]), pd.Series(data.intents[rows])
+
+
+def train_from_features(dataset_path=DATASET_PATH, train_path=TRAIN_FEATURES_PATH, test_path=TEST_FEATURES_PATH,
+                        vectorizer_path=VECTORIZER_PATH, trained_path=TRAINED_VERSION_PATH):
+    """Entrena sobre las matrices en caché y registra el resultado como una versión nueva."""
+    vectorizer_params, classifier_params = training.training_config()
+    data = load_dataset(dataset_path)
+    with open(vectorizer_path, 'rb') as f:
+        vectorizer = pickle.load(f)
+    y_train, intent_train = _labels(data, data.train_idx)
+    y_test, intent_test = _labels(data, data.test_idx)
+    model, intent_model = training.fit_classifiers(sp.load_npz(train_path), sp.load_npz(test_path), y_train, y_test,
+                                                   intent_train, intent_test, classifier_params)
+    version = training.save_models(model, vectorizer, intent_model, vectorizer_params, classifier_params)
+    atomic_write_json(trained_path, {'version': version})
+    return {'version': version, 'intencion': intent_model is not None}
+
+
+def trained_version(trained_path=TRAINED_VERSION_PATH):
+    """Versión registrada por la última ejecución de train (None si aún no hay)."""
+    if not os.path.exists(trained_path):
+        return None
+    with open(trained_path, 'r', encoding='utf-8') as f:
+        return json.load(f)['version']
+
+
+def _trained_version_files():
+    """Archivos de esa versión: si faltan o cambian, train se repite y evaluate también."""
+    entry = load_manifest()['versiones'].get(trained_version())
+    return [os.path.join(MODELS_DIR, f) for f in version_files(entry)] if entry else []
+
+
+def activate_trained():
+    """Activa la versión de la última ejecución de train (con --activate)."""
+    version = trained_version()
+    if version and load_manifest().get('activa') != version:
+        set_active(version)
+        print(f"✅ {version} es ahora la versión activa.")
+
+
+def evaluate_cached(dataset_path=DATASET_PATH, test_path=TEST_FEATURES_PATH, report_path=EVALUATION_PATH):
+    """Evalúa la versión recién entrenada sobre la matriz de prueba y la división en caché."""
+    loaded = load_version(trained_version(), prefer_compact=False)
+    data = load_dataset(dataset_path)
+    y_test, intent_test = _labels(data, data.test_idx)
+    print(f"Evaluando con {len(y_test)} ejemplos de prueba.")
+    metrics = report_metrics(loaded.model, loaded.intent_model, sp.load_npz(test_path), y_test, intent_test)
+    atomic_write_json(report_path, {'version': loaded.version, 'huella': loaded.fingerprint, 'ejemplos': len(y_test),
+                                    'precision': metrics})
+    return {'precision_' + name: round(value, 4) for name, value in metrics.items() if value is not None}
+
+
+def run_predict():
+    prediction.predict_new_data()
+
+
+def _active_version_files():
+    """Archivos de la versión activa: la predicción se repite si cambia el modelo que usa."""
+    manifest = load_manifest()
+    entry = manifest['versiones'].get(manifest.get('activa'))
+    return [os.path.join(MODELS_DIR, f) for f in version_files(entry)] if entry else []
+
+
+Stage = namedtuple('Stage', ['name', 'run', 'deps', 'inputs', 'outputs', 'code', 'params', 'check_outputs', 'always'],
+                   defaults=((), (), (), (), {}, True, False))
+Stage.__doc__ = """
+Una etapa del pipeline. `inputs` y `outputs` son rutas (o una función que las
+devuelve en el momento de ejecutar), `code` los archivos de código cuyo
+contenido entra en la clave. Con `check_outputs=False` solo se comprueba que
+las salidas existan (el corpus para etiquetado se edita a mano). Las etapas
+`always` se ejecutan siempre que se piden.
+"""
+
+_SKLEARN = {'sklearn': sklearn.__version__}
+# La configuración promovida por la búsqueda de hiperparámetros entra en la clave de features y train
+_VECTORIZER_PARAMS, _CLASSIFIER_PARAMS = training.training_config()
+STAGES = [
+    Stage('collect', run_collect, outputs=[RAW_TWEETS_PATH], always=True, check_outputs=False),
+    Stage('preprocess', run_preprocess, ('collect',),
+          inputs=[RAW_TWEETS_PATH, LEGACY_RAW_TWEETS_PATH], outputs=[CORPUS_PATH], check_outputs=False,
+          code=['src/data_pipeline/preprocessor.py', 'src/data_pipeline/text_cleaning.py',
+                'src/data_pipeline/deduplicator.py', 'src/data_pipeline/tweet_store.py']),
+    Stage('dataset', build_dataset, ('preprocess',), inputs=[CORPUS_PATH], outputs=[DATASET_PATH],
+          code=['src/pipeline.py', 'src/model_training/train_model.py', 'src/data_pipeline/text_cleaning.py',
+                'src/data_pipeline/deduplicator.py']),
+    Stage('features', build_features, ('dataset',), inputs=[DATASET_PATH],
+          outputs=[TRAIN_FEATURES_PATH, TEST_FEATURES_PATH, VECTORIZER_PATH],
+          code=['src/pipeline.py', 'src/model_training/train_model.py'],
+          params=dict(_SKLEARN, vectorizador=_VECTORIZER_PARAMS)),
+    Stage('train', train_from_features, ('features',),
+          inputs=[DATASET_PATH, TRAIN_FEATURES_PATH, TEST_FEATURES_PATH, VECTORIZER_PATH],
+          outputs=lambda: [TRAINED_VERSION_PATH] + _trained_version_files(),
+          code=['src/pipeline.py', 'src/model_training/train_model.py', 'src/inference/compact_model.py'],
+          params=dict(_SKLEARN, vectorizador=_VECTORIZER_PARAMS, clasificador=_CLASSIFIER_PARAMS)),
+    Stage('evaluate', evaluate_cached, ('train',),
+          inputs=lambda: [DATASET_PATH, TEST_FEATURES_PATH, TRAINED_VERSION_PATH] + _trained_version_files(),
+          outputs=[EVALUATION_PATH], code=['src/pipeline.py', 'src/model_testing/evaluate_model.py'], params=_SKLEARN),
+    Stage('predict', run_predict, ('train',), inputs=lambda: [prediction.RAW_DATA_PATH] + _active_version_files(),
+          outputs=[prediction.OUTPUT_PATH],
+          code=['src/model_prediction/predict_model.py', 'src/data_pipeline/text_cleaning.py',
+                'src/inference/compact_model.py']),
+]
+
+
+# --- Claves y estado ---
+
+def _relative(path):
+    return os.path.relpath(os.path.abspath(path), BASE_DIR)
+
+
+def _paths(value):
+    return list(value() if callable(value) else value)
+
+
+class FileHasher:
+    """sha256 de archivos; no se releen los que mantienen tamaño y fecha de modificación."""
+
+    def __init__(self, known):
+        self.known = known   # ruta relativa -> {'tamano', 'mtime_ns', 'sha256'} (se guarda en el estado)
+
+    def __call__(self, path):
+        path = os.path.join(BASE_DIR, path)
+        if not os.path.exists(path):
+            return None
+        st = os.stat(path)
+        entry = self.known.get(_relative(path))
+        if entry and entry['tamano'] == st.st_size and entry['mtime_ns'] == st.st_mtime_ns:
+            return entry['sha256']
+        digest = sha256_file(path)
+        self.known[_relative(path)] = {'tamano': st.st_size, 'mtime_ns': st.st_mtime_ns, 'sha256': digest}
+        return digest
+
+
+def stage_key(stage, hasher):
+    payload = {
+        'version': PIPELINE_VERSION,
+        'etapa': stage.name,
+        'parametros': stage.params,
+        'codigo': {path: hasher(path) for path in stage.code},
+        'entradas': {_relative(path): hasher(path) for path in _paths(stage.inputs)},
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+
+def is_fresh(stage, key, record, hasher):
+    """¿Misma clave que la última ejecución y salidas intactas?"""
+    if stage.always or record is None or record.get('clave') != key:
+        return False
+    for path, digest in record.get('salidas', {}).items():
+        if not os.path.exists(os.path.join(BASE_DIR, path)):
+            return False
+        if stage.check_outputs and hasher(path) != digest:
+            return False
+    return True
+
+
+def load_state(path=STATE_PATH):
+    if os.path.exists(path):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Estado del pipeline ilegible ({e}); se ejecuta todo.")
+    return {'archivos': {}, 'etapas': {}}
+
+
+# --- Ejecución ---
+
+def _describe(record):
+    summary = ', '.join(f"{k}={v}" for k, v in (record.get('resumen') or {}).items())
+    return f"{record.get('segundos', 0):.1f} s la última vez" + (f"; {summary}" if summary else '')
+
+
+def show_status(stages, deps, state, hasher):
+    """Qué etapas se ejecutarían, sin ejecutar nada."""
+    will_run = set()
+    for stage in stages:
+        upstream = [d for d in deps[stage.name] if d in will_run]
+        if upstream:
+            will_run.add(stage.name)
+            print(f"  ⏳ {stage.name:<10} depende de {', '.join(upstream)} (se salta si sus entradas no cambian)")
+        elif is_fresh(stage, stage_key(stage, hasher), state['etapas'].get(stage.name), hasher):
+            print(f"  ✅ {stage.name:<10} al día ({_describe(state['etapas'][stage.name])})")
+        else:
+            will_run.add(stage.name)
+            print(f"  🔄 {stage.name:<10} se ejecuta")
+
+
+def run_pipeline(collect=False, force=(), jobs=None, status_only=False, state_path=STATE_PATH, activate=False):
+    """
+    Ejecuta las etapas pendientes en orden de dependencias, varias a la vez
+    si no dependen entre sí. Con `activate`, la versión de train se activa
+    antes de lanzar predict. Devuelve True si ninguna ha fallado.
+    """
+    state = load_state(state_path)
+    hasher = FileHasher(state.setdefault('archivos', {}))
+    records = state.setdefault('etapas', {})
+    stages = [s for s in STAGES if collect or s.name != 'collect']
+    enabled = {s.name for s in stages}
+    deps = {s.name: [d for d in s.deps if d in enabled] for s in stages}
+    force = set(enabled if 'all' in force else force)
+
+    if status_only:
+        show_status(stages, deps, state, hasher)
+        return True
+
+    start = time.perf_counter()
+    pending = {s.name: s for s in stages}
+    done, failed, ran, running = set(), set(), [], {}
+    with ProcessPoolExecutor(max_workers=jobs or len(stages)) as executor:
+        while pending or running:
+            # Las etapas están en orden topológico: una pasada basta para lanzar las listas
+            for name, stage in list(pending.items()):
+                if any(d in failed for d in deps[name]):
+                    del pending[name]
+                    failed.add(name)
+                    print(f"⚠️ {name}: no se ejecuta porque ha fallado una etapa anterior.")
+                elif all(d in done for d in deps[name]):
+                    del pending[name]
+                    key = stage_key(stage, hasher)
+                    if name not in force and is_fresh(stage, key, records.get(name), hasher):
+                        done.add(name)
+                        print(f"⏭️  {name}: al día ({_describe(records[name])})")
+                        if name == 'train' and activate:
+                            activate_trained()
+                        continue
+                    print(f"🔄 {name}: ejecutando...")
+                    running[executor.submit(stage.run)] = (stage, key, time.perf_counter())
+            if not running:
+                continue
+
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                stage, key, stage_start = running.pop(future)
+                try:
+                    summary = future.result()
+                except Exception as e:
+                    failed.add(stage.name)
+                    print(f"❌ {stage.name}: {type(e).__name__}: {e}")
+                    continue
+                seconds = time.perf_counter() - stage_start
+                # Se guarda la clave calculada ANTES de ejecutar: si las entradas
+                # cambiaron mientras tanto (p. ej. el colector añadió tuits), la
+                # próxima vez la clave no coincide y la etapa se repite.
+                records[stage.name] = {
+                    'clave': key,
+                    'salidas': {_relative(p): hasher(p) for p in _paths(stage.outputs) if os.path.exists(p)},
+                    'segundos': round(seconds, 3),
+                    'fecha': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                    'resumen': summary,
+                }
+                atomic_write_json(state_path, state)
+                done.add(stage.name)
+                ran.append(stage.name)
+                print(f"✅ {stage.name}: {seconds:.1f} s")
+                if stage.name == 'train' and activate:
+                    activate_trained()
+
+    atomic_write_json(state_path, state)
+    elapsed = time.perf_counter() - start
+    skipped = len(done) - len(ran)
+    if failed:
+        print(f"\n❌ Pipeline incompleto en {elapsed:.1f} s: fallaron o no se ejecutaron {', '.join(sorted(failed))}.")
+        return False
+    print(f"\n🎉 Pipeline completado en {elapsed:.1f} s: {len(ran)} etapas ejecutadas, {skipped} al día.")
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ejecuta el pipeline completo saltando las etapas que no han cambiado.")
+    parser.add_argument('--collect', action='store_true', help="Recolecta tuits antes de preprocesar (necesita red).")
+    parser.add_argument('--force', action='append', default=[], metavar='ETAPA',
+                        help="Ejecuta la etapa aunque esté al día (se puede repetir; 'all' para todas).")
+    parser.add_argument('--jobs', type=int, default=None, help="Etapas ejecutadas a la vez (por defecto, todas las listas).")
+    parser.add_argument('--status', action='store_true', help="Muestra qué etapas se ejecutarían, sin ejecutar nada.")
+    parser.add_argument('--activate', action='store_true',
+                        help="Activa la versión entrenada en lugar de dejarla como candidata en sombra.")
+    args = parser.parse_args()
+
+    unknown = set(args.force) - {s.name for s in STAGES} - {'all'}
+    if unknown:
+        parser.error(f"Etapa desconocida: {', '.join(sorted(unknown))}")
+    # El colector y el preprocesador usan rutas relativas a la raíz del proyecto
+    os.chdir(BASE_DIR)
+    ok = run_pipeline(collect=args.collect, force=args.force, jobs=args.jobs, status_only=args.status,
+                      activate=args.activate)
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == '__main__':
+    main()